@@ -0,0 +1,280 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ai.document import ParsedDocument
+from ai.taxonomy import FORMAT_VERSION, registry
+from settings import CACHE_DIR, EXTRACTION_CACHE_ENTRIES, EXTRACTION_CACHE_MAX_BYTES
+
+# Bump when an extractor's output changes for reasons the key can't see (code, not data)
+CACHE_VERSION = 3
+
+# A disk hit refreshes its row's recency only when the stored one is older than this many
+# seconds, and refreshes are written in batches of TOUCH_BATCH, so reads stay reads
+RECENCY_RESOLUTION = 300.0
+TOUCH_BATCH = 64
+
+# Extractor attributes naming the taxonomy file it was built from
+TAXONOMY_ATTRIBUTES = ("skill_file_path", "education_file", "experience_file")
+
+_MISSING = object()
+
+
+def taxonomy_version(*paths: str) -> str:
+    """Content hashes of the given taxonomy files plus the cache and artifact format versions."""
+    parts = [f"cache={CACHE_VERSION}", f"format={FORMAT_VERSION}"]
+    parts.extend(f"{path}={registry.fingerprint(path)}" for path in paths)
+    return "|".join(parts)
+
+
+class ExtractionCache:
+    """Two-tier, content-addressed store for extractor results.
+
+    A bounded in-memory LRU sits in front of a SQLite file under ``CACHE_DIR``. The disk
+    tier is shared by every process on the machine and evicts least recently used rows
+    once it grows past ``max_bytes``; recency is tracked to within ``RECENCY_RESOLUTION``
+    seconds, so a hot key costs one write per interval rather than one per read. Both
+    tiers hold pickled values, so every ``get`` returns a fresh copy that the caller may
+    modify freely. Counts of hits, misses, stores and evictions per tier are kept in
+    ``metrics``.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 max_entries: int = EXTRACTION_CACHE_ENTRIES,
+                 max_bytes: int = EXTRACTION_CACHE_MAX_BYTES):
+        self.path = Path(path) if path else (CACHE_DIR / "extractions.sqlite" if CACHE_DIR else None)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.metrics = Counter()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._conn = None
+        self._conn_pid = None
+        self._disk_bytes = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value, or ``default`` if ``key`` is in neither tier."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.metrics["memory_hits"] += 1
+                return pickle.loads(self._memory[key])
+
+            blob = self._disk_get(key)
+            if blob is _MISSING:
+                self.metrics["misses"] += 1
+                return default
+            try:
+                value = pickle.loads(blob)
+            except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                # A corrupt or incompatible row is just a cache miss
+                self.metrics["misses"] += 1
+                return default
+            self.metrics["disk_hits"] += 1
+            self._remember(key, blob)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self.metrics["stores"] += 1
+            self._remember(key, blob)
+            self._disk_put(key, blob)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    with conn:
+                        conn.execute("DELETE FROM extractions")
+                    self._disk_bytes = 0
+                except sqlite3.Error:
+                    pass
+
+    def flush(self) -> None:
+        """Write pending recency refreshes of disk hits to SQLite."""
+        with self._lock:
+            conn = self._connect()
+            if conn is not None and self._touched:
+                self._flush_touched(conn)
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        self._memory[key] = blob
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.metrics["memory_evictions"] += 1
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        # Connections don't survive a fork, so each worker process opens its own
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS extractions_accessed ON extractions (accessed)")
+            self._disk_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+        except (OSError, sqlite3.Error):
+            # Read-only or broken cache dirs fall back to the memory tier only
+            self.path = None
+            return None
+        self._conn, self._conn_pid = conn, os.getpid()
+        return conn
+
+    def _disk_get(self, key: str) -> Any:
+        conn = self._connect()
+        if conn is None:
+            return _MISSING
+        try:
+            row = conn.execute("SELECT value, accessed FROM extractions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return _MISSING
+            now = time.time()
+            if now - row[1] > RECENCY_RESOLUTION:
+                self._touched[key] = now
+                if len(self._touched) >= TOUCH_BATCH:
+                    self._flush_touched(conn)
+            return row[0]
+        except sqlite3.Error:
+            return _MISSING
+
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        touched = [(accessed, key) for key, accessed in self._touched.items()]
+        self._touched.clear()
+        try:
+            with conn:
+                conn.executemany("UPDATE extractions SET accessed = ? WHERE key = ?", touched)
+        except sqlite3.Error:
+            pass
+
+    def _disk_put(self, key: str, blob: bytes) -> None:
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            if self._touched:
+                # Ride along with this write, so eviction sees recent reads
+                self._flush_touched(conn)
+            with conn:
+                old = conn.execute("SELECT size FROM extractions WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO extractions (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, blob, len(blob), time.time()),
+                )
+            self._disk_bytes += len(blob) - (old[0] if old else 0)
+            if self._disk_bytes > self.max_bytes:
+                self._evict(conn)
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Other processes write too, so re-read the real size, then trim to 90% of the cap
+        self._disk_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        if self._disk_bytes <= self.max_bytes:
+            return
+        victims = []
+        freed = 0
+        for key, size in conn.execute("SELECT key, size FROM extractions ORDER BY accessed"):
+            if self._disk_bytes - freed <= target:
+                break
+            victims.append((key,))
+            freed += size
+        with conn:
+            conn.executemany("DELETE FROM extractions WHERE key = ?", victims)
+        self._disk_bytes -= freed
+        self.metrics["disk_evictions"] += len(victims)
+
+
+class CachedExtractor:
+    """Puts an ExtractionCache in front of any resume or job extractor.
+
+    Results are keyed by the sha256 of the input text, the extractor's name, the content
+    hash of its taxonomy file and its scalar settings (thresholds, windows), so editing a
+    taxonomy file or changing a threshold misses instead of returning stale results.
+    Every call returns an object of its own: hits are unpickled afresh from either tier,
+    and a miss stores a snapshot, so callers may mutate what they get back.
+    """
+
+    def __init__(self, extractor: Any, cache: Optional[ExtractionCache] = None, name: Optional[str] = None):
+        self.extractor = extractor
+        self.cache = cache if cache is not None else extraction_cache
+        self.name = name or type(extractor).__name__
+
+    def version(self) -> str:
+        # Taxonomy fingerprints are memoized by file stamp, so this costs a few stat calls
+        settings = vars(self.extractor)
+        parts = [self.name, taxonomy_version(*(settings[attr] for attr in TAXONOMY_ATTRIBUTES if attr in settings))]
+        for attr, value in sorted(settings.items()):
+            if isinstance(value, (bool, int, float, str)) and attr not in TAXONOMY_ATTRIBUTES:
+                parts.append(f"{attr}={value!r}")
+        return "|".join(parts)
+
+    def key(self, text: str, version: Optional[str] = None) -> str:
+        digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+        tag = hashlib.sha256((version or self.version()).encode("utf-8")).hexdigest()[:16]
+        return f"{self.name}:{tag}:{digest}"
+
+    def extract(self, source: Union[str, ParsedDocument]) -> Any:
+        text = source.text if isinstance(source, ParsedDocument) else source
+        key = self.key(text)
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.extractor.extract(source)
+            self.cache.put(key, value)
+        return value
+
+    def extract_many(self, texts: Iterable[str], batch_size: int = 64, n_process: int = 1) -> Iterator[Any]:
+        # Only the misses of each batch go to the extractor, through extract_many when it has one
+        version = self.version()
+        batch: List[Tuple[str, str]] = []
+        for text in texts:
+            batch.append((text, self.key(text, version)))
+            if len(batch) >= batch_size:
+                yield from self._extract_batch(batch, batch_size, n_process)
+                batch = []
+        if batch:
+            yield from self._extract_batch(batch, batch_size, n_process)
+
+    def _extract_batch(self, batch: List[Tuple[str, str]], batch_size: int, n_process: int) -> List[Any]:
+        results: Dict[int, Any] = {}
+        misses = []
+        for i, (text, key) in enumerate(batch):
+            value = self.cache.get(key, _MISSING)
+            if value is _MISSING:
+                misses.append(i)
+            else:
+                results[i] = value
+
+        if misses:
+            texts = [batch[i][0] for i in misses]
+            if hasattr(self.extractor, "extract_many"):
+                values = self.extractor.extract_many(texts, batch_size=batch_size, n_process=n_process)
+            else:
+                values = (self.extractor.extract(text) for text in texts)
+            for i, value in zip(misses, values):
+                self.cache.put(batch[i][1], value)
+                results[i] = value
+
+        return [results[i] for i in range(len(batch))]
+
+
+extraction_cache = ExtractionCache()
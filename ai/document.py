@@ -0,0 +1,113 @@
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from spacy.tokens import Doc, Span
+
+from ai.nlp import NLPView, get_nlp
+from ai.sections import SectionIndex
+
+# Same boundaries as str.splitlines(), so offsets line up with the line-based section logic
+_LINE_BREAK = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+class Line(NamedTuple):
+    start: int
+    end: int
+    text: str
+
+
+class TextBlock:
+    """A run of lines from a ParsedDocument, e.g. one education or experience entry."""
+
+    def __init__(self, document: "ParsedDocument", lines: List[Line]):
+        self.document = document
+        self.lines = lines
+        self.text = "\n".join(line.text.strip() for line in lines).strip()
+
+    @property
+    def start(self) -> int:
+        for line in self.lines:
+            if line.text.strip():
+                return line.start + len(line.text) - len(line.text.lstrip())
+        return self.lines[0].start if self.lines else 0
+
+    @property
+    def end(self) -> int:
+        for line in reversed(self.lines):
+            if line.text.strip():
+                return line.end - (len(line.text) - len(line.text.rstrip()))
+        return self.lines[-1].end if self.lines else 0
+
+    @property
+    def span(self) -> Optional[Span]:
+        if not self.text:
+            return None
+        return self.document.span(self.start, self.end)
+
+
+class ParsedDocument:
+    """Text, line offsets and a single spaCy parse shared by every extractor.
+
+    The ``Doc`` is produced lazily on first access, so extractors that never touch spaCy
+    don't pay for it. Build one with the full pipeline (the default) and hand it to every
+    resume extractor to analyse a resume with exactly one parse.
+    """
+
+    def __init__(self, text: str, nlp: Optional[NLPView] = None, doc: Optional[Doc] = None):
+        self.text = text
+        self.nlp = nlp or get_nlp()
+        self._doc = doc
+        self._sections = None
+        self.lines = self._index_lines(text)
+
+    @classmethod
+    def of(cls, source: Union[str, "ParsedDocument"], nlp: Optional[NLPView] = None) -> "ParsedDocument":
+        if isinstance(source, ParsedDocument):
+            return source
+        return cls(source, nlp=nlp)
+
+    @classmethod
+    def pipe(cls, texts: Iterable[str], nlp: Optional[NLPView] = None,
+             batch_size: int = 64, n_process: int = 1) -> Iterator["ParsedDocument"]:
+        # Stream texts through nlp.pipe so the model sees whole batches; order is preserved
+        nlp = nlp or get_nlp()
+        for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+            yield cls(doc.text, nlp=nlp, doc=doc)
+
+    @staticmethod
+    def _index_lines(text: str) -> List[Line]:
+        lines = []
+        start = 0
+        for match in _LINE_BREAK.finditer(text):
+            lines.append(Line(start, match.start(), text[start:match.start()]))
+            start = match.end()
+        if start < len(text):
+            lines.append(Line(start, len(text), text[start:]))
+        return lines
+
+    @property
+    def doc(self) -> Doc:
+        if self._doc is None:
+            self._doc = self.nlp(self.text)
+        return self._doc
+
+    @property
+    def is_parsed(self) -> bool:
+        return self._doc is not None
+
+    @property
+    def sections(self) -> SectionIndex:
+        if self._sections is None:
+            self._sections = SectionIndex(self.lines, len(self.text))
+        return self._sections
+
+    def section(self, name: str) -> List[Line]:
+        # Lines of the first section with this name, sliced by index from the shared line table
+        found = self.sections.get(name)
+        return self.lines[found.first_line:found.last_line] if found else []
+
+    def span(self, start: int, end: int) -> Optional[Span]:
+        return self.doc.char_span(start, end, alignment_mode="expand")
+
+    def block(self, lines: List[Line]) -> TextBlock:
+        return TextBlock(self, lines)
@@ -0,0 +1,144 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Every experience pattern is compiled once here and shared by the resume/job extractors
+# and both ExperienceMatcher classes, so hot loops never lower-case or recompile anything.
+
+_TITLE_CHARS = r"[a-zA-Z\s,&/\\-]+"
+_TITLE_SUFFIX = r"(?:engineer|scientist|developer|analyst|architect|manager|consultant|specialist)"
+_LEVELS = r"(?:senior|junior|lead|principal|staff)"
+
+
+def _compile(patterns: List[str], flags: int = re.IGNORECASE) -> List[re.Pattern]:
+    return [re.compile(pattern, flags) for pattern in patterns]
+
+
+def _keywords(words: List[str]) -> str:
+    return "|".join(re.escape(word) for word in words)
+
+
+# Resume side
+DATE_PATTERNS = _compile([
+    r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(?:19|20)\d{2}",
+    r"(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+(?:19|20)\d{2}",
+    r"\d{1,2}/\d{1,2}/(?:19|20)\d{2}",
+    r"\d{1,2}-\d{1,2}-(?:19|20)\d{2}",
+])
+DATE_PATTERN = re.compile("|".join(f"(?:{p.pattern})" for p in DATE_PATTERNS), re.IGNORECASE)
+
+RESUME_SKILL_PATTERNS = _compile([
+    rf"(?:proficient|expert|skilled|experienced)\s+(?:in|with|at)\s+({_TITLE_CHARS})",
+    rf"(?:strong|solid|excellent|good|deep)\s+(?:knowledge|understanding|experience|proficiency)\s+(?:in|with|of)\s+({_TITLE_CHARS})",
+    rf"(?:familiarity|familiar)\s+(?:with|in)\s+({_TITLE_CHARS})",
+    rf"(?:developed|created|implemented|built|designed)\s+(?:using|with)\s+({_TITLE_CHARS})",
+    rf"(?:utilized|used|worked with)\s+({_TITLE_CHARS})",
+])
+
+ACHIEVEMENT_PATTERNS = _compile([
+    r"(?:increased|improved|enhanced|optimized|reduced|decreased)\s+[^.]*?by\s+\d+%",
+    r"(?:led|managed|supervised|coordinated)\s+[^.]*?team",
+    r"(?:developed|created|implemented|built|designed)\s+[^.]*?solution",
+    r"(?:achieved|attained|reached)\s+[^.]*?goal",
+    r"(?:saved|reduced|decreased)\s+[^.]*?cost",
+])
+
+# The suffixed form is a special case of the plain one, so one anchored pattern covers both
+BLOCK_TITLE_PATTERN = re.compile(r"^([A-Z][A-Za-z &]+)$", re.IGNORECASE)
+
+# Job side
+JOB_SKILL_PATTERNS = _compile([
+    rf"(?:proficiency|experience|expertise|knowledge|skills?)\s+(?:in|with|of)\s+({_TITLE_CHARS})",
+    rf"(?:strong|solid|excellent|good|deep)\s+(?:knowledge|understanding|experience|proficiency)\s+(?:in|with|of)\s+({_TITLE_CHARS})",
+    rf"(?:familiarity|familiar)\s+(?:with|in)\s+({_TITLE_CHARS})",
+])
+
+JOB_TITLE_PATTERNS = _compile([
+    # Primary job title patterns
+    rf"(?:job title|position|role|title)\s*:?\s*({_TITLE_CHARS}{_TITLE_SUFFIX})",
+    rf"(?:looking for|seeking|hiring)\s+(?:a|an)?\s+(?:highly skilled|experienced)?\s+{_LEVELS}?\s+({_TITLE_CHARS}{_TITLE_SUFFIX})",
+    rf"(?:we are|we're)\s+(?:looking for|seeking|hiring)\s+(?:a|an)?\s+(?:highly skilled|experienced)?\s+{_LEVELS}?\s+({_TITLE_CHARS}{_TITLE_SUFFIX})",
+    # Role-specific patterns
+    rf"{_LEVELS}\s+({_TITLE_CHARS}{_TITLE_SUFFIX})",
+    rf"({_TITLE_CHARS}{_TITLE_SUFFIX})",
+])
+
+JOB_EXPERIENCE_PATTERNS = _compile([
+    r"(\d{1,2}\+?)\s*(?:years|yrs|year|yr)s?\s*(?:of)?\s*experience(?:\s+in|\s+with|\s+as)?\s+([a-zA-Z\s,&/\\-]+)",
+    r"experience\s+of\s+(\d{1,2}\+?)\s*(?:years|yrs|year|yr)s?\s*(?:in|\s+with|\s+as)?\s+([a-zA-Z\s,&/\\-]+)",
+    r"minimum\s+of\s+(\d{1,2}\+?)\s*(?:years|yrs|year|yr)s?\s*(?:of)?\s*experience(?:\s+in|\s+with|\s+as)?\s+([a-zA-Z\s,&/\\-]+)",
+])
+
+IGNORED_TITLE_PATTERN = re.compile(_keywords([
+    "key responsibilities", "about the role", "job description", "requirements",
+    "qualifications", "responsibilities", "duties", "skills",
+]), re.IGNORECASE)
+TITLE_INDICATOR_PATTERN = re.compile(_keywords([
+    "engineer", "scientist", "developer", "analyst", "architect", "manager", "consultant", "specialist",
+]), re.IGNORECASE)
+HIRING_CONTEXT_PATTERN = re.compile(_keywords(["looking for", "seeking", "hiring", "position of"]), re.IGNORECASE)
+
+# Job text is cut into requirement sentences on these characters
+SENTENCE_BREAK = re.compile(r"[.•\n]")
+
+# "minimum of N years", "at least N years" and "N years of experience" all contain this
+# pattern, so its leftmost hit is the leftmost hit of any of them.
+YEARS_PATTERN = re.compile(r"(\d{1,2})\+?\s*(?:years?|yrs?)", re.IGNORECASE)
+
+REQUIREMENT_KEYWORDS = {
+    "required": ["required", "must have", "mandatory", "essential", "minimum"],
+    "preferred": ["preferred", "nice to have", "desired", "bonus", "plus"],
+    "years": ["years", "yrs", "year", "yr"],
+    "experience": ["experience", "exp", "expertise", "proficiency"],
+}
+
+# One alternation for the years count and every keyword group. No keyword contains another
+# group's keyword, and a years hit always contains a "years" keyword, so consuming matches
+# never hides anything.
+REQUIREMENT_SCANNER = re.compile(
+    r"(?P<count>\d{1,2})\+?\s*(?:years?|yrs?)"
+    + "".join(f"|(?P<{kind}>{_keywords(words)})" for kind, words in REQUIREMENT_KEYWORDS.items()),
+    re.IGNORECASE,
+)
+
+# Zero-width alternation: at each offset the highest-priority pattern that matches wins, so
+# the first hit of the best-priority pattern is exactly what searching them in order returns.
+REQUIREMENT_TITLE_SCANNER = re.compile(
+    r"(?=(?:experience|expertise|proficiency)\s+(?:in|with|as)\s+(?P<t0>" + _TITLE_CHARS + r")"
+    r"|(?:role|position|job)\s+(?:of|as)\s+(?P<t1>" + _TITLE_CHARS + r")"
+    r"|(?P<t2>" + _TITLE_CHARS + _TITLE_SUFFIX + r"))",
+    re.IGNORECASE,
+)
+
+
+class RequirementScan:
+    """Every years count and requirement keyword found in one pass over a text."""
+
+    def __init__(self, text: str):
+        self.years: List[Tuple[int, int, int]] = []
+        self.keywords: Dict[str, List[Tuple[int, int]]] = {kind: [] for kind in REQUIREMENT_KEYWORDS}
+        for match in REQUIREMENT_SCANNER.finditer(text):
+            kind = match.lastgroup
+            if kind == "count":
+                self.years.append((int(match.group("count")), match.start(), match.end()))
+                self.keywords["years"].append(match.span())
+            else:
+                self.keywords[kind].append(match.span())
+
+    @property
+    def min_years(self) -> Optional[int]:
+        return self.years[0][0] if self.years else None
+
+    def has(self, kind: str) -> bool:
+        return bool(self.keywords[kind])
+
+
+def find_requirement_title(text: str) -> Optional[str]:
+    best = None
+    best_rank = 3
+    for match in REQUIREMENT_TITLE_SCANNER.finditer(text):
+        rank = int(match.lastgroup[1])
+        if rank < best_rank:
+            best, best_rank = match.group(match.lastgroup), rank
+            if rank == 0:
+                break
+    return best
@@ -2,36 +2,40 @@ import json
 import re
 from typing import List, Dict, Optional
 from pathlib import Path
+from ai.taxonomy import infer_degree_level, registry
 
 
-class JobEducationExtractor:
-    def __init__(self, education_file: str = "data/education.json"):
-        self.education_data = self._load_education_data(education_file)
-        self.degree_lookup = self._build_degree_lookup()
+_REQUIRED_PATTERN = re.compile(r"required")
+_PREFERRED_PATTERN = re.compile(r"preferred")
+_MAJOR_AFTER_DEGREE = re.compile(r" (?:in|of)\s+")
+_MAJOR_AFTER_CONTEXT = re.compile(r"(?:degree|background) in\s+")
+_MAJOR_WORDS = re.compile(r"[\w\s&]+")
 
-    def _load_education_data(self, path: str) -> List[Dict]:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
 
-    def _build_degree_lookup(self) -> Dict[str, str]:
-        lookup = {}
-        for item in self.education_data:
-            normalized = item["degree"].strip().lower()
-            aliases = item.get("aliases", [])
-            for alias in [normalized] + aliases:
-                lookup[alias.strip().lower()] = item["degree"]
-        return lookup
+class JobEducationExtractor:
+    def __init__(self, education_file: str = "data/degrees.json", window: int = 50):
+        self.education_file = education_file
+        self.degree_lookup = registry.degree_lookup(education_file)
+        self.scanner = registry.degree_scanner(education_file)
+        self.degree_levels = {d["degree"]: d["level"] for d in registry.degree_taxonomy(education_file)["degrees"]}
+        self.window = window
 
     def extract(self, job_text: str) -> List[Dict]:
         text = job_text.lower()
         results = []
-
-        for alias, degree in self.degree_lookup.items():
-            if alias in text:
-                required = "required" in self._surrounding_text(text, alias, window=50)
-                preferred = "preferred" in self._surrounding_text(text, alias, window=50)
-                major = self._extract_major(text, alias)
-
+        by_degree = {}
+
+        # One pass over the text finds every degree mention; context comes from its window
+        for hit in self.scanner.scan(text):
+            degree = self.degree_lookup[hit.phrase]
+            start = max(0, hit.start - self.window)
+            end = hit.end + self.window
+            required = _REQUIRED_PATTERN.search(text, start, end) is not None
+            preferred = _PREFERRED_PATTERN.search(text, start, end) is not None
+            major = self._extract_major(text, hit.end, start, end)
+
+            entry = by_degree.get(degree)
+            if entry is None:
                 entry = {
                     "degree": degree,
                     "major": major,
@@ -39,39 +43,25 @@ class JobEducationExtractor:
                     "preferred": preferred,
                     "degree_level": self._infer_level(degree),
                 }
-
-                if not any(e["degree"] == degree for e in results):
-                    results.append(entry)
+                by_degree[degree] = entry
+                results.append(entry)
+            else:
+                entry["major"] = entry["major"] or major
+                entry["required"] = entry["required"] or required
+                entry["preferred"] = entry["preferred"] or preferred
 
         return results
 
-    def _surrounding_text(self, text: str, keyword: str, window: int = 50) -> str:
-        idx = text.find(keyword)
-        start = max(0, idx - window)
-        end = idx + len(keyword) + window
-        return text[start:end]
-
     def _infer_level(self, degree: str) -> str:
-        degree = degree.lower()
-        if "phd" in degree or "doctor" in degree:
-            return "phd"
-        elif "master" in degree or "mba" in degree:
-            return "master"
-        elif "bachelor" in degree:
-            return "bachelor"
-        elif "associate" in degree:
-            return "associate"
-        return "unspecified"
-
-    def _extract_major(self, text: str, alias: str) -> Optional[str]:
-        patterns = [
-            fr"{alias} (in|of)\s+([\w\s&]+)",
-            fr"(degree|background) in\s+([\w\s&]+)"
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(2).strip().title()
+        return self.degree_levels.get(degree) or infer_degree_level(degree)
+
+    def _extract_major(self, text: str, degree_end: int, start: int, end: int) -> Optional[str]:
+        # "<degree> in/of <major>" right after the mention, else "degree/background in <major>" nearby
+        match = _MAJOR_AFTER_DEGREE.match(text, degree_end) or _MAJOR_AFTER_CONTEXT.search(text, start, end)
+        if match:
+            words = _MAJOR_WORDS.match(text, match.end())
+            if words:
+                return words.group(0).strip().title()
         return None
     
 def main():
@@ -82,7 +72,7 @@ def main():
 
     job_text = job_path.read_text(encoding="utf-8")
 
-    extractor = JobEducationExtractor("data/education.json")
+    extractor = JobEducationExtractor("data/degrees.json")
     education_requirements = extractor.extract(job_text)
 
     if education_requirements:
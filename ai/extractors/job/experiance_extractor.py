@@ -1,10 +1,18 @@
-import re
 import json
+from collections import Counter
 from typing import List, Dict, Optional, Tuple, Set
 from pathlib import Path
-from rapidfuzz import process, fuzz
+from rapidfuzz import fuzz
 from dataclasses import dataclass
 from datetime import datetime
+import numpy as np
+from ai.experience_patterns import (
+    HIRING_CONTEXT_PATTERN, IGNORED_TITLE_PATTERN, JOB_EXPERIENCE_PATTERNS, JOB_SKILL_PATTERNS,
+    JOB_TITLE_PATTERNS, REQUIREMENT_KEYWORDS, SENTENCE_BREAK, TITLE_INDICATOR_PATTERN, YEARS_PATTERN,
+    RequirementScan, find_requirement_title,
+)
+from ai.fuzzy import FuzzyResolver
+from ai.taxonomy import registry
 
 @dataclass
 class ExperienceMatch:
@@ -20,82 +28,48 @@ class ExperienceMatch:
 
 class ExperienceMatcher:
     def __init__(self, experience_file: str = "data/experience.json"):
-        self.experience_db = self._load_experience_data(experience_file)
-        self.title_lookup = self._build_title_lookup()
-        self.skill_patterns = [
-            r"(?:proficiency|experience|expertise|knowledge|skills?)\s+(?:in|with|of)\s+([a-zA-Z\s,&/\\-]+)",
-            r"(?:strong|solid|excellent|good|deep)\s+(?:knowledge|understanding|experience|proficiency)\s+(?:in|with|of)\s+([a-zA-Z\s,&/\\-]+)",
-            r"(?:familiarity|familiar)\s+(?:with|in)\s+([a-zA-Z\s,&/\\-]+)",
-        ]
-        self.required_keywords = {
-            "required": ["required", "must have", "mandatory", "essential", "minimum"],
-            "preferred": ["preferred", "nice to have", "desired", "bonus", "plus"],
-            "years": ["years", "yrs", "year", "yr"],
-            "experience": ["experience", "exp", "expertise", "proficiency"]
-        }
-
-    def _load_experience_data(self, path: str) -> List[Dict]:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def _build_title_lookup(self) -> Dict[str, Dict]:
-        lookup = {}
-        for item in self.experience_db:
-            key = item["title"].lower().strip()
-            lookup[key] = item
-            for alias in item.get("aliases", []):
-                lookup[alias.lower().strip()] = item
-        return lookup
+        self.title_lookup = registry.title_lookup(experience_file)
+        self.title_resolver = FuzzyResolver(self.title_lookup, [(fuzz.token_sort_ratio, 85)])
+        self.skill_patterns = JOB_SKILL_PATTERNS
+        self.required_keywords = REQUIREMENT_KEYWORDS
 
     def _extract_skills(self, text: str) -> List[str]:
         skills = set()
         for pattern in self.skill_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+            for match in pattern.finditer(text):
                 skill = match.group(1).strip().lower()
                 if skill and len(skill.split()) <= 5:  # Avoid long phrases
                     skills.add(skill)
         return list(skills)
 
     def _extract_years(self, text: str) -> Optional[int]:
-        # Match various year formats
-        patterns = [
-            r"(\d{1,2})\+?\s*(?:years?|yrs?)",
-            r"minimum\s+of\s+(\d{1,2})\+?\s*(?:years?|yrs?)",
-            r"at least\s+(\d{1,2})\+?\s*(?:years?|yrs?)",
-            r"(\d{1,2})\+?\s*(?:years?|yrs?)\s+of\s+experience"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return int(match.group(1))
-        return None
+        return RequirementScan(text).min_years
 
     def _is_required(self, text: str) -> bool:
-        return any(kw in text.lower() for kw in self.required_keywords["required"])
+        return RequirementScan(text).has("required")
 
     def _is_preferred(self, text: str) -> bool:
-        return any(kw in text.lower() for kw in self.required_keywords["preferred"])
+        return RequirementScan(text).has("preferred")
 
-    def _calculate_confidence(self, text: str, years: Optional[int]) -> float:
+    def _calculate_confidence(self, scan: RequirementScan) -> float:
         confidence = 0.5  # Base confidence
         
         # Adjust based on presence of key indicators
-        if years is not None:
+        if scan.min_years is not None:
             confidence += 0.2
-        if any(kw in text.lower() for kw in self.required_keywords["experience"]):
+        if scan.has("experience"):
             confidence += 0.1
-        if any(kw in text.lower() for kw in self.required_keywords["years"]):
+        if scan.has("years"):
             confidence += 0.1
-        if self._is_required(text) or self._is_preferred(text):
+        if scan.has("required") or scan.has("preferred"):
             confidence += 0.1
             
         return min(confidence, 1.0)
 
     def match(self, text: str) -> Optional[ExperienceMatch]:
-        # Extract years
-        years = self._extract_years(text)
+        # Years and every requirement keyword in one pass over the sentence
+        scan = RequirementScan(text)
+        years = scan.min_years
         if not years:
             return None
 
@@ -103,29 +77,19 @@ class ExperienceMatcher:
         skills = self._extract_skills(text)
 
         # Try to match title
-        title = None
         normalized_title = None
         field = None
         level = None
 
-        # Look for title patterns in the text
-        title_patterns = [
-            r"(?:experience|expertise|proficiency)\s+(?:in|with|as)\s+([a-zA-Z\s,&/\\-]+)",
-            r"(?:role|position|job)\s+(?:of|as)\s+([a-zA-Z\s,&/\\-]+)",
-            r"([a-zA-Z\s,&/\\-]+(?:engineer|scientist|developer|analyst|architect|manager|consultant|specialist))"
-        ]
-
-        for pattern in title_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                title = match.group(1).strip()
-                # Try to normalize the title
-                matched = self._match_title(title)
-                if matched:
-                    normalized_title = matched["title"]
-                    field = matched.get("field")
-                    level = self._extract_level(title)
-                break
+        title = find_requirement_title(text)
+        if title is not None:
+            title = title.strip()
+            # Try to normalize the title
+            matched = self._match_title(title)
+            if matched:
+                normalized_title = matched["title"]
+                field = matched.get("field")
+                level = self._extract_level(title)
 
         if not title:
             return None
@@ -134,31 +98,18 @@ class ExperienceMatcher:
             title=title,
             normalized_title=normalized_title,
             years=years,
-            required=self._is_required(text),
-            preferred=self._is_preferred(text),
-            confidence=self._calculate_confidence(text, years),
+            required=scan.has("required"),
+            preferred=scan.has("preferred"),
+            confidence=self._calculate_confidence(scan),
             field=field,
             skills=skills,
             level=level
         )
 
     def _match_title(self, text: str) -> Optional[Dict]:
-        text = text.lower().strip()
-        
-        # Try exact match first
-        if text in self.title_lookup:
-            return self.title_lookup[text]
-            
-        # Try fuzzy matching
-        best_match, score, _ = process.extractOne(
-            text,
-            self.title_lookup.keys(),
-            scorer=fuzz.token_sort_ratio
-        )
-        if score >= 85:
-            return self.title_lookup[best_match]
-            
-        return None
+        # Exact match first, then fuzzy with a native score cutoff
+        best_match, _ = self.title_resolver.resolve_one(text.lower().strip())
+        return self.title_lookup[best_match] if best_match else None
 
     def _extract_level(self, title: str) -> Optional[str]:
         title_lower = title.lower()
@@ -176,87 +127,31 @@ class ExperienceMatcher:
 
 class JobExperienceExtractor:
     def __init__(self, experience_file: str = "data/experience.json"):
-        self.experience_db = self._load_experience_data(experience_file)
-        self.title_lookup = self._build_title_lookup()
-        self.experience_matcher = ExperienceMatcher(experience_file)
-        self.title_patterns = [
-            # Primary job title patterns
-            r"(?:job title|position|role|title)\s*:?\s*([a-zA-Z\s,&/\\-]+(?:engineer|scientist|developer|analyst|architect|manager|consultant|specialist))",
-            r"(?:looking for|seeking|hiring)\s+(?:a|an)?\s+(?:highly skilled|experienced)?\s+(?:senior|junior|lead|principal|staff)?\s+([a-zA-Z\s,&/\\-]+(?:engineer|scientist|developer|analyst|architect|manager|consultant|specialist))",
-            r"(?:we are|we're)\s+(?:looking for|seeking|hiring)\s+(?:a|an)?\s+(?:highly skilled|experienced)?\s+(?:senior|junior|lead|principal|staff)?\s+([a-zA-Z\s,&/\\-]+(?:engineer|scientist|developer|analyst|architect|manager|consultant|specialist))",
-            # Role-specific patterns
-            r"(?:senior|junior|lead|principal|staff)\s+([a-zA-Z\s,&/\\-]+(?:engineer|scientist|developer|analyst|architect|manager|consultant|specialist))",
-            r"([a-zA-Z\s,&/\\-]+(?:engineer|scientist|developer|analyst|architect|manager|consultant|specialist))",
-        ]
-        self.experience_patterns = [
-            r"(\d{1,2}\+?)\s*(?:years|yrs|year|yr)s?\s*(?:of)?\s*experience(?:\s+in|\s+with|\s+as)?\s+([a-zA-Z\s,&/\\-]+)",
-            r"experience\s+of\s+(\d{1,2}\+?)\s*(?:years|yrs|year|yr)s?\s*(?:in|\s+with|\s+as)?\s+([a-zA-Z\s,&/\\-]+)",
-            r"minimum\s+of\s+(\d{1,2}\+?)\s*(?:years|yrs|year|yr)s?\s*(?:of)?\s*experience(?:\s+in|\s+with|\s+as)?\s+([a-zA-Z\s,&/\\-]+)",
-        ]
-        self.ignored_patterns = [
-            r"key responsibilities",
-            r"about the role",
-            r"job description",
-            r"requirements",
-            r"qualifications",
-            r"responsibilities",
-            r"duties",
-            r"skills",
-        ]
-
-    def _load_experience_data(self, path: str) -> List[Dict]:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def _build_title_lookup(self) -> Dict[str, Dict]:
-        lookup = {}
-        for item in self.experience_db:
-            # Add main title
-            key = item["title"].lower().strip()
-            lookup[key] = item
-            
-            # Add aliases
-            for alias in item.get("aliases", []):
-                lookup[alias.lower().strip()] = item
-                
-            # Add common variations
-            if "senior" in key:
-                lookup[key.replace("senior", "sr")] = item
-            if "junior" in key:
-                lookup[key.replace("junior", "jr")] = item
-            if "lead" in key:
-                lookup[key.replace("lead", "principal")] = item
-                
-        return lookup
-
-    def _match_title(self, text: str) -> Optional[Dict]:
-        text = text.lower().strip()
-        
-        # Try exact match first
-        if text in self.title_lookup:
-            return self.title_lookup[text]
-            
-        # Try fuzzy matching with different strategies
-        strategies = [
+        self.experience_file = experience_file
+        self.title_lookup = registry.title_lookup(experience_file, variants=True)
+        self.title_resolver = FuzzyResolver(self.title_lookup, [
             (fuzz.token_sort_ratio, 85),
             (fuzz.token_set_ratio, 90),
             (fuzz.partial_ratio, 95)
-        ]
-        
-        for scorer, threshold in strategies:
-            best_match, score, _ = process.extractOne(
-                text,
-                self.title_lookup.keys(),
-                scorer=scorer
-            )
-            if score >= threshold:
-                return self.title_lookup[best_match]
-                
-        return None
+        ])
+        self.experience_matcher = ExperienceMatcher(experience_file)
+        self.title_patterns = JOB_TITLE_PATTERNS
+        self.experience_patterns = JOB_EXPERIENCE_PATTERNS
+        self.ignored_pattern = IGNORED_TITLE_PATTERN
+        # Sentences seen and dropped per stage of requirement extraction, across calls
+        self.stage_counts = Counter()
+
+    def _match_titles(self, titles: List[str]) -> List[Optional[Dict]]:
+        # Exact match first, then each fuzzy strategy in turn, all titles scored at once
+        matches = self.title_resolver.matches([title.lower().strip() for title in titles])
+        return [self.title_lookup[match[0]] if match else None for match in matches]
+
+    def _match_title(self, text: str) -> Optional[Dict]:
+        return self._match_titles([text])[0]
 
     def _is_valid_title(self, text: str) -> bool:
         # Check if the text contains any ignored patterns
-        if any(re.search(pattern, text.lower()) for pattern in self.ignored_patterns):
+        if self.ignored_pattern.search(text):
             return False
             
         # Check if the text is too long (likely not a title)
@@ -264,8 +159,7 @@ class JobExperienceExtractor:
             return False
             
         # Check if the text contains common job title indicators
-        title_indicators = ["engineer", "scientist", "developer", "analyst", "architect", "manager", "consultant", "specialist"]
-        return any(indicator in text.lower() for indicator in title_indicators)
+        return TITLE_INDICATOR_PATTERN.search(text) is not None
 
     def _deduplicate_titles(self, titles: List[Dict]) -> List[Dict]:
         seen_titles: Set[str] = set()
@@ -286,21 +180,26 @@ class JobExperienceExtractor:
         return unique_titles
 
     def _extract_titles(self, text: str) -> List[Dict]:
-        titles = []
+        candidates = []
         for pattern in self.title_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+            for match in pattern.finditer(text):
                 title = match.group(1).strip()
                 if title and self._is_valid_title(title):
-                    matched = self._match_title(title)
-                    entry = {
-                        "raw_title": title,
-                        "normalized_title": matched["title"] if matched else None,
-                        "field": matched.get("field") if matched else None,
-                        "level": self._extract_level(title),
-                        "confidence": self._calculate_confidence(match)
-                    }
-                    titles.append(entry)
+                    candidates.append((title, match))
+
+        # Resolve all candidate titles in one batch
+        resolved = self._match_titles([title for title, _ in candidates])
+
+        titles = []
+        for (title, match), matched in zip(candidates, resolved):
+            entry = {
+                "raw_title": title,
+                "normalized_title": matched["title"] if matched else None,
+                "field": matched.get("field") if matched else None,
+                "level": self._extract_level(title),
+                "confidence": self._calculate_confidence(match)
+            }
+            titles.append(entry)
         
         # Deduplicate titles
         return self._deduplicate_titles(titles)
@@ -328,8 +227,7 @@ class JobExperienceExtractor:
             confidence += 0.1
             
         # Adjust based on surrounding context
-        context = match.group(0).lower()
-        if any(kw in context for kw in ["looking for", "seeking", "hiring", "position of"]):
+        if HIRING_CONTEXT_PATTERN.search(match.group(0)):
             confidence += 0.1
             
         return min(confidence, 1.0)
@@ -337,37 +235,52 @@ class JobExperienceExtractor:
     def _extract_experience_requirements(self, text: str) -> List[Dict]:
         experience_entries = []
         seen_requirements: Set[str] = set()
-        
-        # Split text into sentences or bullet points
-        sentences = re.split(r'[.•\n]', text)
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-                
+        stages = self.stage_counts
+
+        # Split text into sentences or bullet points, keeping their offsets
+        breaks = [match.start() for match in SENTENCE_BREAK.finditer(text)]
+        starts = np.array([0] + [b + 1 for b in breaks], dtype=np.int64)
+        ends = breaks + [len(text)]
+        stages["sentences"] += len(starts)
+
+        # Gate: match() needs a years count, so find them all in one pass over the text and
+        # map every hit to its sentence at once; only those sentences get parsed
+        hits = np.fromiter((match.start() for match in YEARS_PATTERN.finditer(text)), dtype=np.int64)
+        gated = np.zeros(len(starts), dtype=bool)
+        gated[np.searchsorted(starts, hits, side="right") - 1] = True
+        candidates = np.flatnonzero(gated)
+        stages["gate_dropped"] += len(starts) - len(candidates)
+
+        for i in candidates:
+            sentence = text[starts[i]:ends[i]].strip()
+
             # Try to match experience in this sentence
             match = self.experience_matcher.match(sentence)
-            if match:
-                # Create a unique key for deduplication
-                requirement_key = f"{match.years}_{match.normalized_title or match.title}"
-                if requirement_key in seen_requirements:
-                    continue
-                    
-                seen_requirements.add(requirement_key)
-                
-                entry = {
-                    "title": match.title,
-                    "normalized_title": match.normalized_title,
-                    "field": match.field,
-                    "min_years": match.years,
-                    "required": match.required,
-                    "preferred": match.preferred,
-                    "confidence": match.confidence,
-                    "skills": match.skills,
-                    "level": match.level
-                }
-                experience_entries.append(entry)
+            if not match:
+                stages["matcher_dropped"] += 1
+                continue
+
+            # Create a unique key for deduplication
+            requirement_key = f"{match.years}_{match.normalized_title or match.title}"
+            if requirement_key in seen_requirements:
+                stages["duplicate_dropped"] += 1
+                continue
+
+            seen_requirements.add(requirement_key)
+            stages["kept"] += 1
+
+            entry = {
+                "title": match.title,
+                "normalized_title": match.normalized_title,
+                "field": match.field,
+                "min_years": match.years,
+                "required": match.required,
+                "preferred": match.preferred,
+                "confidence": match.confidence,
+                "skills": match.skills,
+                "level": match.level
+            }
+            experience_entries.append(entry)
 
         return experience_entries
 
@@ -1,67 +1,86 @@
-import json
 import re
 from pathlib import Path
-from typing import List, Dict
-from rapidfuzz import fuzz, process
-import spacy
+from typing import Iterable, Iterator, List, Dict, Set, Union
+from rapidfuzz import fuzz
+from ai.document import ParsedDocument
+from ai.fuzzy import FuzzyResolver
+from ai.nlp import get_nlp
+from ai.taxonomy import registry
 
 class JobSkillExtractor:
-    def __init__(self, skill_file_path: str = "data/skills_fixed.json", fuzzy_threshold: int = 85):
-        self.skills = self._load_skills(skill_file_path)
-        self.skill_lookup = self._build_lookup()
+    def __init__(self, skill_file_path: str = "data/skills.json", fuzzy_threshold: int = 85):
+        self.skill_file_path = skill_file_path
+        self.skill_lookup = registry.skill_lookup(skill_file_path)
+        self.scanner = registry.skill_scanner(skill_file_path)
         self.fuzzy_threshold = fuzzy_threshold
-        self.nlp = spacy.load("en_core_web_sm", disable=["ner"])
-
-    def _load_skills(self, path: str) -> List[Dict]:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def _build_lookup(self) -> Dict[str, Dict]:
-        lookup = {}
-        for skill in self.skills:
-            keys = set([skill["name"], skill["normalized_name"]] + skill.get("aliases", []))
-            for k in keys:
-                lookup[k.strip().lower()] = skill
-        return lookup
+        self.resolver = FuzzyResolver(self.skill_lookup, [(fuzz.token_sort_ratio, fuzzy_threshold)])
+        self.nlp = get_nlp(disable=["ner"])
 
     def _normalize(self, text: str) -> str:
         return re.sub(r"[^\w\s\-\.]", "", text).strip().lower()
 
-    def extract(self, job_text: str) -> List[Dict]:
-        doc = self.nlp(job_text)
+    def _candidates(self, doc, covered: bytearray) -> Set[str]:
         candidates = set()
+        max_words = max(self.scanner.max_words, 1)
 
         for token in doc:
+            if covered[token.idx]:
+                continue
             if not token.is_stop and not token.is_punct and len(token.text) > 2:
                 candidates.add(self._normalize(token.text))
         for chunk in doc.noun_chunks:
-            candidates.add(self._normalize(chunk.text))
+            # No alias is longer than max_words, so longer chunks are only scored as windows of that size
+            if len(chunk) <= max_words:
+                windows = [chunk]
+            else:
+                windows = [chunk[i:i + max_words] for i in range(len(chunk) - max_words + 1)]
+            for window in windows:
+                if not any(covered[token.idx] for token in window):
+                    candidates.add(self._normalize(window.text))
+
+        candidates.discard("")
+        return candidates
 
+    def _add_match(self, matches: List[Dict], seen: Set[str], skill: Dict, matched_text: str, score: float) -> None:
+        norm = skill["normalized_name"]
+        if norm in seen:
+            return
+        seen.add(norm)
+        matches.append({
+            "id": skill["id"],
+            "matched_text": matched_text,
+            "normalized_name": norm,
+            "original_name": skill["name"],
+            "category": skill["category"],
+            "subcategory": skill["subcategory"],
+            "aliases": skill.get("aliases", []),
+            "tags": skill.get("tags", []),
+            "related_skills": skill.get("related_skills", []),
+            "score": score,
+        })
+
+    def extract(self, job_text: Union[str, ParsedDocument]) -> List[Dict]:
+        document = ParsedDocument.of(job_text, self.nlp)
+        text = document.text
         matches = []
         seen = set()
 
-        for candidate in candidates:
-            best, score, _ = process.extractOne(candidate, self.skill_lookup.keys(), scorer=fuzz.token_sort_ratio)
-            if score >= self.fuzzy_threshold:
-                skill = self.skill_lookup[best]
-                norm = skill["normalized_name"]
+        # Exact mentions first, in one linear pass; only what they don't cover is fuzzy-scored
+        covered = bytearray(len(text) + 1)
+        for hit in self.scanner.scan(text):
+            covered[hit.start:hit.end] = b"\x01" * (hit.end - hit.start)
+            self._add_match(matches, seen, self.skill_lookup[hit.phrase], self._normalize(text[hit.start:hit.end]), 100.0)
 
-                if norm not in seen:
-                    seen.add(norm)
-                    matches.append({
-                        "id": skill["id"],
-                        "matched_text": candidate,
-                        "normalized_name": norm,
-                        "original_name": skill["name"],
-                        "category": skill["category"],
-                        "subcategory": skill["subcategory"],
-                        "aliases": skill.get("aliases", []),
-                        "tags": skill.get("tags", []),
-                        "related_skills": skill.get("related_skills", []),
-                        "score": score,
-                    })
+        candidates = list(self._candidates(document.doc, covered))
+        for candidate, best in zip(candidates, self.resolver.matches(candidates)):
+            if best:
+                self._add_match(matches, seen, self.skill_lookup[best[0]], candidate, best[1])
 
         return sorted(matches, key=lambda x: x["score"], reverse=True)
+
+    def extract_many(self, job_texts: Iterable[str], batch_size: int = 64, n_process: int = 1) -> Iterator[List[Dict]]:
+        for document in ParsedDocument.pipe(job_texts, self.nlp, batch_size=batch_size, n_process=n_process):
+            yield self.extract(document)
     
 if __name__ == "__main__":
     from pathlib import Path
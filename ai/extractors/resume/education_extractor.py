@@ -1,64 +1,60 @@
 import json
 import re
-from typing import List, Dict, Optional
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Dict, Optional, Union
 from pathlib import Path
-import spacy
+from spacy.tokens import Span
+from ai.document import Line, ParsedDocument
+from ai.nlp import get_nlp
+from ai.taxonomy import registry
 
 class ResumeEducationExtractor:
-    def __init__(self, education_file: str = "data/education.json"):
-        self.education_data = self._load_education_data(education_file)
-        self.degree_lookup = self._build_degree_lookup()
-        self.nlp = spacy.load("en_core_web_sm")
-
-    def _load_education_data(self, path: str) -> List[Dict]:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def _build_degree_lookup(self) -> Dict[str, str]:
-        lookup = {}
-        for item in self.education_data:
-            normalized = item["degree"].strip().lower()
-            aliases = item.get("aliases", [])
-            for alias in [normalized] + aliases:
-                lookup[alias.strip().lower()] = item["degree"]
-        return lookup
-
-    def _extract_education_section(self, text: str) -> List[str]:
-        lines = text.splitlines()
-        edu_lines = []
-        capture = False
-        for line in lines:
-            line_lower = line.lower()
-            if "education" in line_lower:
-                capture = True
-                continue
-            if capture:
-                if any(kw in line_lower for kw in ["experience", "certification", "project", "skills", "summary"]):
-                    break
-                if line.strip():
-                    edu_lines.append(line.strip())
-        return edu_lines
-
-    def extract(self, resume_text: str) -> List[Dict]:
-        edu_lines = self._extract_education_section(resume_text)
+    def __init__(self, education_file: str = "data/degrees.json"):
+        self.education_file = education_file
+        self.degree_lookup = registry.degree_lookup(education_file)
+        self.scanner = registry.degree_scanner(education_file)
+        self.major_scanner = registry.major_scanner(education_file)
+        self.nlp = get_nlp()
+
+    def _extract_education_section(self, document: ParsedDocument) -> List[Line]:
+        return [line for line in document.section("education") if line.text.strip()]
+
+    def _scan_degrees(self, document: ParsedDocument, lines: List[Line]) -> Dict[int, str]:
+        # One scan over the whole section, returning the first degree mentioned on each line
+        if not lines:
+            return {}
+        start, end = lines[0].start, lines[-1].end
+        starts = [line.start for line in lines]
+        found = {}
+        for hit in self.scanner.scan(document.text[start:end]):
+            index = bisect_right(starts, start + hit.start) - 1
+            found.setdefault(index, self.degree_lookup[hit.phrase])
+        return found
+
+    def extract(self, resume_text: Union[str, ParsedDocument]) -> List[Dict]:
+        document = ParsedDocument.of(resume_text, self.nlp)
+        edu_lines = self._extract_education_section(document)
+        line_degrees = self._scan_degrees(document, edu_lines)
         entries = []
         buffer = []
+        degree = None
 
         # Split into blocks per degree entry
-        for line in edu_lines:
-            if any(deg in line.lower() for deg in self.degree_lookup):
+        for i, line in enumerate(edu_lines):
+            if i in line_degrees:
                 if buffer:
-                    entries.append("\n".join(buffer))
+                    entries.append((document.block(buffer), degree))
                     buffer = []
+                degree = line_degrees[i]
             buffer.append(line)
         if buffer:
-            entries.append("\n".join(buffer))
+            entries.append((document.block(buffer), degree))
 
         # Now parse each block
         results = []
-        for block in entries:
-            degree = self._extract_degree(block)
-            institution = self._extract_institution(block)
+        for entry, degree in entries:
+            block = entry.text
+            institution = self._extract_institution(entry.span)
             major = self._extract_major(block)
             years = self._extract_years(block)
             gpa = self._extract_gpa(block)
@@ -78,22 +74,26 @@ class ResumeEducationExtractor:
 
         return results
 
+    def extract_many(self, resume_texts: Iterable[str], batch_size: int = 64, n_process: int = 1) -> Iterator[List[Dict]]:
+        for document in ParsedDocument.pipe(resume_texts, self.nlp, batch_size=batch_size, n_process=n_process):
+            yield self.extract(document)
+
     def _extract_degree(self, text: str) -> Optional[str]:
-        text = text.lower()
-        for alias, degree_name in self.degree_lookup.items():
-            if alias in text:
-                return degree_name
-        return None
+        hits = self.scanner.scan(text)
+        return self.degree_lookup[hits[0].phrase] if hits else None
 
     def _extract_major(self, text: str) -> Optional[str]:
         match = re.search(r"(major(ed)? in|degree in)\s+([\w\s&]+)", text.lower())
         if match:
             return match.group(3).strip().title()
-        return None
-
-    def _extract_institution(self, text: str) -> Optional[str]:
-        doc = self.nlp(text)
-        for ent in doc.ents:
+        # Fall back to the first known major mentioned in the block
+        hits = self.major_scanner.scan(text)
+        return hits[0].phrase if hits else None
+
+    def _extract_institution(self, span: Optional[Span]) -> Optional[str]:
+        if span is None:
+            return None
+        for ent in span.ents:
             if ent.label_ in ["ORG", "GPE"] and any(w in ent.text.lower() for w in ["university", "college", "institute"]):
                 return ent.text.strip()
         return None
@@ -132,7 +132,7 @@ def main():
     print("--------------------------------")
 
     # Initialize extractor
-    extractor = ResumeEducationExtractor(education_file="data/education.json")
+    extractor = ResumeEducationExtractor(education_file="data/degrees.json")
 
     # Extract education data
     education_entries = extractor.extract(resume_text)
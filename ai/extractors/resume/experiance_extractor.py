@@ -1,67 +1,40 @@
-import re
 import json
-import spacy
-from typing import List, Dict, Optional, Set, Tuple
-from rapidfuzz import process, fuzz
+from typing import Iterable, Iterator, List, Dict, Optional, Set, Tuple, Union
+from rapidfuzz import fuzz
 from pathlib import Path
 from datetime import datetime
+from spacy.tokens import Span
+from ai.document import Line, ParsedDocument, TextBlock
+from ai.experience_patterns import (
+    ACHIEVEMENT_PATTERNS, BLOCK_TITLE_PATTERN, DATE_PATTERN, DATE_PATTERNS, RESUME_SKILL_PATTERNS,
+)
+from ai.fuzzy import FuzzyResolver
+from ai.nlp import get_nlp
+from ai.taxonomy import registry
 
 class ResumeExperienceExtractor:
     def __init__(self, experience_file: str = "data/experience.json"):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.experience_db = self._load_experience_data(experience_file)
-        self.title_lookup = self._build_title_lookup()
-        
-        # Enhanced patterns for better extraction
-        self.date_patterns = [
-            r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(?:19|20)\d{2}",
-            r"(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+(?:19|20)\d{2}",
-            r"\d{1,2}/\d{1,2}/(?:19|20)\d{2}",
-            r"\d{1,2}-\d{1,2}-(?:19|20)\d{2}"
-        ]
-        
-        self.skill_patterns = [
-            r"(?:proficient|expert|skilled|experienced)\s+(?:in|with|at)\s+([a-zA-Z\s,&/\\-]+)",
-            r"(?:strong|solid|excellent|good|deep)\s+(?:knowledge|understanding|experience|proficiency)\s+(?:in|with|of)\s+([a-zA-Z\s,&/\\-]+)",
-            r"(?:familiarity|familiar)\s+(?:with|in)\s+([a-zA-Z\s,&/\\-]+)",
-            r"(?:developed|created|implemented|built|designed)\s+(?:using|with)\s+([a-zA-Z\s,&/\\-]+)",
-            r"(?:utilized|used|worked with)\s+([a-zA-Z\s,&/\\-]+)"
-        ]
+        self.experience_file = experience_file
+        self.nlp = get_nlp(disable=["ner"])
+        self.title_lookup = registry.title_lookup(experience_file, variants=True)
+        self.title_resolver = FuzzyResolver(self.title_lookup, [
+            (fuzz.token_sort_ratio, 85),
+            (fuzz.token_set_ratio, 90),
+            (fuzz.partial_ratio, 95)
+        ])
         
-        self.achievement_patterns = [
-            r"(?:increased|improved|enhanced|optimized|reduced|decreased)\s+[^.]*?by\s+\d+%",
-            r"(?:led|managed|supervised|coordinated)\s+[^.]*?team",
-            r"(?:developed|created|implemented|built|designed)\s+[^.]*?solution",
-            r"(?:achieved|attained|reached)\s+[^.]*?goal",
-            r"(?:saved|reduced|decreased)\s+[^.]*?cost"
-        ]
-
-    def _load_experience_data(self, path: str) -> List[Dict]:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def _build_title_lookup(self) -> Dict[str, Dict]:
-        lookup = {}
-        for item in self.experience_db:
-            key = item["title"].strip().lower()
-            lookup[key] = item
-            # Add common variations
-            if "senior" in key:
-                lookup[key.replace("senior", "sr")] = item
-            if "junior" in key:
-                lookup[key.replace("junior", "jr")] = item
-            if "lead" in key:
-                lookup[key.replace("lead", "principal")] = item
-        return lookup
+        # Enhanced patterns for better extraction, compiled once per process
+        self.date_patterns = DATE_PATTERNS
+        self.skill_patterns = RESUME_SKILL_PATTERNS
+        self.achievement_patterns = ACHIEVEMENT_PATTERNS
 
-    def _extract_skills(self, text: str) -> List[str]:
+    def _extract_skills(self, text: str, span: Optional[Span] = None) -> List[str]:
         skills = set()
-        doc = self.nlp(text)
+        doc = span if span is not None else self.nlp(text)
         
         # Extract skills using patterns
         for pattern in self.skill_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+            for match in pattern.finditer(text):
                 skill = match.group(1).strip().lower()
                 if skill and len(skill.split()) <= 5:  # Avoid long phrases
                     skills.add(skill)
@@ -87,8 +60,7 @@ class ResumeExperienceExtractor:
     def _extract_achievements(self, text: str) -> List[str]:
         achievements = []
         for pattern in self.achievement_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+            for match in pattern.finditer(text):
                 achievement = match.group(0).strip()
                 if achievement and len(achievement.split()) <= 20:  # Avoid too long achievements
                     achievements.append(achievement)
@@ -97,8 +69,7 @@ class ResumeExperienceExtractor:
     def _extract_dates(self, text: str) -> Tuple[Optional[datetime], Optional[datetime]]:
         dates = []
         for pattern in self.date_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+            for match in pattern.finditer(text):
                 try:
                     date_str = match.group(0)
                     # Try different date formats
@@ -118,38 +89,50 @@ class ResumeExperienceExtractor:
         dates.sort()
         return dates[0], dates[-1]
 
-    def extract(self, resume_text: str) -> List[Dict]:
-        experience_section = self._extract_experience_section(resume_text)
-        entries = self._split_into_experience_blocks(experience_section)
+    def extract(self, resume_text: Union[str, ParsedDocument]) -> List[Dict]:
+        document = ParsedDocument.of(resume_text, self.nlp)
+        experience_section = self._extract_experience_section(document)
+        entries = self._split_into_experience_blocks(document, experience_section)
 
-        results = []
-        for block in entries:
+        parsed = []
+        for text_block in entries:
+            block = text_block.text
             raw_title = self._extract_title(block)
             company = self._extract_company(block)
             start_date, end_date = self._extract_dates(block)
             description = self._extract_description(block)
-            skills = self._extract_skills(block)
+            skills = self._extract_skills(block, text_block.span) if block else []
             achievements = self._extract_achievements(block)
 
             if raw_title and company:
-                norm_data = self._match_title(raw_title)
-                entry = {
-                    "job_title": raw_title,
-                    "normalized_title": norm_data["title"] if norm_data else raw_title,
-                    "company": company,
-                    "start_date": start_date.strftime("%Y-%m") if start_date else None,
-                    "end_date": end_date.strftime("%Y-%m") if end_date else None,
-                    "duration_years": self._calculate_duration(start_date, end_date),
-                    "description": description,
-                    "skills": skills,
-                    "achievements": achievements,
-                    "industry": norm_data.get("industry") if norm_data else None,
-                    "level": self._extract_level(raw_title),
-                    "sample_responsibilities": norm_data.get("responsibilities")[:2] if norm_data else []
-                }
-                results.append(entry)
+                parsed.append((raw_title, company, start_date, end_date, description, skills, achievements))
+
+        # Resolve every title of the resume in one batch
+        normalized = self._match_titles([item[0] for item in parsed])
+
+        results = []
+        for (raw_title, company, start_date, end_date, description, skills, achievements), norm_data in zip(parsed, normalized):
+            entry = {
+                "job_title": raw_title,
+                "normalized_title": norm_data["title"] if norm_data else raw_title,
+                "company": company,
+                "start_date": start_date.strftime("%Y-%m") if start_date else None,
+                "end_date": end_date.strftime("%Y-%m") if end_date else None,
+                "duration_years": self._calculate_duration(start_date, end_date),
+                "description": description,
+                "skills": skills,
+                "achievements": achievements,
+                "industry": norm_data.get("industry") if norm_data else None,
+                "level": self._extract_level(raw_title),
+                "sample_responsibilities": norm_data.get("responsibilities")[:2] if norm_data else []
+            }
+            results.append(entry)
         return results
 
+    def extract_many(self, resume_texts: Iterable[str], batch_size: int = 64, n_process: int = 1) -> Iterator[List[Dict]]:
+        for document in ParsedDocument.pipe(resume_texts, self.nlp, batch_size=batch_size, n_process=n_process):
+            yield self.extract(document)
+
     def _calculate_duration(self, start_date: Optional[datetime], end_date: Optional[datetime]) -> float:
         if not start_date:
             return 0.0
@@ -171,81 +154,31 @@ class ResumeExperienceExtractor:
             return "staff"
         return None
 
+    def _match_titles(self, titles: List[str]) -> List[Optional[Dict]]:
+        # Exact match first, then each fuzzy strategy in turn, all titles scored at once
+        matches = self.title_resolver.matches([title.lower().strip() for title in titles])
+        return [self.title_lookup[match[0]] if match else None for match in matches]
+
     def _match_title(self, title: str) -> Optional[Dict]:
-        title_clean = title.lower().strip()
-        
-        # Try exact match first
-        if title_clean in self.title_lookup:
-            return self.title_lookup[title_clean]
-            
-        # Try fuzzy matching with different strategies
-        strategies = [
-            (fuzz.token_sort_ratio, 85),
-            (fuzz.token_set_ratio, 90),
-            (fuzz.partial_ratio, 95)
-        ]
-        
-        for scorer, threshold in strategies:
-            best_match, score, _ = process.extractOne(
-                title_clean,
-                self.title_lookup.keys(),
-                scorer=scorer
-            )
-            if score >= threshold:
-                return self.title_lookup[best_match]
-                
-        return None
+        return self._match_titles([title])[0]
 
-    def _extract_experience_section(self, text: str) -> str:
-        lines = text.splitlines()
-        exp_lines = []
-        capture = False
-        
-        section_headers = [
-            "experience",
-            "work experience",
-            "professional experience",
-            "employment history",
-            "work history"
-        ]
-        
-        section_enders = [
-            "education",
-            "certifications",
-            "projects",
-            "skills",
-            "summary",
-            "objective",
-            "references"
-        ]
-        
-        for line in lines:
-            lower = line.lower()
-            if any(header in lower for header in section_headers) and len(lower) < 40:
-                capture = True
-                continue
-            if capture:
-                if any(ender in lower for ender in section_enders):
-                    break
-                exp_lines.append(line.strip())
-        return "\n".join(exp_lines)
+    def _extract_experience_section(self, document: ParsedDocument) -> List[Line]:
+        return document.section("experience")
 
-    def _split_into_experience_blocks(self, text: str) -> List[str]:
-        lines = text.splitlines()
+    def _split_into_experience_blocks(self, document: ParsedDocument, lines: List[Line]) -> List[TextBlock]:
         blocks = []
         current_block = []
 
         for line in lines:
             # Start of a new experience entry if the line looks like a job title
-            if re.match(r"(?i)^([A-Z][A-Za-z &]+)$", line.strip()) or \
-               re.match(r"(?i)^([A-Z][A-Za-z &]+(?:Engineer|Developer|Scientist|Analyst|Architect|Manager|Consultant|Specialist))$", line.strip()):
+            if BLOCK_TITLE_PATTERN.match(line.text.strip()):
                 if current_block:
-                    blocks.append("\n".join(current_block).strip())
+                    blocks.append(document.block(current_block))
                     current_block = []
-            current_block.append(line.strip())
+            current_block.append(line)
 
         if current_block:
-            blocks.append("\n".join(current_block).strip())
+            blocks.append(document.block(current_block))
 
         return blocks
 
@@ -267,8 +200,7 @@ class ResumeExperienceExtractor:
         bullets = []
         for line in lines:
             # Skip lines that look like dates or job titles
-            if not any(re.match(pattern, line, re.IGNORECASE) for pattern in self.date_patterns) and \
-               not re.match(r"(?i)^([A-Z][A-Za-z &]+)$", line.strip()):
+            if not DATE_PATTERN.match(line) and not BLOCK_TITLE_PATTERN.match(line.strip()):
                 cleaned = line.strip("-• ")
                 if cleaned:
                     bullets.append(cleaned)
@@ -0,0 +1,71 @@
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import process
+
+Strategy = Tuple[Callable, float]
+
+
+class FuzzyResolver:
+    """Resolves a batch of query strings against a fixed choice table in native code.
+
+    Queries that are exact choices are resolved by a dict lookup. The rest are scored
+    with one ``process.cdist`` call per strategy, each with its own ``score_cutoff``;
+    queries that miss a strategy's cutoff fall through to the next one, exactly like
+    calling ``process.extractOne`` with each scorer in turn.
+    """
+
+    def __init__(self, choices: Iterable[str], strategies: Sequence[Strategy], workers: int = -1):
+        self.choices = list(choices)
+        self.strategies = list(strategies)
+        self.workers = workers
+        self._index = {}
+        for i, choice in enumerate(self.choices):
+            self._index.setdefault(choice, i)
+
+    def resolve(self, queries: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (best choice index or -1, score) arrays aligned with ``queries``."""
+        best = np.full(len(queries), -1, dtype=np.int64)
+        scores = np.zeros(len(queries), dtype=np.float64)
+
+        pending = []
+        for i, query in enumerate(queries):
+            idx = self._index.get(query)
+            if idx is not None:
+                best[i] = idx
+                scores[i] = 100.0
+            else:
+                pending.append(i)
+
+        for scorer, cutoff in self.strategies:
+            if not pending or not self.choices:
+                break
+            matrix = process.cdist(
+                [queries[i] for i in pending],
+                self.choices,
+                scorer=scorer,
+                score_cutoff=cutoff,
+                dtype=np.float64,
+                workers=self.workers,
+            )
+            rows = np.arange(len(pending))
+            top = matrix.argmax(axis=1)
+            top_scores = matrix[rows, top]
+            hit = top_scores >= max(cutoff, np.finfo(np.float64).tiny)
+
+            pending_idx = np.asarray(pending)
+            best[pending_idx[hit]] = top[hit]
+            scores[pending_idx[hit]] = top_scores[hit]
+            pending = pending_idx[~hit].tolist()
+
+        return best, scores
+
+    def resolve_one(self, query: str) -> Tuple[Optional[str], float]:
+        best, scores = self.resolve([query])
+        if best[0] < 0:
+            return None, 0.0
+        return self.choices[best[0]], float(scores[0])
+
+    def matches(self, queries: Sequence[str]) -> List[Optional[Tuple[str, float]]]:
+        best, scores = self.resolve(queries)
+        return [(self.choices[b], float(s)) if b >= 0 else None for b, s in zip(best, scores)]
@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional
+
+from ai.extractors.job.education_extractor import JobEducationExtractor
+from ai.extractors.job.experiance_extractor import JobExperienceExtractor
+from ai.extractors.job.skill_extractor import JobSkillExtractor
+
+
+@dataclass
+class JobProfile:
+    """Everything the matchers need from one job posting, extracted once.
+
+    Build it with ``JobProfile.from_text`` and pass it to every matcher in place of the job
+    side data; screening N resumes then costs one job extraction plus N resume passes.
+    """
+    text: str
+    skills: List[Dict]
+    education: List[Dict]
+    titles: List[Dict]
+    experience_requirements: List[Dict]
+    # Derived once in __post_init__ so the matchers' inner loops don't recompute them
+    skills_by_name: Dict[str, Dict] = field(init=False, repr=False)
+    title_names: List[str] = field(init=False, repr=False)
+    requirement_titles: List[str] = field(init=False, repr=False)
+    requirement_skills: List[FrozenSet[str]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.skills_by_name = {s["normalized_name"]: s for s in self.skills}
+        self.title_names = [(t["normalized_title"] or t["raw_title"]).lower() for t in self.titles]
+        self.requirement_titles = [req["title"].lower() for req in self.experience_requirements]
+        self.requirement_skills = [
+            frozenset(skill.lower() for skill in req.get("skills", [])) for req in self.experience_requirements
+        ]
+
+    @classmethod
+    def from_text(cls, job_text: str,
+                  skill_extractor: Optional[JobSkillExtractor] = None,
+                  education_extractor: Optional[JobEducationExtractor] = None,
+                  experience_extractor: Optional[JobExperienceExtractor] = None) -> "JobProfile":
+        skill_extractor = skill_extractor or JobSkillExtractor()
+        education_extractor = education_extractor or JobEducationExtractor()
+        experience_extractor = experience_extractor or JobExperienceExtractor()
+
+        experience = experience_extractor.extract(job_text)
+        return cls(
+            text=job_text,
+            skills=skill_extractor.extract(job_text),
+            education=education_extractor.extract(job_text),
+            titles=experience["job_titles"],
+            experience_requirements=experience["experience_requirements"],
+        )
@@ -1,16 +1,37 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from rapidfuzz import fuzz
 from ai.extractors.resume.education_extractor import ResumeEducationExtractor
 from ai.extractors.job.education_extractor import JobEducationExtractor
+from ai.job_profile import JobProfile
+from ai.taxonomy import registry
 from pathlib import Path
 import json
 
 class EducationMatcher:
-    def __init__(self, degree_threshold: int = 90, major_threshold: int = 80):
+    def __init__(self, degree_threshold: int = 90, major_threshold: int = 80, degree_file: str = "data/degrees.json"):
         self.degree_threshold = degree_threshold
         self.major_threshold = major_threshold
+        self.degree_lookup = registry.degree_lookup(degree_file)
+        self.degrees = {d["degree"]: d for d in registry.degree_taxonomy(degree_file)["degrees"]}
 
-    def match(self, resume_edu: List[Dict], job_edu: List[Dict]) -> Dict:
+    def _canonical(self, degree: str) -> Optional[Dict]:
+        name = self.degree_lookup.get(degree.strip().lower())
+        return self.degrees.get(name) if name else None
+
+    def _degree_score(self, job_degree: str, resume_degree: str) -> float:
+        job = self._canonical(job_degree)
+        resume = self._canonical(resume_degree)
+        if job and resume:
+            if job["degree"] == resume["degree"]:
+                return 100
+            # A level-only requirement ("Master's degree") is met by any degree at that level or above
+            if job["generic"] and resume["rank"] >= job["rank"]:
+                return 100
+        return fuzz.token_sort_ratio(job_degree.lower(), resume_degree.lower())
+
+    def match(self, resume_edu: List[Dict], job_edu: Union[List[Dict], JobProfile]) -> Dict:
+        if isinstance(job_edu, JobProfile):
+            job_edu = job_edu.education
         results = []
         matched_count = 0
 
@@ -20,7 +41,7 @@ class EducationMatcher:
             reason = "no match"
 
             for res_item in resume_edu:
-                degree_score = fuzz.token_sort_ratio(job_item['degree'].lower(), res_item['degree'].lower())
+                degree_score = self._degree_score(job_item['degree'], res_item['degree'])
                 major_score = 0
 
                 if job_item.get("major") and res_item.get("major"):
@@ -77,15 +98,15 @@ if __name__ == "__main__":
     job_text = Path("inputs/jobs/job1.txt").read_text(encoding="utf-8")
 
     # Extract education data
-    resume_edu = ResumeEducationExtractor("data/education.json").extract(resume_text)
-    job_edu = JobEducationExtractor("data/education.json").extract(job_text)
+    resume_edu = ResumeEducationExtractor("data/degrees.json").extract(resume_text)
+    job = JobProfile.from_text(job_text, education_extractor=JobEducationExtractor("data/degrees.json"))
     
     print(f"\nExtracted {resume_edu} education requirement(s) from resume.")
-    print(f"\nExtracted {job_edu} education requirement(s) from job description.")
+    print(f"\nExtracted {job.education} education requirement(s) from job description.")
 
     # Match education
     matcher = EducationMatcher()
-    result = matcher.match(resume_edu, job_edu)
+    result = matcher.match(resume_edu, job)
 
     print(f"\n Education Match: {result['education_match_percentage']}%\n")
     for match in result["education_matches"]:
@@ -1,12 +1,18 @@
-import re
 import json
-from typing import List, Dict, Optional, Tuple, Set
+from typing import List, Dict, FrozenSet, Optional, Tuple, Set, Union
 from pathlib import Path
-from rapidfuzz import process, fuzz
+from rapidfuzz import fuzz
 from dataclasses import dataclass
 from datetime import datetime
 from ai.extractors.resume.experiance_extractor import ResumeExperienceExtractor
 from ai.extractors.job.experiance_extractor import JobExperienceExtractor
+from ai.experience_patterns import (
+    JOB_SKILL_PATTERNS, REQUIREMENT_KEYWORDS, RequirementScan, find_requirement_title,
+)
+from ai.fuzzy import FuzzyResolver
+from ai.job_profile import JobProfile
+from ai.resume_profile import ResumeProfile
+from ai.taxonomy import registry
 
 @dataclass
 class ExperienceMatch:
@@ -37,82 +43,48 @@ class ExperienceMatcher:
     def __init__(self, experience_file: str = "data/experience.json"):
         self.resume_extractor = ResumeExperienceExtractor(experience_file)
         self.job_extractor = JobExperienceExtractor(experience_file)
-        self.experience_db = self._load_experience_data(experience_file)
-        self.title_lookup = self._build_title_lookup()
-        self.skill_patterns = [
-            r"(?:proficiency|experience|expertise|knowledge|skills?)\s+(?:in|with|of)\s+([a-zA-Z\s,&/\\-]+)",
-            r"(?:strong|solid|excellent|good|deep)\s+(?:knowledge|understanding|experience|proficiency)\s+(?:in|with|of)\s+([a-zA-Z\s,&/\\-]+)",
-            r"(?:familiarity|familiar)\s+(?:with|in)\s+([a-zA-Z\s,&/\\-]+)",
-        ]
-        self.required_keywords = {
-            "required": ["required", "must have", "mandatory", "essential", "minimum"],
-            "preferred": ["preferred", "nice to have", "desired", "bonus", "plus"],
-            "years": ["years", "yrs", "year", "yr"],
-            "experience": ["experience", "exp", "expertise", "proficiency"]
-        }
-
-    def _load_experience_data(self, path: str) -> List[Dict]:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def _build_title_lookup(self) -> Dict[str, Dict]:
-        lookup = {}
-        for item in self.experience_db:
-            key = item["title"].lower().strip()
-            lookup[key] = item
-            for alias in item.get("aliases", []):
-                lookup[alias.lower().strip()] = item
-        return lookup
+        self.title_lookup = registry.title_lookup(experience_file)
+        self.title_resolver = FuzzyResolver(self.title_lookup, [(fuzz.token_sort_ratio, 85)])
+        self.skill_patterns = JOB_SKILL_PATTERNS
+        self.required_keywords = REQUIREMENT_KEYWORDS
 
     def _extract_skills(self, text: str) -> List[str]:
         skills = set()
         for pattern in self.skill_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+            for match in pattern.finditer(text):
                 skill = match.group(1).strip().lower()
                 if skill and len(skill.split()) <= 5:  # Avoid long phrases
                     skills.add(skill)
         return list(skills)
 
     def _extract_years(self, text: str) -> Optional[int]:
-        # Match various year formats
-        patterns = [
-            r"(\d{1,2})\+?\s*(?:years?|yrs?)",
-            r"minimum\s+of\s+(\d{1,2})\+?\s*(?:years?|yrs?)",
-            r"at least\s+(\d{1,2})\+?\s*(?:years?|yrs?)",
-            r"(\d{1,2})\+?\s*(?:years?|yrs?)\s+of\s+experience"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return int(match.group(1))
-        return None
+        return RequirementScan(text).min_years
 
     def _is_required(self, text: str) -> bool:
-        return any(kw in text.lower() for kw in self.required_keywords["required"])
+        return RequirementScan(text).has("required")
 
     def _is_preferred(self, text: str) -> bool:
-        return any(kw in text.lower() for kw in self.required_keywords["preferred"])
+        return RequirementScan(text).has("preferred")
 
-    def _calculate_confidence(self, text: str, years: Optional[int]) -> float:
+    def _calculate_confidence(self, scan: RequirementScan) -> float:
         confidence = 0.5  # Base confidence
         
         # Adjust based on presence of key indicators
-        if years is not None:
+        if scan.min_years is not None:
             confidence += 0.2
-        if any(kw in text.lower() for kw in self.required_keywords["experience"]):
+        if scan.has("experience"):
             confidence += 0.1
-        if any(kw in text.lower() for kw in self.required_keywords["years"]):
+        if scan.has("years"):
             confidence += 0.1
-        if self._is_required(text) or self._is_preferred(text):
+        if scan.has("required") or scan.has("preferred"):
             confidence += 0.1
             
         return min(confidence, 1.0)
 
     def match(self, text: str) -> Optional[ExperienceMatch]:
-        # Extract years
-        years = self._extract_years(text)
+        # Years and every requirement keyword in one pass over the sentence
+        scan = RequirementScan(text)
+        years = scan.min_years
         if not years:
             return None
 
@@ -120,29 +92,19 @@ class ExperienceMatcher:
         skills = self._extract_skills(text)
 
         # Try to match title
-        title = None
         normalized_title = None
         field = None
         level = None
 
-        # Look for title patterns in the text
-        title_patterns = [
-            r"(?:experience|expertise|proficiency)\s+(?:in|with|as)\s+([a-zA-Z\s,&/\\-]+)",
-            r"(?:role|position|job)\s+(?:of|as)\s+([a-zA-Z\s,&/\\-]+)",
-            r"([a-zA-Z\s,&/\\-]+(?:engineer|scientist|developer|analyst|architect|manager|consultant|specialist))"
-        ]
-
-        for pattern in title_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                title = match.group(1).strip()
-                # Try to normalize the title
-                matched = self._match_title(title)
-                if matched:
-                    normalized_title = matched["title"]
-                    field = matched.get("field")
-                    level = self._extract_level(title)
-                break
+        title = find_requirement_title(text)
+        if title is not None:
+            title = title.strip()
+            # Try to normalize the title
+            matched = self._match_title(title)
+            if matched:
+                normalized_title = matched["title"]
+                field = matched.get("field")
+                level = self._extract_level(title)
 
         if not title:
             return None
@@ -151,31 +113,18 @@ class ExperienceMatcher:
             title=title,
             normalized_title=normalized_title,
             years=years,
-            required=self._is_required(text),
-            preferred=self._is_preferred(text),
-            confidence=self._calculate_confidence(text, years),
+            required=scan.has("required"),
+            preferred=scan.has("preferred"),
+            confidence=self._calculate_confidence(scan),
             field=field,
             skills=skills,
             level=level
         )
 
     def _match_title(self, text: str) -> Optional[Dict]:
-        text = text.lower().strip()
-        
-        # Try exact match first
-        if text in self.title_lookup:
-            return self.title_lookup[text]
-            
-        # Try fuzzy matching
-        best_match, score, _ = process.extractOne(
-            text,
-            self.title_lookup.keys(),
-            scorer=fuzz.token_sort_ratio
-        )
-        if score >= 85:
-            return self.title_lookup[best_match]
-            
-        return None
+        # Exact match first, then fuzzy with a native score cutoff
+        best_match, _ = self.title_resolver.resolve_one(text.lower().strip())
+        return self.title_lookup[best_match] if best_match else None
 
     def _extract_level(self, title: str) -> Optional[str]:
         title_lower = title.lower()
@@ -192,8 +141,11 @@ class ExperienceMatcher:
         return None
 
     def _calculate_title_match_score(self, job_title: str, resume_title: str) -> float:
-        # Try exact match first
-        if job_title.lower() == resume_title.lower():
+        return self._title_match_score(job_title.lower(), resume_title.lower())
+
+    def _title_match_score(self, job_title: str, resume_title: str) -> float:
+        # Both titles already lower-cased; try exact match first
+        if job_title == resume_title:
             return 1.0
             
         # Try fuzzy matching with different strategies
@@ -205,7 +157,7 @@ class ExperienceMatcher:
         
         max_score = 0.0
         for scorer, weight in strategies:
-            score = scorer(job_title.lower(), resume_title.lower()) / 100.0
+            score = scorer(job_title, resume_title) / 100.0
             max_score = max(max_score, score * weight)
             
         return max_score
@@ -213,7 +165,9 @@ class ExperienceMatcher:
     def _calculate_skills_match(self, job_skills: List[str], resume_skills: List[str]) -> Tuple[List[str], List[str]]:
         job_skills_set = {skill.lower() for skill in job_skills}
         resume_skills_set = {skill.lower() for skill in resume_skills}
-        
+        return self._skills_match(job_skills_set, resume_skills_set)
+
+    def _skills_match(self, job_skills_set: FrozenSet[str], resume_skills_set: Set[str]) -> Tuple[List[str], List[str]]:
         matching_skills = list(job_skills_set.intersection(resume_skills_set))
         missing_skills = list(job_skills_set - resume_skills_set)
         
@@ -257,36 +211,42 @@ class ExperienceMatcher:
         
         return score
 
-    def match_experiences(self, job_text: str, resume_text: str) -> List[ExperienceComparison]:
-        # Extract job requirements
-        job_data = self.job_extractor.extract(job_text)
-        job_requirements = job_data["experience_requirements"]
+    def profile(self, job_text: str) -> JobProfile:
+        return JobProfile.from_text(job_text, experience_extractor=self.job_extractor)
+
+    def match_experiences(self, job: Union[str, JobProfile],
+                          resume_text: Union[str, ResumeProfile]) -> List[ExperienceComparison]:
+        # Extract job requirements, unless a prebuilt profile was passed in
+        if not isinstance(job, JobProfile):
+            job_data = self.job_extractor.extract(job)
+            job = JobProfile(text=job, skills=[], education=[], titles=job_data["job_titles"],
+                             experience_requirements=job_data["experience_requirements"])
         
-        # Extract resume experiences
-        resume_experiences = self.resume_extractor.extract(resume_text)
+        # Extract resume experiences (a profile has them already), lower-casing each side once instead of per pair
+        if isinstance(resume_text, ResumeProfile):
+            resume_experiences = resume_text.experiences
+        else:
+            resume_experiences = self.resume_extractor.extract(resume_text)
+        resume_titles = [exp["job_title"].lower() for exp in resume_experiences]
+        resume_skills = [{skill.lower() for skill in exp.get("skills", [])} for exp in resume_experiences]
         
         comparisons = []
         
-        for job_req in job_requirements:
+        for job_req, job_title, job_skills in zip(job.experience_requirements, job.requirement_titles,
+                                                  job.requirement_skills):
             best_match = None
             best_score = 0.0
             
-            for resume_exp in resume_experiences:
+            for resume_exp, resume_title, resume_skill_set in zip(resume_experiences, resume_titles, resume_skills):
                 # Calculate title match score
-                title_score = self._calculate_title_match_score(
-                    job_req["title"],
-                    resume_exp["job_title"]
-                )
+                title_score = self._title_match_score(job_title, resume_title)
                 
                 # Calculate years match using duration_years from resume experience
                 resume_years = resume_exp.get("duration_years", 0)
                 years_match = self._calculate_years_match(job_req["min_years"], resume_years)
                 
                 # Calculate skills match
-                matching_skills, missing_skills = self._calculate_skills_match(
-                    job_req.get("skills", []),
-                    resume_exp.get("skills", [])
-                )
+                matching_skills, missing_skills = self._skills_match(job_skills, resume_skill_set)
                 
                 # Calculate level match
                 level_match = self._calculate_level_match(
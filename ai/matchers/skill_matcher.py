@@ -1,27 +1,44 @@
-from typing import List, Dict
+from typing import List, Dict, Union
 from rapidfuzz import fuzz
+from ai.fuzzy import FuzzyResolver
+from ai.job_profile import JobProfile
 
 class SkillMatcher:
     def __init__(self, threshold: int = 85):
         self.threshold = threshold
 
-    def match(self, resume_skills: List[Dict], job_skills: List[Dict]) -> Dict:
+    def match(self, resume_skills: List[Dict], job_skills: Union[List[Dict], JobProfile]) -> Dict:
         matched_skills = []
         resume_set = {s["normalized_name"]: s for s in resume_skills}
-        job_set = {s["normalized_name"]: s for s in job_skills}
+        if isinstance(job_skills, JobProfile):
+            job_set = job_skills.skills_by_name
+            job_skills = job_skills.skills
+        else:
+            job_set = {s["normalized_name"]: s for s in job_skills}
 
         matched_count = 0
 
+        # Both sides come from the same taxonomy, so most skills join on id in O(J + R)
+        resume_by_id = {s["id"]: s for s in resume_set.values() if s.get("id")}
+        best = {}
+        unresolved = []
         for job_skill_name, job_skill in job_set.items():
-            best_match = None
-            best_score = 0
-            reason = "not found"
+            resume_skill = resume_by_id.get(job_skill.get("id"))
+            if resume_skill is not None:
+                best[job_skill_name] = (resume_skill, 100.0)
+            else:
+                unresolved.append(job_skill_name)
+
+        # Only what didn't join is fuzzy-scored, as one matrix against every resume skill
+        if unresolved and resume_set:
+            resolver = FuzzyResolver(resume_set, [(fuzz.token_sort_ratio, self.threshold)])
+            for job_skill_name, found in zip(unresolved, resolver.matches(unresolved)):
+                if found:
+                    best[job_skill_name] = (resume_set[found[0]], found[1])
 
-            for resume_skill_name, resume_skill in resume_set.items():
-                score = fuzz.token_sort_ratio(job_skill_name, resume_skill_name)
-                if score > best_score:
-                    best_score = score
-                    best_match = resume_skill
+        for job_skill_name, job_skill in job_set.items():
+            best_match, best_score = best.get(job_skill_name, (None, 0))
+            reason = "not found"
 
             if best_score >= self.threshold:
                 matched_count += 1
@@ -62,13 +79,13 @@ if __name__ == "__main__":
     print("--------------------------------")
     print(job_text)
 
-    # Extract skills
+    # Extract skills; the job side is extracted once into a profile
     resume_skills = ResumeSkillExtractor("data/skills.json").extract(resume_text)
-    job_skills = JobSkillExtractor("data/skills.json").extract(job_text)
+    job = JobProfile.from_text(job_text, skill_extractor=JobSkillExtractor("data/skills.json"))
 
     # Match skills
     matcher = SkillMatcher()
-    result = matcher.match(resume_skills, job_skills)
+    result = matcher.match(resume_skills, job)
 
     print(f"\nOverall Match: {result['match_percentage']}%\n")
     for match in result["matched_skills"]:
@@ -0,0 +1,66 @@
+import threading
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc
+
+from settings import SPACY_MODEL
+
+
+class NLPPool:
+    """Loads each spaCy model once per process, on first use, and shares it between extractors."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, Language] = {}
+
+    def model(self, name: str = SPACY_MODEL) -> Language:
+        nlp = self._models.get(name)
+        if nlp is None:
+            with self._lock:
+                nlp = self._models.get(name)
+                if nlp is None:
+                    nlp = spacy.load(name)
+                    self._models[name] = nlp
+        return nlp
+
+    def is_loaded(self, name: str = SPACY_MODEL) -> bool:
+        return name in self._models
+
+    def view(self, disable: Iterable[str] = (), name: str = SPACY_MODEL) -> "NLPView":
+        return NLPView(self, name, tuple(disable))
+
+
+class NLPView:
+    """Callable stand-in for a spaCy ``Language`` with some components switched off per call.
+
+    The shared pipeline is never mutated, so views with different components disabled can be
+    used concurrently. Nothing is loaded until the view is first called.
+    """
+
+    def __init__(self, pool: NLPPool, name: str, disable: Tuple[str, ...] = ()):
+        self.pool = pool
+        self.name = name
+        self.disable = disable
+
+    @property
+    def model(self) -> Language:
+        return self.pool.model(self.name)
+
+    def _disabled(self) -> list:
+        model = self.model
+        return [pipe for pipe in self.disable if pipe in model.pipe_names]
+
+    def __call__(self, text: str) -> Doc:
+        return self.model(text, disable=self._disabled())
+
+    def pipe(self, texts: Iterable[str], batch_size: int = 64, n_process: int = 1) -> Iterator[Doc]:
+        return self.model.pipe(texts, batch_size=batch_size, n_process=n_process, disable=self._disabled())
+
+
+pool = NLPPool()
+
+
+def get_nlp(disable: Iterable[str] = (), name: Optional[str] = None) -> NLPView:
+    return pool.view(disable=disable, name=name or SPACY_MODEL)
@@ -0,0 +1,104 @@
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+
+class PhraseHit(NamedTuple):
+    start: int
+    end: int
+    phrase: str
+
+
+class PhraseScanner:
+    """Aho-Corasick automaton over a fixed phrase list.
+
+    ``scan`` walks the text once, case-insensitively, treating any whitespace run as a single
+    space, and returns leftmost-longest, non-overlapping hits that sit on word boundaries,
+    with character offsets into the original text.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, int]]] = [[]]
+        self.max_words = 0
+
+        for phrase in phrases:
+            normalized = " ".join(phrase.lower().split())
+            if normalized:
+                self._add(normalized, phrase)
+                self.max_words = max(self.max_words, len(normalized.split(" ")))
+        self._link()
+
+    def _add(self, normalized: str, phrase: str) -> None:
+        state = 0
+        for ch in normalized:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if (phrase, len(normalized)) not in self._out[state]:
+            self._out[state].append((phrase, len(normalized)))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + [p for p in self._out[self._fail[nxt]] if p not in self._out[nxt]]
+
+    def scan(self, text: str) -> List[PhraseHit]:
+        lower = text.lower()
+        if len(lower) != len(text):
+            lower = "".join(ch.lower()[0] for ch in text)
+
+        goto, fail, out = self._goto, self._fail, self._out
+        positions: List[int] = []  # original offset of every character fed to the automaton
+        candidates = []
+        state = 0
+        prev_space = True
+        for i, ch in enumerate(lower):
+            if ch.isspace():
+                if prev_space:
+                    continue
+                ch = " "
+                prev_space = True
+            else:
+                prev_space = False
+            positions.append(i)
+
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for phrase, length in out[state]:
+                    start = positions[len(positions) - length]
+                    if self._on_boundary(text, start, end):
+                        candidates.append((start, end, phrase))
+
+        # Leftmost-longest, non-overlapping
+        candidates.sort(key=lambda hit: (hit[0], -hit[1]))
+        hits = []
+        last_end = -1
+        for start, end, phrase in candidates:
+            if start >= last_end:
+                hits.append(PhraseHit(start, end, phrase))
+                last_end = end
+        return hits
+
+    @staticmethod
+    def _on_boundary(text: str, start: int, end: int) -> bool:
+        if start > 0 and (text[start - 1].isalnum() or text[start - 1] == "_"):
+            return False
+        if end < len(text) and (text[end].isalnum() or text[end] == "_"):
+            return False
+        return True
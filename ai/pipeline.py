@@ -0,0 +1,110 @@
+import hashlib
+from collections import OrderedDict
+from multiprocessing.synchronize import Barrier
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ai.document import ParsedDocument
+from ai.extractors.resume.education_extractor import ResumeEducationExtractor
+from ai.extractors.resume.experiance_extractor import ResumeExperienceExtractor
+from ai.extractors.resume.skill_extractor import ResumeSkillExtractor
+from ai.job_profile import JobProfile
+from ai.nlp import get_nlp
+from ai.resume_profile import ResumeProfile
+from scoring.scorer import CandidateScorer
+
+# Worker-side entry points shared by the batch CLI and the HTTP service. Everything here
+# runs inside pool processes; state is built once per process by init_worker.
+
+MAX_JOB_SCORERS = 64
+# Seconds a warming worker waits for the rest of the pool before startup fails
+WARM_UP_TIMEOUT = 300
+
+_worker: Dict = {}
+
+
+def init_worker(profiles: Optional[List[Tuple[str, JobProfile]]] = None, ready: Optional[Barrier] = None) -> None:
+    # Taxonomy lookups come from the on-disk artifacts and the model loads here, once per
+    # process, instead of on the first task each worker happens to pick up
+    _worker["skills"] = ResumeSkillExtractor()
+    _worker["education"] = ResumeEducationExtractor()
+    _worker["experience"] = ResumeExperienceExtractor()
+    _worker["scorers"] = [(name, CandidateScorer(profile)) for name, profile in profiles or []]
+    _worker["job_scorers"] = OrderedDict()
+    # One full pass over a resume, so spaCy and every extractor have run before real traffic
+    analyze_document(ParsedDocument("Skills\nPython\n\nExperience\nSoftware Engineer, 2019 - 2021"))
+    if ready is not None:
+        # Hold this worker's first task until every worker of the pool has warmed up
+        ready.wait(WARM_UP_TIMEOUT)
+
+
+def ping() -> bool:
+    # Forces the pool to start a process per outstanding call; init_worker did the warming
+    return bool(_worker)
+
+
+def resume_profile(document: ParsedDocument) -> ResumeProfile:
+    # Built on the worker's own extractors; every job scorer reads the same extractions
+    return ResumeProfile(document, _worker["skills"], _worker["education"], _worker["experience"])
+
+
+def analyze_document(document: ParsedDocument) -> Dict:
+    profile = resume_profile(document)
+    return {
+        "skills": profile.skills,
+        "education": profile.education,
+        "experience": profile.experiences,
+    }
+
+
+def analyze_texts(texts: List[str]) -> List[Dict]:
+    # One nlp.pipe call for the whole batch; every extractor shares each resume's parse
+    return [analyze_document(document) for document in ParsedDocument.pipe(texts, batch_size=max(len(texts), 1))]
+
+
+def job_scorer(job_text: str) -> CandidateScorer:
+    """Scorer for a job posting, extracted once per worker and kept in a small LRU."""
+    key = hashlib.sha256(job_text.encode("utf-8", "surrogatepass")).hexdigest()
+    scorers = _worker["job_scorers"]
+    if key in scorers:
+        scorers.move_to_end(key)
+        return scorers[key]
+    scorer = CandidateScorer(job_text)
+    scorers[key] = scorer
+    if len(scorers) > MAX_JOB_SCORERS:
+        scorers.popitem(last=False)
+    return scorer
+
+
+def match_pairs(pairs: List[Tuple[str, str]]) -> List[Dict]:
+    """Score (job text, resume text) pairs, parsing every resume of the batch in one nlp.pipe call.
+
+    A resume that appears in several pairs is parsed and extracted once, and that one
+    ResumeProfile is scored against each of its jobs.
+    """
+    texts = list(dict.fromkeys(resume for _, resume in pairs))
+    documents = ParsedDocument.pipe(texts, batch_size=max(len(texts), 1))
+    profiles = {text: resume_profile(document) for text, document in zip(texts, documents)}
+    results = []
+    for job_text, resume in pairs:
+        score, components = job_scorer(job_text).score(profiles[resume])
+        results.append({"score": score, "components": components})
+    return results
+
+
+def score_documents(documents: Iterable[Tuple[str, ParsedDocument]],
+                    floors: Optional[Dict[str, Optional[float]]] = None) -> List[Dict]:
+    """Score each named document against every job profile given to init_worker.
+
+    Each resume is extracted once, lazily, and that extraction is shared by every job.
+    ``floors`` maps a job to the score a resume must beat to enter its top-k; a resume
+    that can't is pruned early and left out of the results for that job.
+    """
+    floors = floors or {}
+    results = []
+    for name, document in documents:
+        profile = resume_profile(document)
+        for job, scorer in _worker["scorers"]:
+            scored = scorer.score(profile, floors.get(job))
+            if scored is not None:
+                results.append({"job": job, "resume": name, "score": scored[0], "components": scored[1]})
+    return results
@@ -0,0 +1,45 @@
+from typing import Dict, List, Optional, Union
+
+from ai.document import ParsedDocument
+from ai.extractors.resume.education_extractor import ResumeEducationExtractor
+from ai.extractors.resume.experiance_extractor import ResumeExperienceExtractor
+from ai.extractors.resume.skill_extractor import ResumeSkillExtractor
+
+
+class ResumeProfile:
+    """Everything the matchers need from one resume, each part extracted on first use and kept.
+
+    The resume-side counterpart of JobProfile: score one ResumeProfile against every job
+    and each resume extractor runs once instead of once per job. Parts are lazy, so a
+    stage that top-k pruning skips for every job is never extracted at all.
+    """
+
+    def __init__(self, document: Union[str, ParsedDocument],
+                 skill_extractor: Optional[ResumeSkillExtractor] = None,
+                 education_extractor: Optional[ResumeEducationExtractor] = None,
+                 experience_extractor: Optional[ResumeExperienceExtractor] = None):
+        self.document = ParsedDocument.of(document)
+        self.skill_extractor = skill_extractor or ResumeSkillExtractor()
+        self.education_extractor = education_extractor or ResumeEducationExtractor()
+        self.experience_extractor = experience_extractor or ResumeExperienceExtractor()
+        self._skills: Optional[List[Dict]] = None
+        self._education: Optional[List[Dict]] = None
+        self._experiences: Optional[List[Dict]] = None
+
+    @property
+    def skills(self) -> List[Dict]:
+        if self._skills is None:
+            self._skills = self.skill_extractor.extract(self.document)
+        return self._skills
+
+    @property
+    def education(self) -> List[Dict]:
+        if self._education is None:
+            self._education = self.education_extractor.extract(self.document)
+        return self._education
+
+    @property
+    def experiences(self) -> List[Dict]:
+        if self._experiences is None:
+            self._experiences = self.experience_extractor.extract(self.document)
+        return self._experiences
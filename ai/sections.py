@@ -0,0 +1,96 @@
+import re
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+if TYPE_CHECKING:
+    from ai.document import Line
+
+# Header phrases per section; a line is a header when it is one of these and nothing else
+SECTION_HEADERS = {
+    "summary": ["summary", "professional summary", "career summary", "profile", "professional profile", "about me"],
+    "objective": ["objective", "career objective"],
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history",
+    ],
+    "education": [
+        "education", "education and training", "education & training",
+        "academic background", "academic qualifications",
+    ],
+    "skills": ["skills", "technical skills", "core skills", "key skills", "core competencies"],
+    "certifications": [
+        "certifications", "certification", "certificates", "licenses and certifications",
+        "licenses & certifications", "certifications and licenses", "certifications & licenses",
+    ],
+    "projects": ["projects", "project", "personal projects", "selected projects", "academic projects"],
+    "languages": ["languages", "language skills", "spoken languages"],
+    "references": ["references"],
+}
+
+MAX_HEADER_LENGTH = 40
+
+
+def _alternation(phrases: List[str]) -> str:
+    # Longest first, with any whitespace run allowed between words
+    ordered = sorted(phrases, key=len, reverse=True)
+    return "|".join(r"\s+".join(re.escape(word) for word in phrase.split()) for phrase in ordered)
+
+
+# A header phrase may carry a bracketed note after it: "CERTIFICATIONS (optional)", "Projects [selected]"
+_QUALIFIER = r"(?:\s*\([^()]*\)|\s*\[[^\[\]]*\])?"
+
+_HEADER = re.compile(
+    r"^[\s#*=\-•]*(?:"
+    + "|".join(f"(?P<{name}>{_alternation(phrases)})" for name, phrases in SECTION_HEADERS.items())
+    + r")" + _QUALIFIER + r"[\s:\-]*$",
+    re.IGNORECASE,
+)
+
+
+class Section(NamedTuple):
+    name: str
+    start: int       # first character after the header line
+    end: int         # start of the next header line, or the end of the text
+    first_line: int  # index of the first line after the header
+    last_line: int   # index one past the last line of the section
+
+
+class SectionIndex:
+    """Character and line offsets of every known section, found in one pass over the lines.
+
+    A header is a short line made of a single header phrase (optionally decorated with
+    bullets, a bracketed note or a trailing colon); each section runs until the next
+    header of any kind.
+    """
+
+    def __init__(self, lines: Sequence["Line"], text_length: Optional[int] = None):
+        self.sections: List[Section] = []
+        self._first: Dict[str, Section] = {}
+
+        end_of_text = text_length if text_length is not None else (lines[-1].end if lines else 0)
+        current = None  # (name, start, first_line)
+        for i, line in enumerate(lines):
+            if len(line.text) >= MAX_HEADER_LENGTH:
+                continue
+            match = _HEADER.match(line.text)
+            if not match:
+                continue
+            if current:
+                self._close(current, line.start, i)
+            current = (match.lastgroup, line.end, i + 1)
+        if current:
+            self._close(current, end_of_text, len(lines))
+
+    def _close(self, current, end: int, last_line: int) -> None:
+        name, start, first_line = current
+        section = Section(name, start, max(start, end), first_line, last_line)
+        self.sections.append(section)
+        self._first.setdefault(name, section)
+
+    def get(self, name: str) -> Optional[Section]:
+        return self._first.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._first
+
+    def __iter__(self) -> Iterator[Section]:
+        return iter(self.sections)
@@ -0,0 +1,338 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ai.phrase_scanner import PhraseScanner
+from settings import CACHE_DIR
+
+# Bump whenever a builder changes shape so stale on-disk artifacts are rebuilt
+FORMAT_VERSION = 3
+
+
+def build_skill_lookup(skills: List[Dict]) -> Dict[str, Dict]:
+    lookup = {}
+    for skill in skills:
+        keys = set([skill["name"], skill["normalized_name"]] + skill.get("aliases", []))
+        for k in keys:
+            lookup[k.strip().lower()] = skill
+    return lookup
+
+
+DEGREE_LEVELS = {"associate": 1, "bachelor": 2, "master": 3, "phd": 4}
+
+# Abbreviations that are unambiguous enough to scan for, keyed by canonical degree
+DEGREE_ABBREVIATIONS = {
+    "Associate of Arts": ["a.a."],
+    "Associate of Science": ["a.s."],
+    "Bachelor of Arts": ["b.a.", "b.a"],
+    "Bachelor of Science": ["b.s.", "b.s", "b.sc.", "b.sc", "bsc"],
+    "Bachelor of Engineering": ["b.eng.", "b.eng", "beng"],
+    "Master of Arts": ["m.a.", "m.a"],
+    "Master of Science": ["m.s.", "m.s", "m.sc.", "m.sc", "msc"],
+    "Master of Business Administration": ["mba", "m.b.a."],
+    "Doctor of Philosophy": ["phd", "ph.d.", "ph.d", "doctorate", "doctoral degree"],
+}
+
+# Level-only mentions ("Master's degree") that job posts use instead of a specific degree
+GENERIC_DEGREES = {
+    "associate": ("Associate Degree", ["associate degree", "associate's degree", "associates degree"]),
+    "bachelor": ("Bachelor's Degree", ["bachelor's degree", "bachelors degree", "bachelor degree", "undergraduate degree"]),
+    "master": ("Master's Degree", ["master's degree", "masters degree", "master degree", "graduate degree"]),
+}
+
+
+def infer_degree_level(degree: str) -> str:
+    degree = degree.lower()
+    if "phd" in degree or "doctor" in degree:
+        return "phd"
+    elif "master" in degree or "mba" in degree:
+        return "master"
+    elif "bachelor" in degree:
+        return "bachelor"
+    elif "associate" in degree:
+        return "associate"
+    return "unspecified"
+
+
+def _with_apostrophes(aliases: List[str]) -> List[str]:
+    # Job posts are pasted from word processors, so accept typographic apostrophes too
+    variants = []
+    for alias in aliases:
+        for variant in (alias, alias.replace("'", "’")):
+            if variant not in variants:
+                variants.append(variant)
+    return variants
+
+
+def compile_degree_taxonomy(education: List[Dict]) -> Dict:
+    """Reduce the person-level education records to one entry per canonical degree."""
+    majors_by_degree: Dict[str, set] = {}
+    aliases_by_degree: Dict[str, set] = {}
+    for item in education:
+        degree = item["degree"].strip()
+        majors_by_degree.setdefault(degree, set())
+        aliases_by_degree.setdefault(degree, set()).update(a.strip().lower() for a in item.get("aliases", []))
+        if item.get("major"):
+            majors_by_degree[degree].add(item["major"].strip())
+
+    degrees = []
+    for degree in majors_by_degree:
+        level = infer_degree_level(degree)
+        aliases = [degree.lower()] + sorted(aliases_by_degree[degree]) + DEGREE_ABBREVIATIONS.get(degree, [])
+        degrees.append({
+            "degree": degree,
+            "level": level,
+            "rank": DEGREE_LEVELS.get(level, 0),
+            "generic": False,
+            "aliases": _with_apostrophes(list(dict.fromkeys(aliases))),
+            "majors": sorted(majors_by_degree[degree]),
+        })
+    for level, (degree, aliases) in GENERIC_DEGREES.items():
+        degrees.append({
+            "degree": degree,
+            "level": level,
+            "rank": DEGREE_LEVELS[level],
+            "generic": True,
+            "aliases": _with_apostrophes(aliases),
+            "majors": [],
+        })
+    degrees.sort(key=lambda d: (d["rank"], d["generic"], d["degree"]))
+
+    return {
+        "levels": DEGREE_LEVELS,
+        "degrees": degrees,
+        "majors": sorted(set().union(*majors_by_degree.values())) if majors_by_degree else [],
+    }
+
+
+def build_degree_taxonomy(records: Any) -> Dict:
+    # Accepts either the prebuilt data/degrees.json or raw person-level education records
+    if isinstance(records, dict) and "degrees" in records:
+        return records
+    return compile_degree_taxonomy(records)
+
+
+def build_degree_lookup(records: Any) -> Dict[str, str]:
+    lookup = {}
+    for item in build_degree_taxonomy(records)["degrees"]:
+        for alias in [item["degree"]] + item.get("aliases", []):
+            lookup[alias.strip().lower()] = item["degree"]
+    return lookup
+
+
+def build_major_scanner(records: Any) -> PhraseScanner:
+    return PhraseScanner(build_degree_taxonomy(records)["majors"])
+
+
+def build_title_lookup(experience: List[Dict]) -> Dict[str, Dict]:
+    lookup = {}
+    for item in experience:
+        key = item["title"].lower().strip()
+        lookup[key] = item
+        for alias in item.get("aliases", []):
+            lookup[alias.lower().strip()] = item
+    return lookup
+
+
+def build_title_variant_lookup(experience: List[Dict]) -> Dict[str, Dict]:
+    lookup = {}
+    for item in experience:
+        key = item["title"].lower().strip()
+        lookup[key] = item
+        for alias in item.get("aliases", []):
+            lookup[alias.lower().strip()] = item
+        # Add common variations
+        if "senior" in key:
+            lookup[key.replace("senior", "sr")] = item
+        if "junior" in key:
+            lookup[key.replace("junior", "jr")] = item
+        if "lead" in key:
+            lookup[key.replace("lead", "principal")] = item
+    return lookup
+
+
+def build_skill_scanner(skills: List[Dict]) -> PhraseScanner:
+    return PhraseScanner(build_skill_lookup(skills))
+
+
+def build_degree_scanner(records: Any) -> PhraseScanner:
+    return PhraseScanner(build_degree_lookup(records))
+
+
+BUILDERS: Dict[str, Callable[[List[Dict]], Any]] = {
+    "skill_lookup": build_skill_lookup,
+    "skill_scanner": build_skill_scanner,
+    "degree_taxonomy": build_degree_taxonomy,
+    "degree_lookup": build_degree_lookup,
+    "degree_scanner": build_degree_scanner,
+    "major_scanner": build_major_scanner,
+    "title_lookup": build_title_lookup,
+    "title_variant_lookup": build_title_variant_lookup,
+}
+
+
+class TaxonomyRegistry:
+    """Process-wide cache of the data/*.json taxonomies and the lookups derived from them.
+
+    Each file is parsed at most once per process and every derived lookup is built once,
+    then pickled under ``cache_dir`` keyed by the file's mtime/size and content hash so
+    later processes can skip both the JSON parse and the build.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = CACHE_DIR / "taxonomy"):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._lock = threading.RLock()
+        self._records: Dict[str, Tuple[Tuple[int, int], List[Dict]]] = {}
+        self._derived: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+        self._fingerprints: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+    def _key(self, path: str) -> str:
+        return str(Path(path).resolve())
+
+    def _stamp(self, path: str) -> Tuple[int, int]:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def records(self, path: str) -> List[Dict]:
+        key = self._key(path)
+        with self._lock:
+            stamp = self._stamp(key)
+            cached = self._records.get(key)
+            if cached and cached[0] == stamp:
+                return cached[1]
+            with open(key, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            self._records[key] = (stamp, records)
+            return records
+
+    def fingerprint(self, path: str) -> str:
+        key = self._key(path)
+        with self._lock:
+            stamp = self._stamp(key)
+            cached = self._fingerprints.get(key)
+            if cached and cached[0] == stamp:
+                return cached[1]
+            digest = hashlib.sha256()
+            with open(key, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            sha = digest.hexdigest()
+            self._fingerprints[key] = (stamp, sha)
+            return sha
+
+    def derived(self, path: str, name: str) -> Any:
+        key = self._key(path)
+        with self._lock:
+            stamp = self._stamp(key)
+            cached = self._derived.get((key, name))
+            if cached and cached[0] == stamp:
+                return cached[1]
+
+            value = self._read_artifact(key, name, stamp)
+            if value is None:
+                value = BUILDERS[name](self.records(key))
+                self._write_artifact(key, name, stamp, value)
+            self._derived[(key, name)] = (stamp, value)
+            return value
+
+    def skill_lookup(self, path: str) -> Dict[str, Dict]:
+        return self.derived(path, "skill_lookup")
+
+    def skill_scanner(self, path: str) -> PhraseScanner:
+        return self.derived(path, "skill_scanner")
+
+    def degree_taxonomy(self, path: str) -> Dict:
+        return self.derived(path, "degree_taxonomy")
+
+    def degree_lookup(self, path: str) -> Dict[str, str]:
+        return self.derived(path, "degree_lookup")
+
+    def degree_scanner(self, path: str) -> PhraseScanner:
+        return self.derived(path, "degree_scanner")
+
+    def major_scanner(self, path: str) -> PhraseScanner:
+        return self.derived(path, "major_scanner")
+
+    def title_lookup(self, path: str, variants: bool = False) -> Dict[str, Dict]:
+        return self.derived(path, "title_variant_lookup" if variants else "title_lookup")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._derived.clear()
+            self._fingerprints.clear()
+
+    def _artifact_path(self, key: str, name: str) -> Path:
+        tag = hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+        return self.cache_dir / f"{Path(key).stem}-{tag}.{name}.pkl"
+
+    def _read_artifact(self, key: str, name: str, stamp: Tuple[int, int]) -> Any:
+        if not self.cache_dir:
+            return None
+        artifact = self._artifact_path(key, name)
+        try:
+            with open(artifact, "rb") as f:
+                meta = pickle.load(f)
+                if meta.get("format") != FORMAT_VERSION:
+                    return None
+                if meta["stamp"] != stamp:
+                    # Touched but possibly unchanged, fall back to the content hash
+                    if meta["sha256"] != self.fingerprint(key):
+                        return None
+                    value = pickle.load(f)
+                    self._write_artifact(key, name, stamp, value)
+                    return value
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A corrupt or incompatible artifact is just a cache miss
+            return None
+
+    def _write_artifact(self, key: str, name: str, stamp: Tuple[int, int], value: Any) -> None:
+        if not self.cache_dir:
+            return
+        artifact = self._artifact_path(key, name)
+        meta = {"format": FORMAT_VERSION, "stamp": stamp, "sha256": self.fingerprint(key), "builder": name}
+        tmp = artifact.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            artifact.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, artifact)
+        except OSError:
+            # Read-only checkouts still work, they just rebuild per process
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+registry = TaxonomyRegistry()
+
+
+def compile_degrees(source: str = "data/education.json", target: str = "data/degrees.json") -> Dict:
+    taxonomy = compile_degree_taxonomy(registry.records(source))
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(taxonomy, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return taxonomy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile prebuilt taxonomy artifacts from data/*.json")
+    parser.add_argument("--education", default="data/education.json")
+    parser.add_argument("--degrees", default="data/degrees.json")
+    args = parser.parse_args()
+
+    taxonomy = compile_degrees(args.education, args.degrees)
+    print(f"Wrote {len(taxonomy['degrees'])} degree(s) and {len(taxonomy['majors'])} major(s) to {args.degrees}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import argparse
+from typing import Optional
+
+from aiohttp import web
+
+from api.routes import analyze_resume, match_job, upload
+from api.service import SERVICE, AnalysisService
+
+
+def create_app(workers: Optional[int] = None, max_batch: int = 32, max_delay: float = 0.005,
+               max_queue: int = 256) -> web.Application:
+    app = web.Application()
+    app[SERVICE] = AnalysisService(workers=workers, max_batch=max_batch, max_delay=max_delay, max_queue=max_queue)
+
+    async def lifecycle(app: web.Application):
+        await app[SERVICE].start()
+        yield
+        await app[SERVICE].stop()
+
+    app.cleanup_ctx.append(lifecycle)
+    for module in (analyze_resume, match_job, upload):
+        app.add_routes(module.routes)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume analysis HTTP service.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="extraction processes (default: CPU count)")
+    parser.add_argument("--max-batch", type=int, default=32, help="most requests parsed in one nlp.pipe call")
+    parser.add_argument("--max-delay-ms", type=float, default=5.0, help="how long a batch waits to fill up")
+    parser.add_argument("--max-queue", type=int, default=256, help="queued requests before answering 429")
+    args = parser.parse_args()
+
+    app = create_app(args.workers, args.max_batch, args.max_delay_ms / 1000.0, args.max_queue)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
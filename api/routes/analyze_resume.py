@@ -0,0 +1,13 @@
+from aiohttp import web
+
+from api.service import read_json, run_or_429, service
+
+routes = web.RouteTableDef()
+
+
+@routes.post("/analyze")
+async def analyze_resume(request: web.Request) -> web.Response:
+    """Extract skills, education and experience from ``{"resume": "<text>"}``."""
+    body = await read_json(request, "resume")
+    result = await run_or_429(service(request).analyze(body["resume"]))
+    return web.json_response(result)
@@ -0,0 +1,13 @@
+from aiohttp import web
+
+from api.service import read_json, run_or_429, service
+
+routes = web.RouteTableDef()
+
+
+@routes.post("/match")
+async def match_job(request: web.Request) -> web.Response:
+    """Score ``{"job": "<text>", "resume": "<text>"}``: overall score plus one score per matcher."""
+    body = await read_json(request, "job", "resume")
+    result = await run_or_429(service(request).match(body["job"], body["resume"]))
+    return web.json_response(result)
@@ -0,0 +1,87 @@
+import hashlib
+from pathlib import PurePath
+from tempfile import SpooledTemporaryFile
+from typing import IO, Optional, Tuple
+
+from aiohttp import BodyPartReader, web
+
+from ai.ingestion import KINDS, SUFFIXES, DocumentError, read_text
+from api.service import run_or_429, service
+from settings import UPLOAD_MAX_BYTES, UPLOAD_SPOOL_BYTES
+
+routes = web.RouteTableDef()
+
+CHUNK_SIZE = 64 * 1024
+
+# Document kinds by declared content type, for uploads without a known file extension
+CONTENT_TYPES = {
+    "text/plain": "txt",
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+}
+
+
+def _kind(part: BodyPartReader) -> Optional[str]:
+    suffix = PurePath(part.filename or "").suffix.lower()
+    if suffix in SUFFIXES:
+        return SUFFIXES[suffix]
+    content_type = part.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    return CONTENT_TYPES.get(content_type)
+
+
+async def _spool(part: BodyPartReader, spool: IO[bytes]) -> Tuple[str, int]:
+    # Hash while streaming; only UPLOAD_SPOOL_BYTES are ever held in memory per upload
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = await part.read_chunk(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > UPLOAD_MAX_BYTES:
+            raise web.HTTPRequestEntityTooLarge(max_size=UPLOAD_MAX_BYTES, actual_size=size)
+        digest.update(chunk)
+        spool.write(chunk)
+    return digest.hexdigest(), size
+
+
+def _text(spool: IO[bytes], kind: str, digest: str, size: int) -> str:
+    # Up to UPLOAD_SPOOL_BYTES the upload is still in memory; past that it has rolled over
+    # to a temp file, which ingestion reads in place rather than loading
+    if size <= UPLOAD_SPOOL_BYTES:
+        spool.seek(0)
+        return read_text(spool.read(), kind, sha256=digest)
+    return read_text(spool, kind, sha256=digest)
+
+
+@routes.post("/upload")
+async def upload_resume(request: web.Request) -> web.Response:
+    """Analyze a resume sent as the ``file`` field of a multipart form.
+
+    The body is streamed to a spooled temp file under a hard size cap (413 past it) and
+    hashed on the way; a file whose hash was analyzed before is answered from the cache
+    without being decoded or parsed again. PDF and DOCX are read from their text layer.
+    """
+    reader = await request.multipart()
+    async for part in reader:
+        if part.name != "file":
+            await part.release()
+            continue
+
+        kind = _kind(part)
+        if kind not in KINDS:
+            raise web.HTTPUnsupportedMediaType(text=f"Unsupported file type: {part.filename or 'unknown'}")
+
+        with SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES) as spool:
+            digest, size = await _spool(part, spool)
+            if not size:
+                raise web.HTTPBadRequest(text="Uploaded file is empty.")
+            try:
+                result, cached = await run_or_429(
+                    service(request).analyze_upload(digest, lambda: _text(spool, kind, digest, size)))
+            except DocumentError as e:
+                raise web.HTTPUnprocessableEntity(text=str(e))
+
+        return web.json_response({"filename": part.filename, "sha256": digest, "size": size,
+                                  "cached": cached, **result})
+    raise web.HTTPBadRequest(text="Expected a 'file' field.")
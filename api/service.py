@@ -0,0 +1,211 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from ai import pipeline
+from ai.cache import ExtractionCache, extraction_cache, taxonomy_version
+
+# Taxonomy files behind an analysis; editing any of them invalidates cached upload results
+ANALYSIS_TAXONOMIES = ("data/skills.json", "data/degrees.json", "data/experience.json")
+
+
+class Overloaded(Exception):
+    """Raised when a batcher's queue is full; routes turn it into a 429."""
+
+
+class MicroBatcher:
+    """Collects items submitted within ``max_delay`` seconds into one call of ``fn``.
+
+    ``fn`` takes a list of items and returns a list of results in the same order; it runs
+    in ``executor`` so the event loop never does the CPU work. At most ``max_in_flight``
+    batches run at once, and once ``max_queue`` items are waiting ``submit`` raises
+    Overloaded instead of letting latency grow without bound.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], List[Any]], executor: ProcessPoolExecutor,
+                 max_batch: int = 32, max_delay: float = 0.005, max_queue: int = 256, max_in_flight: int = 1):
+        self.fn = fn
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._task: Optional[asyncio.Task] = None
+        self._batches = set()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        await asyncio.gather(*self._batches, return_exceptions=True)
+
+    async def submit(self, item: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise Overloaded()
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for a free worker slot first, so items keep queuing (and batching) meanwhile
+            await self._slots.acquire()
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._dispatch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _dispatch(self, batch: List) -> None:
+        # Clients that went away while queued don't cost a parse
+        batch = [(item, future) for item, future in batch if not future.done()]
+        items = [item for item, _ in batch]
+        try:
+            if not items:
+                return
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, self.fn, items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+class AnalysisService:
+    """Process pool plus one micro-batcher per kind of work, shared by every route."""
+
+    def __init__(self, workers: Optional[int] = None, max_batch: int = 32, max_delay: float = 0.005,
+                 max_queue: int = 256):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.analyzer: Optional[MicroBatcher] = None
+        self.matcher: Optional[MicroBatcher] = None
+        self.cache: ExtractionCache = extraction_cache
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _batcher(self, fn: Callable[[List[Any]], List[Any]]) -> MicroBatcher:
+        return MicroBatcher(fn, self.executor, max_batch=self.max_batch, max_delay=self.max_delay,
+                            max_queue=self.max_queue, max_in_flight=self.workers)
+
+    async def start(self) -> None:
+        # Every worker warms up (taxonomy, spaCy, one resume through the extractors) in the pool
+        # initializer, then waits at a barrier for the others. So no ping can finish before all
+        # workers have been started and warmed, and start() returns only once they have
+        context = multiprocessing.get_context()
+        ready = context.Barrier(self.workers)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                            initializer=pipeline.init_worker, initargs=(None, ready))
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, pipeline.ping) for _ in range(self.workers)))
+        self.analyzer = self._batcher(pipeline.analyze_texts)
+        self.matcher = self._batcher(pipeline.match_pairs)
+        self.analyzer.start()
+        self.matcher.start()
+
+    async def stop(self) -> None:
+        for task in list(self._inflight.values()):
+            task.cancel()
+        await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+        for batcher in (self.analyzer, self.matcher):
+            if batcher:
+                await batcher.stop()
+        if self.executor:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def analyze(self, text: str) -> dict:
+        return await self.analyzer.submit(text)
+
+    async def match(self, job_text: str, resume_text: str) -> dict:
+        return await self.matcher.submit((job_text, resume_text))
+
+    async def analyze_upload(self, digest: str, load_text: Callable[[], str]) -> Tuple[dict, bool]:
+        """Analyze an upload by content hash; returns (result, served without extraction).
+
+        Seen hashes come straight from the extraction cache, and identical uploads that
+        arrive while the first is still being analyzed wait for it instead of re-running.
+        ``load_text`` is only called on a miss, by this caller. The analysis itself runs as
+        a task no uploader owns: an uploader that disconnects stops waiting for it, and the
+        others still get its result.
+        """
+        loop = asyncio.get_running_loop()
+        key = f"upload:{taxonomy_version(*ANALYSIS_TAXONOMIES)}:{digest}"
+        # The SQLite tier does blocking I/O, so it stays off the event loop
+        cached = await loop.run_in_executor(None, self.cache.get, key)
+        if cached is not None:
+            return cached, True
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            # Reading a PDF/DOCX text layer is blocking work too. It uses the caller's upload,
+            # so it happens here; an identical upload arriving meanwhile reads its own copy
+            text = await loop.run_in_executor(None, load_text)
+            pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending), True
+
+        task = loop.create_task(self._analyze_and_store(key, text))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._upload_done(key, done))
+        return await asyncio.shield(task), False
+
+    def _upload_done(self, key: str, task: asyncio.Task) -> None:
+        del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # waiters re-raise it; don't warn when every uploader went away
+
+    async def _analyze_and_store(self, key: str, text: str) -> dict:
+        result = await self.analyze(text)
+        await asyncio.get_running_loop().run_in_executor(None, self.cache.put, key, result)
+        return result
+
+
+SERVICE = web.AppKey("service", AnalysisService)
+
+
+def service(request: web.Request) -> AnalysisService:
+    return request.app[SERVICE]
+
+
+async def run_or_429(coro) -> Any:
+    try:
+        return await coro
+    except Overloaded:
+        raise web.HTTPTooManyRequests(text="Server is busy, retry shortly.", headers={"Retry-After": "1"})
+
+
+async def read_json(request: web.Request, *fields: str) -> dict:
+    try:
+        body = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text="Request body must be JSON.")
+    if not isinstance(body, dict):
+        raise web.HTTPBadRequest(text="Request body must be a JSON object.")
+    for field in fields:
+        if not isinstance(body.get(field), str) or not body[field].strip():
+            raise web.HTTPBadRequest(text=f"'{field}' must be a non-empty string.")
+    return body
@@ -0,0 +1,122 @@
+from typing import Dict, List
+
+import numpy as np
+
+from evaluation.preprocessing.page_raster import PageRaster
+
+# 5 bits per channel: 32768 bins, fine enough to keep brand colors apart
+BITS = 5
+BINS = 1 << (3 * BITS)
+# A color smaller than this share of the page is anti-aliasing or noise, not part of the design
+MIN_SHARE = 0.002
+PALETTE_SIZE = 8
+# Chroma (max - min channel) relative to the brightest channel; below this a color reads as gray
+MIN_SATURATION = 0.25
+# Brightest channel below this is too dark to read as a hue
+MIN_VALUE = 40.0
+HUE_FAMILIES = 12
+# Colors at least this far (as a contrast ratio) from the background count as ink
+MIN_INK_CONTRAST = 1.5
+# Anti-aliased pixels mix ink with paper, so the ink's own contrast is taken near the top
+# of the ink's contrast distribution (by area) rather than at its mode
+INK_PERCENTILE = 0.95
+# WCAG contrast ratios: below 3 hurts even large text, 7 and above is comfortable body text
+CONTRAST_RANGE = (3.0, 7.0)
+# Share of the page in accent colors that still reads as an accent
+ACCENT_RANGE = (0.1, 0.4)
+
+
+def relative_luminance(colors: np.ndarray) -> np.ndarray:
+    """WCAG relative luminance of sRGB colors given as (..., 3) values in 0-255."""
+    c = colors / 255.0
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def contrast_ratio(luminance: np.ndarray, against: float) -> np.ndarray:
+    return (np.maximum(luminance, against) + 0.05) / (np.minimum(luminance, against) + 0.05)
+
+
+def _hex(color: np.ndarray) -> str:
+    r, g, b = np.round(color).astype(int)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+class ColorAnalyzer:
+    """Palette, color count, contrast and accent usage of a page.
+
+    Everything is derived from one 5-bit-per-channel histogram of the page thumbnail:
+    each occupied bin carries its pixel share and mean color, and every metric is a
+    vectorized pass over those few hundred bins rather than over pixels.
+    """
+
+    name = "color"
+    needs_raster = True
+
+    def analyze(self, page: PageRaster) -> Dict:
+        pixels = page.thumbnail.reshape(-1, 3)
+        quantized = (pixels >> (8 - BITS)).astype(np.int32)
+        codes = (quantized[:, 0] << (2 * BITS)) | (quantized[:, 1] << BITS) | quantized[:, 2]
+        counts = np.bincount(codes, minlength=BINS)
+        occupied = np.flatnonzero(counts)
+        sums = np.stack([np.bincount(codes, weights=pixels[:, c], minlength=BINS)[occupied] for c in range(3)], axis=1)
+        colors = sums / counts[occupied, None]
+        shares = counts[occupied] / len(codes)
+
+        luminance = relative_luminance(colors)
+        background = int(np.argmax(shares))
+        contrast = contrast_ratio(luminance, luminance[background])
+
+        brightest = colors.max(axis=1)
+        chroma = brightest - colors.min(axis=1)
+        chromatic = (brightest >= MIN_VALUE) & (chroma >= MIN_SATURATION * brightest)
+        hue = self._hue(colors[chromatic], chroma[chromatic])
+        families = np.bincount((hue * HUE_FAMILIES).astype(int) % HUE_FAMILIES,
+                               weights=shares[chromatic], minlength=HUE_FAMILIES)
+
+        ink = np.flatnonzero(contrast >= MIN_INK_CONTRAST)
+        ink = ink[np.argsort(contrast[ink], kind="stable")]
+        cumulative = np.cumsum(shares[ink])
+        darkest = ink[np.searchsorted(cumulative, INK_PERCENTILE * cumulative[-1])] if len(ink) else None
+        significant = np.flatnonzero(shares >= MIN_SHARE)
+        palette = significant[np.argsort(-shares[significant], kind="stable")][:PALETTE_SIZE]
+
+        return {
+            "background": _hex(colors[background]),
+            "palette": [
+                {"color": _hex(colors[i]), "share": float(shares[i]), "contrast": float(contrast[i]),
+                 "accent": bool(chromatic[i])}
+                for i in palette.tolist()
+            ],
+            "color_count": len(significant),
+            "hue_families": int(np.count_nonzero(families >= MIN_SHARE)),
+            "accent_share": float(shares[chromatic].sum()),
+            "ink_share": float(shares[ink].sum()),
+            "ink_color": _hex(colors[darkest]) if darkest is not None else None,
+            "ink_contrast": float(contrast[darkest]) if darkest is not None else None,
+        }
+
+    @staticmethod
+    def _hue(colors: np.ndarray, chroma: np.ndarray) -> np.ndarray:
+        # HSV hue in [0, 1) for colors with nonzero chroma
+        r, g, b = colors[:, 0], colors[:, 1], colors[:, 2]
+        brightest = colors.argmax(axis=1)
+        hue = np.select(
+            [brightest == 0, brightest == 1],
+            [(g - b) / chroma, 2.0 + (b - r) / chroma],
+            4.0 + (r - g) / chroma,
+        )
+        return (hue / 6.0) % 1.0
+
+    def page_score(self, result: Dict) -> float:
+        if result["ink_contrast"] is None:
+            return 0.0
+        low, high = CONTRAST_RANGE
+        contrast = float(np.clip((result["ink_contrast"] - low) / (high - low), 0.0, 1.0))
+        restraint = max(0.0, 1.0 - 0.3 * max(0, result["hue_families"] - 2))
+        accent_low, accent_high = ACCENT_RANGE
+        accent = float(np.clip(1.0 - (result["accent_share"] - accent_low) / (accent_high - accent_low), 0.0, 1.0))
+        return float(np.mean([contrast, restraint, accent]))
+
+    def score(self, results: List[Dict]) -> float:
+        return float(np.mean([self.page_score(result) for result in results])) if results else 0.0
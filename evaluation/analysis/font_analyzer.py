@@ -0,0 +1,141 @@
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from evaluation.preprocessing.pdf_to_image import require_pymupdf
+
+# PyMuPDF span flags
+ITALIC = 1 << 1
+BOLD = 1 << 4
+
+# Sizes closer than this (in points) are the same size
+SIZE_STEP = 0.5
+# A size or family used by fewer characters than this share is incidental
+MIN_SHARE = 0.01
+# Comfortable body text, in points
+BODY_SIZE_RANGE = (9.0, 12.0)
+# Distinct sizes a clear hierarchy needs, and the most it can use before it turns noisy
+HIERARCHY_LEVELS = (2, 4)
+# Share of characters that can be emphasized before emphasis stops standing out
+MAX_BOLD_SHARE = 0.3
+MAX_ITALIC_SHARE = 0.2
+
+# Subset prefix ("ABCDEF+") and style suffixes ("-BoldItalic", ",Bold", "MT") around a family name
+_SUBSET = re.compile(r"^[A-Z]{6}\+")
+_STYLE = re.compile(
+    r"(?:[-,](?:Bold|Italic|Oblique|Regular|Roman|Medium|Light|Semibold|SemiBold|Black|Heavy|Condensed|MT|PS)+"
+    r"|(?:Bold|Italic|Oblique|MT|PS)+)$"
+)
+_BOLD_NAME = re.compile(r"bold|black|heavy|semibold", re.IGNORECASE)
+_ITALIC_NAME = re.compile(r"italic|oblique", re.IGNORECASE)
+
+
+def font_family(name: str) -> str:
+    family = _SUBSET.sub("", name)
+    while True:
+        stripped = _STYLE.sub("", family)
+        if stripped == family or not stripped:
+            return family
+        family = stripped
+
+
+class FontAnalyzer:
+    """Font families, size hierarchy, emphasis and body-size consistency of a PDF.
+
+    Reads the text spans of each page straight from the PDF (font name, size, flags), so
+    it never renders a pixel; every number is a count of characters, exact rather than
+    estimated. Pages stream one at a time, and the document score is computed from the
+    counts summed over all pages.
+    """
+
+    name = "font"
+    needs_raster = False
+
+    def iter_pages(self, path: Union[str, Path], pages: Optional[Sequence[int]] = None) -> Iterator[Dict]:
+        pymupdf = require_pymupdf()
+        flags = pymupdf.TEXTFLAGS_DICT & ~pymupdf.TEXT_PRESERVE_IMAGES
+        with pymupdf.open(path) as document:
+            for index in range(document.page_count) if pages is None else pages:
+                yield self._page_stats(index, document[index].get_text("dict", flags=flags))
+
+    def analyze_document(self, path: Union[str, Path], pages: Optional[Sequence[int]] = None) -> List[Dict]:
+        return list(self.iter_pages(path, pages))
+
+    @staticmethod
+    def _page_stats(index: int, text: Dict) -> Dict:
+        families, sizes = Counter(), Counter()
+        bold = italic = 0
+        for block in text["blocks"]:
+            for line in block.get("lines", ()):
+                for span in line["spans"]:
+                    chars = len(span["text"].strip())
+                    if not chars:
+                        continue
+                    font = span["font"]
+                    families[font_family(font)] += chars
+                    sizes[round(span["size"] / SIZE_STEP) * SIZE_STEP] += chars
+                    # Font descriptors often leave the flags unset; the font name is the fallback
+                    if span["flags"] & BOLD or _BOLD_NAME.search(font):
+                        bold += chars
+                    if span["flags"] & ITALIC or _ITALIC_NAME.search(font):
+                        italic += chars
+        return {
+            "page": index,
+            "chars": sum(sizes.values()),
+            "families": dict(families),
+            "sizes": dict(sizes),
+            "bold_chars": bold,
+            "italic_chars": italic,
+        }
+
+    @staticmethod
+    def summarize(results: List[Dict]) -> Dict:
+        """Document-level statistics from per-page results."""
+        families, sizes = Counter(), Counter()
+        for result in results:
+            families.update(result["families"])
+            sizes.update(result["sizes"])
+        chars = sum(sizes.values())
+        if not chars:
+            return {"chars": 0}
+
+        size_values = np.array(list(sizes.keys()), dtype=np.float64)
+        size_counts = np.array(list(sizes.values()), dtype=np.float64)
+        body_size = float(size_values[np.argmax(size_counts)])
+        # Consistency only counts text at or below body size, so headings don't lower it
+        not_headings = size_values <= body_size + SIZE_STEP
+        at_body = np.abs(size_values - body_size) <= SIZE_STEP
+        levels = sorted((float(s) for s, n in zip(size_values, size_counts) if n / chars >= MIN_SHARE), reverse=True)
+        return {
+            "chars": chars,
+            "families": [family for family, n in families.most_common() if n / chars >= MIN_SHARE],
+            "family_count": sum(1 for n in families.values() if n / chars >= MIN_SHARE),
+            "body_size": body_size,
+            "size_levels": levels,
+            "heading_ratio": levels[0] / body_size if levels else 1.0,
+            "body_consistency": float(size_counts[at_body].sum() / size_counts[not_headings].sum()),
+            "bold_share": sum(r["bold_chars"] for r in results) / chars,
+            "italic_share": sum(r["italic_chars"] for r in results) / chars,
+        }
+
+    def score(self, results: List[Dict]) -> float:
+        summary = self.summarize(results)
+        if not summary["chars"]:
+            return 0.0
+        families = max(0.0, 1.0 - 0.4 * max(0, summary["family_count"] - 2))
+        low, high = BODY_SIZE_RANGE
+        body = summary["body_size"]
+        body_size = 1.0 if low <= body <= high else max(0.0, 1.0 - min(abs(body - low), abs(body - high)) / 3.0)
+        fewest, most = HIERARCHY_LEVELS
+        levels = len(summary["size_levels"])
+        hierarchy = 0.5 if levels < fewest else max(0.0, 1.0 - 0.25 * max(0, levels - most))
+        if summary["heading_ratio"] < 1.2:
+            hierarchy *= 0.5
+        emphasis = float(np.mean([
+            1.0 if summary["bold_share"] <= MAX_BOLD_SHARE else MAX_BOLD_SHARE / summary["bold_share"],
+            1.0 if summary["italic_share"] <= MAX_ITALIC_SHARE else MAX_ITALIC_SHARE / summary["italic_share"],
+        ]))
+        return float(np.mean([families, body_size, hierarchy, emphasis, summary["body_consistency"]]))
@@ -0,0 +1,178 @@
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from evaluation.preprocessing.page_raster import PageRaster
+
+# Layout is found on a grid of about this many cells per inch, each cell set when any
+# pixel in it is ink; fine enough to keep line gaps, coarse enough to be cheap
+CELLS_PER_INCH = 32
+ASSUMED_DPI = 100
+# Blank widths, in inches, that separate columns and blocks
+MIN_COLUMN_GAP = 0.25
+MIN_BLOCK_GAP = 0.12
+MAX_DEPTH = 12
+# A split at gutters is the page's column structure when the region holds this share of
+# the page's ink; smaller ones (a title with its dates flush right) are just blocks side by side
+COLUMN_INK_SHARE = 0.4
+# Left edges closer than this (in inches) are the same alignment
+ALIGNMENT_TOLERANCE = 0.1
+
+
+class Block(NamedTuple):
+    x0: int  # page pixels, end exclusive
+    y0: int
+    x1: int
+    y1: int
+    column: int  # index among the page's columns, left to right; 0 on single-column pages
+    ink: int     # ink cells of the layout grid inside the block
+
+
+def or_pool(mask: np.ndarray, factor: int) -> np.ndarray:
+    """``factor`` x ``factor`` cells of a boolean mask, set when any pixel in the cell is."""
+    if factor <= 1:
+        return mask
+    height = mask.shape[0] // factor * factor
+    width = mask.shape[1] // factor * factor
+    rows = mask[:height:factor, :width].copy()
+    for i in range(1, factor):
+        rows |= mask[i:height:factor, :width]
+    cells = rows[:, ::factor].copy()
+    for j in range(1, factor):
+        cells |= rows[:, j::factor]
+    return cells
+
+
+def integral_image(grid: np.ndarray) -> np.ndarray:
+    """Summed-area table with a zero first row and column: the sum over [y0:y1, x0:x1] is
+    ``S[y1, x1] - S[y0, x1] - S[y1, x0] + S[y0, x0]``."""
+    table = np.zeros((grid.shape[0] + 1, grid.shape[1] + 1), dtype=np.int32)
+    np.cumsum(grid, axis=0, dtype=np.int32, out=table[1:, 1:])
+    np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+    return table
+
+
+def _zero_runs(profile: np.ndarray, min_length: int) -> List[Tuple[int, int]]:
+    blank = np.concatenate(([0], (profile == 0).astype(np.int8), [0]))
+    edges = np.diff(blank)
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    keep = ends - starts >= min_length
+    return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+
+class PageLayout:
+    """Blocks, columns and reading order of a page, by recursive XY-cut.
+
+    Works on the ink mask pooled to a ~1/32 inch grid. One integral image of that grid
+    gives the row or column ink profile of any region in O(height + width), so every
+    recursion step is a couple of vectorized differences. Columns are cut at every
+    full-height blank gutter at once; otherwise the region is cut in two at its widest
+    blank band of rows, which keeps coincidentally aligned gaps in neighbouring columns
+    from slicing them into strips. ``blocks`` come out in reading order: top to bottom,
+    and column by column, left to right.
+    """
+
+    def __init__(self, mask: np.ndarray, dpi: int = 0):
+        self.dpi = dpi or ASSUMED_DPI
+        self.height, self.width = mask.shape
+        self.cell = max(1, round(self.dpi / CELLS_PER_INCH))
+        self.grid = or_pool(mask, self.cell)
+        self.integral = integral_image(self.grid)
+        self.column_gap = max(1, round(MIN_COLUMN_GAP * self.dpi / self.cell))
+        self.block_gap = max(1, round(MIN_BLOCK_GAP * self.dpi / self.cell))
+        self.blocks: List[Block] = []
+        self.columns = 1
+        self._detect()
+
+    def ink(self, y0: int, y1: int, x0: int, x1: int) -> int:
+        """Ink cells in a region given in grid coordinates."""
+        s = self.integral
+        return int(s[y1, x1] - s[y0, x1] - s[y1, x0] + s[y0, x0])
+
+    def _rows(self, y0: int, y1: int, x0: int, x1: int) -> np.ndarray:
+        return np.diff(self.integral[y0:y1 + 1, x1] - self.integral[y0:y1 + 1, x0])
+
+    def _cols(self, y0: int, y1: int, x0: int, x1: int) -> np.ndarray:
+        return np.diff(self.integral[y1, x0:x1 + 1] - self.integral[y0, x0:x1 + 1])
+
+    def _detect(self) -> None:
+        rows, cols = self.grid.shape
+        self._split(0, rows, 0, cols, None, 0)
+
+    def _split(self, y0: int, y1: int, x0: int, x1: int, column: Optional[int], depth: int) -> None:
+        # Trim the region to its ink
+        inked = np.flatnonzero(self._rows(y0, y1, x0, x1))
+        if not len(inked):
+            return
+        y0, y1 = y0 + int(inked[0]), y0 + int(inked[-1]) + 1
+        inked = np.flatnonzero(self._cols(y0, y1, x0, x1))
+        x0, x1 = x0 + int(inked[0]), x0 + int(inked[-1]) + 1
+
+        if depth < MAX_DEPTH:
+            gutters = _zero_runs(self._cols(y0, y1, x0, x1), self.column_gap)
+            if gutters:
+                edges = [x0] + [x0 + edge for gutter in gutters for edge in gutter] + [x1]
+                spans = list(zip(edges[::2], edges[1::2]))
+                is_columns = column is None and self.ink(y0, y1, x0, x1) >= COLUMN_INK_SHARE * self.integral[-1, -1]
+                if is_columns:
+                    self.columns = len(spans)
+                for i, (left, right) in enumerate(spans):
+                    self._split(y0, y1, left, right, i if is_columns else column, depth + 1)
+                return
+
+            gaps = _zero_runs(self._rows(y0, y1, x0, x1), self.block_gap)
+            if gaps:
+                start, end = max(gaps, key=lambda gap: gap[1] - gap[0])
+                self._split(y0, y0 + start, x0, x1, column, depth + 1)
+                self._split(y0 + end, y1, x0, x1, column, depth + 1)
+                return
+
+        cell = self.cell
+        self.blocks.append(Block(
+            x0 * cell, y0 * cell, min(x1 * cell, self.width), min(y1 * cell, self.height),
+            column or 0, self.ink(y0, y1, x0, x1),
+        ))
+
+    def column_blocks(self) -> Dict[int, List[Block]]:
+        columns: Dict[int, List[Block]] = {}
+        for block in self.blocks:
+            columns.setdefault(block.column, []).append(block)
+        return columns
+
+
+class LayoutAnalyzer:
+    """Column count, block structure and alignment of a page, from the shared PageLayout."""
+
+    name = "layout"
+    needs_raster = True
+
+    def analyze(self, page: "PageRaster") -> Dict:
+        layout = page.layout
+        tolerance = ALIGNMENT_TOLERANCE * layout.dpi
+        aligned = 0
+        for blocks in layout.column_blocks().values():
+            # Blocks whose left edge sits on their column's most common left edge
+            lefts = np.array([block.x0 for block in blocks])
+            aligned += int(max(np.count_nonzero(np.abs(lefts - left) <= tolerance) for left in lefts))
+        return {
+            "columns": layout.columns,
+            "blocks": [
+                {"box": [block.x0 / layout.dpi, block.y0 / layout.dpi, block.x1 / layout.dpi, block.y1 / layout.dpi],
+                 "column": block.column}
+                for block in layout.blocks
+            ],
+            "alignment": aligned / len(layout.blocks) if layout.blocks else 0.0,
+        }
+
+    def page_score(self, result: Dict) -> float:
+        blocks = len(result["blocks"])
+        if not blocks:
+            return 0.0
+        columns = 1.0 if result["columns"] <= 2 else max(0.0, 1.0 - 0.3 * (result["columns"] - 2))
+        # A page with only a couple of blocks is a wall of text
+        structure = min(blocks / 4.0, 1.0)
+        return float(np.mean([columns, structure, result["alignment"]]))
+
+    def score(self, results: List[Dict]) -> float:
+        return float(np.mean([self.page_score(result) for result in results])) if results else 0.0
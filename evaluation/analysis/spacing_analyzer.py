@@ -0,0 +1,98 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from evaluation.preprocessing.page_raster import PageRaster
+
+# Margins at or above this many inches score fully; none at all scores zero
+COMFORTABLE_MARGIN = 0.5
+# Share of the page covered by ink that reads as neither sparse nor crammed
+INK_COVERAGE_RANGE = (0.03, 0.15)
+# Gap between text lines relative to the line height
+LINE_GAP_RANGE = (0.2, 1.2)
+
+
+def _runs(profile: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) of each run of True in a 1-D boolean profile."""
+    edges = np.diff(np.concatenate(([0], profile.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _in_range(value: float, low: float, high: float) -> float:
+    # 1 inside [low, high], falling off linearly to 0 at 0 and at 2 * high
+    if value < low:
+        return max(value / low, 0.0)
+    if value > high:
+        return max(1.0 - (value - high) / high, 0.0)
+    return 1.0
+
+
+class SpacingAnalyzer:
+    """Margins, ink coverage, line leading and block spacing of a page.
+
+    Built on the page's shared layout: margins come from the block boxes, line leading
+    is measured inside each block (so lines of neighbouring columns never merge), and
+    the vertical gaps between consecutive blocks of a column are checked for consistency.
+    Margins and leading skip bare fills and reversed blocks: a full-bleed colored band or
+    a rule is decoration, and the mask rows of a reversed block are its fill, not its lines.
+    """
+
+    name = "spacing"
+    needs_raster = True
+
+    def analyze(self, page: PageRaster) -> Dict:
+        if not page.layout.blocks:
+            return {"empty": True}
+        blocks = [
+            block for block, tone in zip(page.layout.blocks, page.tones)
+            if tone.text is not None and not tone.reversed
+        ] or page.layout.blocks
+
+        margins = {
+            "top": page.inches(min(block.y0 for block in blocks)),
+            "bottom": page.inches(page.height - max(block.y1 for block in blocks)),
+            "left": page.inches(min(block.x0 for block in blocks)),
+            "right": page.inches(page.width - max(block.x1 for block in blocks)),
+        }
+
+        heights, gaps = [], []
+        for block in blocks:
+            rows = np.count_nonzero(page.mask[block.y0:block.y1, block.x0:block.x1], axis=1)
+            starts, ends = _runs(rows > 0)
+            heights.append(ends - starts)
+            gaps.append(starts[1:] - ends[:-1])
+        heights, gaps = np.concatenate(heights), np.concatenate(gaps)
+        line_height = float(np.median(heights))
+
+        block_gaps = []
+        for column in page.layout.column_blocks().values():
+            # Blocks side by side (a title with its dates) overlap vertically and aren't a gap
+            block_gaps.extend(b.y0 - a.y1 for a, b in zip(column, column[1:]) if b.y0 > a.y1)
+        block_gaps = np.array(block_gaps, dtype=np.float64)
+
+        return {
+            "empty": False,
+            "margins": margins,
+            "ink_coverage": np.count_nonzero(page.mask) / page.mask.size,
+            "lines": len(heights),
+            "line_height": page.inches(line_height),
+            "line_gap": float(np.median(gaps)) / line_height if len(gaps) else 0.0,
+            "block_gap": page.inches(float(np.median(block_gaps))) if len(block_gaps) else 0.0,
+            # Coefficient of variation of the gaps between blocks; 0 is perfectly even
+            "block_gap_variation": float(block_gaps.std() / block_gaps.mean()) if len(block_gaps) > 1 else 0.0,
+        }
+
+    def page_score(self, result: Dict) -> float:
+        if result["empty"]:
+            return 0.0
+        margins = result["margins"]
+        margin = np.mean([min(value / COMFORTABLE_MARGIN, 1.0) for value in margins.values()])
+        widest = max(margins["left"], margins["right"])
+        balance = 1.0 - abs(margins["left"] - margins["right"]) / widest if widest else 1.0
+        coverage = _in_range(result["ink_coverage"], *INK_COVERAGE_RANGE)
+        leading = _in_range(result["line_gap"], *LINE_GAP_RANGE) if result["lines"] > 1 else 1.0
+        rhythm = max(0.0, 1.0 - result["block_gap_variation"])
+        return float(np.mean([margin, balance, coverage, leading, rhythm]))
+
+    def score(self, results: List[Dict]) -> float:
+        return float(np.mean([self.page_score(result) for result in results])) if results else 0.0
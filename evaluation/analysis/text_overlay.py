@@ -0,0 +1,70 @@
+from typing import Dict, List
+
+import numpy as np
+
+from evaluation.analysis.color_analyzer import contrast_ratio, relative_luminance
+from evaluation.preprocessing.page_raster import PageRaster
+
+# Background tone spread (BlockTone.spread) above this is a busy background: an image or pattern
+BUSY_SPREAD = 20.0
+# WCAG contrast ratios: below 3 is hard to read; 4.5 and above is fine for body text
+CONTRAST_RANGE = (3.0, 4.5)
+
+
+def _luminance(gray: float) -> float:
+    return float(relative_luminance(np.array([gray, gray, gray])))
+
+
+class TextOverlayAnalyzer:
+    """Text set over fills or images, and how legible it stays there.
+
+    Reuses the page's layout blocks and their shared tones: each block's background is
+    judged from its own gray levels, so light text reversed out of a dark band is read as
+    text on a fill rather than as holes in a block of ink. Blocks with nothing on them
+    (bare fills, rules) have no text to read and are left out.
+    """
+
+    name = "text_overlay"
+    needs_raster = True
+
+    def analyze(self, page: PageRaster) -> Dict:
+        blocks = []
+        for block, tone in zip(page.layout.blocks, page.tones):
+            if tone.text is None:
+                continue
+            blocks.append({
+                "area": (block.x1 - block.x0) * (block.y1 - block.y0),
+                "overlay": tone.fill,
+                "reversed": tone.reversed,
+                "busy": tone.spread > BUSY_SPREAD,
+                "contrast": float(contrast_ratio(_luminance(tone.text), _luminance(tone.background))),
+            })
+
+        total = sum(block["area"] for block in blocks)
+        overlaid = [block for block in blocks if block["overlay"] or block["busy"]]
+        return {
+            "paper": page.paper,
+            "blocks": blocks,
+            "overlay_share": sum(block["area"] for block in overlaid) / total if total else 0.0,
+            "min_overlay_contrast": min((block["contrast"] for block in overlaid), default=None),
+        }
+
+    @staticmethod
+    def _block_score(block: Dict) -> float:
+        if not (block["overlay"] or block["busy"]):
+            return 1.0
+        low, high = CONTRAST_RANGE
+        legibility = float(np.clip((block["contrast"] - low) / (high - low), 0.0, 1.0))
+        return legibility * (0.5 if block["busy"] else 1.0)
+
+    def page_score(self, result: Dict) -> float:
+        blocks = result["blocks"]
+        if not blocks:
+            return 1.0
+        # Area-weighted, so a small caption on a photo matters less than a whole column
+        areas = np.array([block["area"] for block in blocks], dtype=np.float64)
+        scores = np.array([self._block_score(block) for block in blocks])
+        return float((areas * scores).sum() / areas.sum())
+
+    def score(self, results: List[Dict]) -> float:
+        return float(np.mean([self.page_score(result) for result in results])) if results else 0.0
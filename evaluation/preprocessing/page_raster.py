@@ -0,0 +1,145 @@
+import math
+import threading
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from evaluation.analysis.layout_detector import PageLayout
+
+# Longest side of the thumbnail, in pixels
+THUMBNAIL_SIZE = 256
+# Samples per inch taken inside each block for its tones; enough to see thin strokes, a fraction of the pixels
+SAMPLES_PER_INCH = 75
+# Gray levels two tones must differ by to count as different: a block background that far from
+# the paper is a fill or an image, and a block without a tone that far from its background is bare
+TONE_TOLERANCE = 24
+
+# Integer BT.601 luma weights; they sum to 256, so a weighted sum of uint8 fits in uint16
+_LUMA = (77, 150, 29)
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+def grayscale(image: np.ndarray) -> np.ndarray:
+    # Each channel is widened before it is weighted: under NumPy 1.x value-based casting a
+    # uint8 array times a uint16 scalar stays uint8 and silently wraps
+    gray = image[..., 0].astype(np.uint16) * _LUMA[0]
+    gray += image[..., 1].astype(np.uint16) * _LUMA[1]
+    gray += image[..., 2].astype(np.uint16) * _LUMA[2]
+    gray >>= 8
+    return gray.astype(np.uint8)
+
+
+def otsu_threshold(gray: np.ndarray) -> int:
+    """Gray level that best separates ink from paper; pixels below it are ink."""
+    # A 2x2-strided sample gives the same histogram shape at a quarter of the cost
+    histogram = np.bincount(gray[::2, ::2].ravel(), minlength=256).astype(np.float64)
+    weight = np.cumsum(histogram)
+    mass = np.cumsum(histogram * np.arange(256))
+    total, total_mass = weight[-1], mass[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_below = mass / weight
+        mean_above = (total_mass - mass) / (total - weight)
+        between = weight * (total - weight) * (mean_below - mean_above) ** 2
+    between = np.nan_to_num(between, nan=0.0, posinf=0.0)
+    if not between.any():
+        # One flat tone (a blank page): nothing counts as ink
+        return 0
+    # Levels 0..t are the dark class, so "below the threshold" is gray < t + 1
+    return int(np.argmax(between)) + 1
+
+
+class BlockTone(NamedTuple):
+    background: float       # median gray of the block's background: the tone its text sits on
+    spread: float           # spread of the background tone, away from the text (see block_tone)
+    text: Optional[float]   # the text's own tone; None when nothing stands out (a bare fill or rule)
+    fill: bool              # the background is not the paper: a colored band, a box, an image
+    reversed: bool          # the text is lighter than its background
+
+
+def block_tone(gray: np.ndarray, paper: int) -> BlockTone:
+    """Background and text tones of one block, from its own gray levels.
+
+    The page mask calls everything darker than the page-wide Otsu threshold ink, so light
+    text on a dark fill comes out as an ink block with paper-colored holes. Here the block
+    is split at its own Otsu threshold instead: the side with more pixels is its
+    background, dark or light, and the other side is its text.
+    """
+    threshold = otsu_threshold(gray)
+    dark = gray < threshold
+    reversed_ = 2 * np.count_nonzero(dark) > dark.size
+    back, text = (gray[dark], gray[~dark]) if reversed_ else (gray[~dark], gray[dark])
+    low, background, high = (float(q) for q in np.percentile(back, (25, 50, 75)))
+    fill = abs(background - paper) > TONE_TOLERANCE
+    # Anti-aliased glyph edges only pull the background toward the text's tone, so its
+    # spread is twice the quartile distance on the far side; a photo or pattern spreads both ways
+    spread = 2 * (background - low if reversed_ else high - background)
+    if not len(text):
+        return BlockTone(background, spread, None, fill, False)
+    # The text's own tone is its extreme, not its mean: anti-aliased edges blend into the background
+    text_gray = float(np.percentile(text, 95 if reversed_ else 5))
+    if abs(text_gray - background) <= TONE_TOLERANCE:
+        return BlockTone(background, spread, None, fill, False)
+    return BlockTone(background, spread, text_gray, fill, bool(reversed_))
+
+
+class PageRaster:
+    """One rendered page and the derivatives every visual analyzer shares.
+
+    ``image`` is a read-only view of the buffer it was built from, never a copy. The
+    grayscale and the Otsu ink mask are computed once, up front, so analyzers running
+    concurrently on the page only ever read. ``thumbnail`` is a strided view of ``image``
+    (every ``thumbnail_factor``-th pixel): no allocation, and unlike a box filter it never
+    blends ink into paper, so its colors are a fair sample of the page's. All arrays are
+    read-only; an analyzer that needs to modify pixels must copy what it touches.
+
+    ``layout`` is built by whichever analyzer asks first; the others wait for it and get
+    the same object, so blocks and columns are detected once per page. ``tones`` (one
+    BlockTone per layout block) are shared the same way.
+    """
+
+    def __init__(self, image: np.ndarray, index: int = 0, dpi: int = 0):
+        view = np.asarray(image).view()
+        self.image = _readonly(view)
+        self.index = index
+        self.dpi = dpi
+        self.height, self.width = view.shape[:2]
+        self.gray = _readonly(grayscale(view))
+        self.threshold = otsu_threshold(self.gray)
+        self.mask = _readonly(self.gray < self.threshold)
+        self.thumbnail_factor = max(1, math.ceil(max(self.height, self.width) / THUMBNAIL_SIZE))
+        self.thumbnail = view[::self.thumbnail_factor, ::self.thumbnail_factor]
+        # The most common gray is the paper
+        self.paper = int(np.argmax(np.bincount(
+            self.gray[::self.thumbnail_factor, ::self.thumbnail_factor].ravel(), minlength=256)))
+        self._layout = None
+        self._tones = None
+        self._layout_lock = threading.RLock()
+
+    @property
+    def layout(self) -> PageLayout:
+        with self._layout_lock:
+            if self._layout is None:
+                self._layout = PageLayout(self.mask, self.dpi)
+            return self._layout
+
+    @property
+    def tones(self) -> List[BlockTone]:
+        with self._layout_lock:
+            if self._tones is None:
+                step = max(1, round(self.dpi / SAMPLES_PER_INCH)) if self.dpi else 1
+                self._tones = [
+                    block_tone(self.gray[block.y0:block.y1:step, block.x0:block.x1:step], self.paper)
+                    for block in self.layout.blocks
+                ]
+            return self._tones
+
+    @classmethod
+    def from_rendered(cls, page) -> "PageRaster":
+        return cls(page.image, page.index, page.dpi)
+
+    def inches(self, pixels: float) -> float:
+        return pixels / self.dpi if self.dpi else 0.0
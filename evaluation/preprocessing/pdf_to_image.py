@@ -0,0 +1,256 @@
+import hashlib
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from settings import CACHE_DIR, PAGE_CACHE_MAX_BYTES
+
+# Resolution each visual analyzer needs; a render serves the most demanding one requested.
+# Font analysis reads the text layer and needs no pixels at all.
+# Color needs 100: at lower resolutions small body text never reaches its own color.
+ANALYZER_DPI = {
+    "color": 100,
+    "layout": 100,
+    "spacing": 100,
+    "text_overlay": 150,
+    "font": 0,
+}
+DEFAULT_DPI = 100
+
+# A cache hit refreshes its file's mtime (the eviction order) only when older than this many seconds
+RECENCY_RESOLUTION = 300.0
+
+PathLike = Union[str, Path]
+
+
+def require_pymupdf():
+    # Imported on first use so the text pipeline never needs PyMuPDF installed
+    try:
+        import pymupdf
+    except ImportError as e:
+        raise ImportError("Visual evaluation of PDFs requires PyMuPDF (pip install pymupdf)") from e
+    return pymupdf
+
+
+class RenderedPage(NamedTuple):
+    index: int
+    dpi: int
+    image: np.ndarray  # (height, width, 3) uint8 RGB, read-only
+
+
+def dpi_for(analyzers: Iterable[str]) -> int:
+    """Lowest DPI that satisfies every named analyzer; 0 when none of them needs pixels."""
+    return max((ANALYZER_DPI.get(name, DEFAULT_DPI) for name in analyzers), default=DEFAULT_DPI)
+
+
+def file_hash(path: PathLike, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def page_count(path: PathLike) -> int:
+    with require_pymupdf().open(path) as document:
+        return document.page_count
+
+
+class PageCache:
+    """Rendered pages as ``.npy`` files keyed by (PDF hash, page, DPI) under ``CACHE_DIR``.
+
+    Hits are memory-mapped, so a cached page costs no resident memory until it is read.
+    Once the files grow past ``max_bytes`` the least recently used are deleted, down to
+    90% of the cap; recency is the file's mtime, refreshed by a hit at most once every
+    ``RECENCY_RESOLUTION`` seconds. Pages already mapped by a reader stay readable after
+    their file is deleted.
+    """
+
+    def __init__(self, directory: Optional[PathLike] = None, max_bytes: int = PAGE_CACHE_MAX_BYTES):
+        self.directory = Path(directory) if directory else CACHE_DIR / "pages"
+        self.max_bytes = max_bytes
+        # Bytes on disk as last scanned plus what this process stored since; other
+        # processes store too, so the real total is re-read before evicting
+        self._bytes: Optional[int] = None
+
+    def path(self, pdf_hash: str, index: int, dpi: int) -> Path:
+        return self.directory / pdf_hash / f"{index}@{dpi}.npy"
+
+    def load(self, pdf_hash: str, index: int, dpi: int) -> Optional[np.ndarray]:
+        path = self.path(pdf_hash, index, dpi)
+        try:
+            image = np.load(path, mmap_mode="r")
+            if time.time() - path.stat().st_mtime > RECENCY_RESOLUTION:
+                os.utime(path)
+            return image
+        except (OSError, ValueError):
+            return None
+
+    def store(self, pdf_hash: str, index: int, dpi: int, image: np.ndarray) -> Path:
+        path = self.path(pdf_hash, index, dpi)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a unique name, then rename, so readers never see a partial file
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp, image)
+        os.replace(tmp, path)
+        if self._bytes is None:
+            self._bytes = sum(size for _, size, _ in self._files())
+        else:
+            self._bytes += path.stat().st_size
+        if self._bytes > self.max_bytes:
+            self._evict()
+        return path
+
+    def _files(self) -> List[Tuple[float, int, Path]]:
+        files = []
+        try:
+            documents = list(os.scandir(self.directory))
+        except OSError:
+            return files
+        for document in documents:
+            if not document.is_dir():
+                continue
+            try:
+                for entry in os.scandir(document.path):
+                    if entry.name.endswith(".npy") and ".tmp." not in entry.name:
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+            except OSError:
+                continue
+        return files
+
+    def _evict(self) -> None:
+        files = sorted(self._files(), key=lambda file: file[0])
+        total = sum(size for _, size, _ in files)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            try:
+                path.parent.rmdir()  # only succeeds once a document's last page is gone
+            except OSError:
+                pass
+        self._bytes = total
+
+
+# Open documents per process, so a worker renders many pages of a PDF from one parse
+_documents: Dict[str, object] = {}
+
+
+def _document(path: str):
+    document = _documents.get(path)
+    if document is None:
+        for stale in _documents.values():
+            stale.close()
+        _documents.clear()
+        document = _documents[path] = require_pymupdf().open(path)
+    return document
+
+
+def render_page(path: PathLike, index: int, dpi: int) -> np.ndarray:
+    pymupdf = require_pymupdf()
+    pixmap = _document(str(path))[index].get_pixmap(dpi=dpi, colorspace=pymupdf.csRGB, alpha=False)
+    image = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.width, pixmap.n)
+    return image.copy()
+
+
+# One PageCache per directory per process, so a worker keeps its running size total
+_page_caches: Dict[Tuple[str, int], PageCache] = {}
+
+
+def _render_task(path: str, index: int, dpi: int, cache_dir: Optional[str], max_bytes: int, pdf_hash: str):
+    image = render_page(path, index, dpi)
+    if cache_dir is None:
+        return image
+    page_cache = _page_caches.get((cache_dir, max_bytes))
+    if page_cache is None:
+        page_cache = _page_caches[cache_dir, max_bytes] = PageCache(cache_dir, max_bytes)
+    # Hand back a cache path instead of the pixels; the parent memory-maps it
+    return str(page_cache.store(pdf_hash, index, dpi, image))
+
+
+def _readonly(image: np.ndarray) -> np.ndarray:
+    if image.flags.writeable:
+        image.flags.writeable = False
+    return image
+
+
+def rasterize(path: PathLike, dpi: Optional[int] = None, analyzers: Optional[Iterable[str]] = None,
+              pages: Optional[Sequence[int]] = None, workers: Optional[int] = None,
+              window: Optional[int] = None, cache: Union[bool, PageCache] = True) -> Iterator[RenderedPage]:
+    """Yield the pages of a PDF as RGB arrays, in page order, one at a time.
+
+    ``dpi`` defaults to the lowest resolution every named ``analyzer`` can work with;
+    when none of them needs pixels (only ``font``) nothing is rendered or yielded. Pages
+    render in a process pool with at most ``window`` (default ``2 * workers``) in flight,
+    so peak memory is a few pages whatever the length of the document. Rendered pages
+    are cached by (file hash, page, DPI), and cached pages skip the pool entirely.
+    """
+    if dpi is None:
+        dpi = dpi_for(analyzers) if analyzers is not None else DEFAULT_DPI
+    if not dpi:
+        return
+    path = str(path)
+    indices = list(range(page_count(path))) if pages is None else list(pages)
+    page_cache = cache if isinstance(cache, PageCache) else (PageCache() if cache else None)
+    pdf_hash = file_hash(path) if page_cache else ""
+
+    def cached(index: int) -> Optional[np.ndarray]:
+        return page_cache.load(pdf_hash, index, dpi) if page_cache else None
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for index in indices:
+            image = cached(index)
+            if image is None:
+                image = render_page(path, index, dpi)
+                if page_cache:
+                    page_cache.store(pdf_hash, index, dpi, image)
+            yield RenderedPage(index, dpi, _readonly(image))
+        return
+
+    window = window or 2 * workers
+    cache_dir = str(page_cache.directory) if page_cache else None
+    max_bytes = page_cache.max_bytes if page_cache else 0
+    pool = None
+    pending = deque()
+    try:
+        remaining = iter(indices)
+        while True:
+            # Top the window up; cache hits are queued as ready results and cost no worker
+            while len(pending) < window:
+                index = next(remaining, None)
+                if index is None:
+                    break
+                image = cached(index)
+                if image is None:
+                    # Started on the first miss; a fully cached document never spawns workers
+                    pool = pool or ProcessPoolExecutor(max_workers=min(workers, len(indices)))
+                    image = pool.submit(_render_task, path, index, dpi, cache_dir, max_bytes, pdf_hash)
+                pending.append((index, image))
+            if not pending:
+                return
+            index, result = pending.popleft()
+            if not isinstance(result, np.ndarray):
+                result = result.result()
+                if isinstance(result, str):
+                    try:
+                        result = np.load(result, mmap_mode="r")
+                    except (OSError, ValueError):
+                        # Evicted between the worker's store and this read; render it here
+                        result = render_page(path, index, dpi)
+            yield RenderedPage(index, dpi, _readonly(result))
+    finally:
+        # A consumer that stops early doesn't wait for pages it will never read
+        if pool:
+            pool.shutdown(wait=True, cancel_futures=True)
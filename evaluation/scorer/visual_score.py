@@ -0,0 +1,81 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from evaluation.analysis.color_analyzer import ColorAnalyzer
+from evaluation.analysis.font_analyzer import FontAnalyzer
+from evaluation.analysis.layout_detector import LayoutAnalyzer
+from evaluation.analysis.spacing_analyzer import SpacingAnalyzer
+from evaluation.analysis.text_overlay import TextOverlayAnalyzer
+from evaluation.preprocessing.page_raster import PageRaster
+from evaluation.preprocessing.pdf_to_image import PageCache, dpi_for, rasterize
+from scoring.weights import VISUAL_WEIGHTS
+
+# Analyzers by name. Each has a ``name``, a ``needs_raster`` flag and a ``score(results)``
+# turning its per-page results into [0, 1]. Raster analyzers implement ``analyze(page)``
+# on a shared PageRaster; the others implement ``analyze_document(path, pages)`` and read
+# the PDF themselves, returning one result per page.
+ANALYZERS = {
+    "color": ColorAnalyzer,
+    "font": FontAnalyzer,
+    "layout": LayoutAnalyzer,
+    "spacing": SpacingAnalyzer,
+    "text_overlay": TextOverlayAnalyzer,
+}
+
+
+class VisualScorer:
+    """Scores the visual presentation of a PDF resume with a set of page analyzers.
+
+    Each page is rendered and decoded once, at the lowest DPI every selected analyzer
+    accepts, and wrapped in a PageRaster whose read-only image and shared derivatives
+    (grayscale, ink mask, thumbnail) are handed to all raster analyzers. Those run
+    concurrently on the page while the rasterizer renders the next pages ahead; analyzers
+    that don't need pixels run alongside on the text layer, and when no selected analyzer
+    needs pixels nothing is rendered at all.
+    """
+
+    def __init__(self, analyzers: Optional[Iterable[str]] = None, weights: Optional[Dict[str, float]] = None,
+                 workers: Optional[int] = None, cache: Union[bool, PageCache] = True):
+        names = list(analyzers or ANALYZERS)
+        unknown = [name for name in names if name not in ANALYZERS]
+        if unknown:
+            raise ValueError(f"Unknown visual analyzers: {', '.join(unknown)}")
+        self.analyzers = [ANALYZERS[name]() for name in names]
+        self.weights = dict(weights or VISUAL_WEIGHTS)
+        self.workers = workers
+        self.cache = cache
+        self.stats = Counter()
+
+    def analyze(self, path: Union[str, Path], pages: Optional[Sequence[int]] = None) -> Dict[str, List[Dict]]:
+        """Per-page results of every analyzer, keyed by analyzer name."""
+        raster = [analyzer for analyzer in self.analyzers if analyzer.needs_raster]
+        text = [analyzer for analyzer in self.analyzers if not analyzer.needs_raster]
+        results = {analyzer.name: [] for analyzer in self.analyzers}
+
+        with ThreadPoolExecutor(max_workers=len(self.analyzers) or 1) as threads:
+            documents = {analyzer.name: threads.submit(analyzer.analyze_document, path, pages) for analyzer in text}
+            if raster:
+                dpi = dpi_for(analyzer.name for analyzer in raster)
+                for rendered in rasterize(path, dpi=dpi, pages=pages, workers=self.workers, cache=self.cache):
+                    page = PageRaster.from_rendered(rendered)
+                    futures = [(analyzer.name, threads.submit(analyzer.analyze, page)) for analyzer in raster]
+                    for name, future in futures:
+                        results[name].append(future.result())
+                    self.stats["pages_rendered"] += 1
+            for name, future in documents.items():
+                results[name] = future.result()
+        return results
+
+    def score(self, path: Union[str, Path], pages: Optional[Sequence[int]] = None) -> Dict:
+        """Weighted visual score in [0, 1], each analyzer's score, and the per-page results."""
+        results = self.analyze(path, pages)
+        components = {analyzer.name: analyzer.score(results[analyzer.name]) for analyzer in self.analyzers}
+        total_weight = sum(self.weights.get(name, 0.0) for name in components)
+        score = sum(self.weights.get(name, 0.0) * value for name, value in components.items())
+        return {
+            "score": round(score / total_weight, 6) if total_weight else 0.0,
+            "components": components,
+            "pages": results,
+        }
@@ -0,0 +1,200 @@
+import argparse
+import glob
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from ai.document import ParsedDocument
+from ai.ingestion import SUFFIXES, read_text
+from ai.job_profile import JobProfile
+from ai.pipeline import analyze_document, init_worker, score_documents
+from scoring.scorer import RankedCandidate, TopK
+
+
+def _read(path: str) -> str:
+    # Text, PDF or DOCX; PDF/DOCX come from their text layer and are cached by content hash
+    return read_text(path)
+
+
+def expand_inputs(patterns: Sequence[str], suffixes: Iterable[str] = tuple(SUFFIXES)) -> List[str]:
+    """Resolve files, directories (every file with one of ``suffixes`` inside) and glob patterns, in order, once each."""
+    suffixes = {suffix.lower() for suffix in suffixes}
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = sorted(str(p) for p in Path(pattern).rglob("*") if p.suffix.lower() in suffixes)
+        elif glob.has_magic(pattern):
+            found = sorted(glob.glob(pattern, recursive=True))
+        else:
+            found = [pattern]
+        found = [p for p in found if os.path.isfile(p)]
+        if not found:
+            print(f"⚠️ No files match {pattern}", file=sys.stderr)
+        paths.extend(found)
+    return list(dict.fromkeys(paths))
+
+
+def _documents(paths: List[str]) -> Iterator[Tuple[str, Optional[ParsedDocument], Optional[str]]]:
+    texts, readable = [], []
+    for path in paths:
+        try:
+            texts.append(_read(path))
+            readable.append(path)
+        except (OSError, ValueError, ImportError) as e:
+            # ImportError: a PDF without PyMuPDF installed fails that file, not the whole run
+            yield path, None, str(e)
+    # One nlp.pipe call per chunk; every extractor then shares each resume's single parse
+    for path, document in zip(readable, ParsedDocument.pipe(texts, batch_size=len(texts) or 1)):
+        yield path, document, None
+
+
+def _analyze_chunk(paths: List[str]) -> List[Dict]:
+    results = []
+    for path, document, error in _documents(paths):
+        if error:
+            results.append({"resume": path, "error": error})
+            continue
+        results.append({"resume": path, **analyze_document(document)})
+    return results
+
+
+def _match_chunk(paths: List[str], floors: Optional[Dict[str, Optional[float]]] = None) -> List[Dict]:
+    results = []
+    scored = []
+    for path, document, error in _documents(paths):
+        if error:
+            results.append({"resume": path, "error": error})
+        else:
+            scored.append((path, document))
+    # Every resume of the chunk is extracted once and scored against all jobs
+    results.extend(score_documents(scored, floors))
+    return results
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_chunks(fn: Callable[..., List[Dict]], paths: Iterable[str], workers: int, chunk_size: int,
+               profiles: Optional[List[Tuple[str, JobProfile]]] = None,
+               extra_args: Callable[[], tuple] = tuple) -> Iterator[Dict]:
+    """Yield ``fn``'s results for every chunk of ``paths`` in input order, as chunks finish.
+
+    At most ``2 * workers`` chunks are in flight, so results stream out while the rest of
+    the input is still being read and memory doesn't grow with the number of files.
+    ``extra_args`` is called as each chunk is submitted and its result passed to ``fn``
+    after the chunk, so a task sees state the caller built from the results so far.
+    """
+    if workers <= 1:
+        init_worker(profiles)
+        for chunk in _chunks(paths, chunk_size):
+            yield from fn(chunk, *extra_args())
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(profiles,)) as pool:
+        pending = deque()
+        for chunk in _chunks(paths, chunk_size):
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(fn, chunk, *extra_args()))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _write(out: TextIO, record: Dict) -> None:
+    out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    out.flush()
+
+
+def _open_output(path: str) -> TextIO:
+    return sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+
+
+def analyze(args: argparse.Namespace) -> int:
+    paths = expand_inputs(args.resumes)
+    if not paths:
+        print("❌ No resume files found.", file=sys.stderr)
+        return 1
+
+    out = _open_output(args.output)
+    try:
+        for record in run_chunks(_analyze_chunk, paths, args.workers, args.chunk_size):
+            _write(out, record)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def match(args: argparse.Namespace) -> int:
+    resumes = expand_inputs(args.resumes)
+    jobs = expand_inputs(args.jobs)
+    if not resumes or not jobs:
+        print("❌ Need at least one resume and one job file.", file=sys.stderr)
+        return 1
+
+    # Each job is extracted once, in the parent, and shipped to the workers as a profile
+    profiles = [(job, JobProfile.from_text(_read(job))) for job in jobs]
+
+    out = _open_output(args.output)
+    try:
+        if not args.top:
+            for record in run_chunks(_match_chunk, resumes, args.workers, args.chunk_size, profiles):
+                _write(out, record)
+            return 0
+
+        # Keep only the k best per job; memory stays O(jobs * k). Each chunk is sent with the
+        # current floor of every job's top-k, so workers stop scoring resumes that can't get in
+        tops = {job: TopK(args.top) for job in jobs}
+
+        def floors() -> tuple:
+            return {job: top.floor for job, top in tops.items()},
+
+        records = run_chunks(_match_chunk, resumes, args.workers, args.chunk_size, profiles, floors)
+        for seq, record in enumerate(records):
+            if "error" in record:
+                _write(out, record)
+                continue
+            tops[record["job"]].push(seq, RankedCandidate(record["resume"], record["score"], record["components"]))
+        for job, top in tops.items():
+            for rank, candidate in enumerate(top.results(), start=1):
+                _write(out, {"job": job, "rank": rank, "resume": candidate.resume_id,
+                             "score": candidate.score, "components": candidate.components})
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch resume analysis and job matching, one JSON line per result.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("resumes", nargs="+", help="resume files, directories or glob patterns")
+    common.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    common.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    common.add_argument("--chunk-size", type=int, default=16, help="resumes per task, parsed in one nlp.pipe call")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    analyze_parser = commands.add_parser("analyze", parents=[common], help="extract skills, education and experience")
+    analyze_parser.set_defaults(run=analyze)
+    match_parser = commands.add_parser("match", parents=[common], help="score every resume against every job")
+    match_parser.add_argument("-j", "--jobs", nargs="+", required=True, help="job files, directories or glob patterns")
+    match_parser.add_argument("--top", type=int, default=0, help="only write the k best resumes per job")
+    match_parser.set_defaults(run=match)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
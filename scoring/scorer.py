@@ -0,0 +1,202 @@
+import heapq
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ai.document import ParsedDocument
+from ai.extractors.resume.education_extractor import ResumeEducationExtractor
+from ai.extractors.resume.skill_extractor import ResumeSkillExtractor
+from ai.job_profile import JobProfile
+from ai.matchers.education_matcher import EducationMatcher
+from ai.matchers.experiance_matcher import ExperienceMatcher
+from ai.matchers.skill_matcher import SkillMatcher
+from ai.resume_profile import ResumeProfile
+from scoring.weights import MATCH_WEIGHTS
+
+Resume = Union[str, Tuple[Any, str]]
+
+
+@dataclass
+class RankedCandidate:
+    resume_id: Any
+    score: float
+    components: Dict[str, float]
+
+
+class TopK:
+    """Bounded min-heap of the k best candidates seen so far; ties go to the earlier one."""
+
+    def __init__(self, k: int, floor: Optional[float] = None):
+        self.k = k
+        self._floor = floor
+        self._heap: List[Tuple[float, int, RankedCandidate]] = []
+
+    @property
+    def floor(self) -> Optional[float]:
+        # A candidate must score above this to get in
+        if len(self._heap) >= self.k:
+            return self._heap[0][0] if self._floor is None else max(self._floor, self._heap[0][0])
+        return self._floor
+
+    def push(self, seq: int, candidate: RankedCandidate) -> None:
+        entry = (candidate.score, -seq, candidate)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def entries(self) -> List[Tuple[int, RankedCandidate]]:
+        return [(-neg_seq, candidate) for _, neg_seq, candidate in self._heap]
+
+    def merge(self, entries: Iterable[Tuple[int, RankedCandidate]]) -> None:
+        for seq, candidate in entries:
+            self.push(seq, candidate)
+
+    def results(self) -> List[RankedCandidate]:
+        return [candidate for _, _, candidate in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+class CandidateScorer:
+    """Scores resumes against one JobProfile as a weighted sum of matcher scores in [0, 1].
+
+    Stages run cheapest first on a single shared parse. After each stage the candidate's
+    best possible total is its score so far plus the full weight of the stages left; once
+    that can't beat the current top-k floor, the remaining stages are skipped. Pass a
+    ResumeProfile to score one resume against several jobs on one set of extractions.
+    """
+
+    def __init__(self, job: Union[str, JobProfile], weights: Optional[Dict[str, float]] = None):
+        self.weights = dict(weights or MATCH_WEIGHTS)
+        self.skill_extractor = ResumeSkillExtractor()
+        self.skill_matcher = SkillMatcher()
+        self.education_extractor = ResumeEducationExtractor()
+        self.education_matcher = EducationMatcher()
+        self.experience_matcher = ExperienceMatcher()
+        self.job = job if isinstance(job, JobProfile) else self.experience_matcher.profile(job)
+        self.stages: List[Tuple[str, Callable[[ResumeProfile], float]]] = [
+            ("skills", self._skills_score),
+            ("education", self._education_score),
+            ("experience", self._experience_score),
+        ]
+        self.stats = Counter()
+
+    def profile(self, resume: Union[str, ParsedDocument, ResumeProfile]) -> ResumeProfile:
+        if isinstance(resume, ResumeProfile):
+            return resume
+        return ResumeProfile(resume, self.skill_extractor, self.education_extractor,
+                             self.experience_matcher.resume_extractor)
+
+    def _skills_score(self, resume: ResumeProfile) -> float:
+        if not self.job.skills:
+            return 1.0
+        result = self.skill_matcher.match(resume.skills, self.job)
+        return result["match_percentage"] / 100.0
+
+    def _education_score(self, resume: ResumeProfile) -> float:
+        result = self.education_matcher.match(resume.education, self.job)
+        return result["education_match_percentage"] / 100.0
+
+    def _experience_score(self, resume: ResumeProfile) -> float:
+        requirements = self.job.experience_requirements
+        if not requirements:
+            return 1.0
+        comparisons = self.experience_matcher.match_experiences(self.job, resume)
+        return sum(c.overall_match_score for c in comparisons) / len(requirements)
+
+    def score(self, resume: Union[str, ParsedDocument, ResumeProfile],
+              floor: Optional[float] = None) -> Optional[Tuple[float, Dict[str, float]]]:
+        """Return (score, per-stage scores), or None once the candidate can't beat ``floor``."""
+        profile = self.profile(resume)
+        total = 0.0
+        remaining = sum(self.weights.get(name, 0.0) for name, _ in self.stages)
+        components = {}
+        for name, stage in self.stages:
+            weight = self.weights.get(name, 0.0)
+            remaining -= weight
+            if weight:
+                # Pruning bounds what's left by the stages' full weight, so no score may exceed 1
+                components[name] = min(max(stage(profile), 0.0), 1.0)
+                total += weight * components[name]
+            if floor is not None and round(total + remaining, 6) < floor:
+                self.stats["pruned"] += 1
+                self.stats[f"pruned_after_{name}"] += 1
+                return None
+        self.stats["scored"] += 1
+        return round(total, 6), components
+
+    def rank_chunk(self, chunk: List[Tuple[int, Any, str]], top: TopK) -> TopK:
+        for seq, resume_id, text in chunk:
+            scored = self.score(text, top.floor)
+            if scored is not None:
+                top.push(seq, RankedCandidate(resume_id, scored[0], scored[1]))
+        return top
+
+
+# One scorer per worker process, built by the pool initializer
+_worker_scorer: Optional[CandidateScorer] = None
+
+
+def _init_worker(job: JobProfile, weights: Dict[str, float]) -> None:
+    global _worker_scorer
+    _worker_scorer = CandidateScorer(job, weights)
+
+
+def _rank_chunk(chunk: List[Tuple[int, Any, str]], k: int, floor: Optional[float]):
+    top = _worker_scorer.rank_chunk(chunk, TopK(k, floor))
+    stats = dict(_worker_scorer.stats)
+    _worker_scorer.stats.clear()
+    return top.entries(), stats
+
+
+def _chunks(resumes: Iterable[Resume], size: int) -> Iterator[List[Tuple[int, Any, str]]]:
+    numbered = (
+        (seq, *resume) if isinstance(resume, tuple) else (seq, seq, resume)
+        for seq, resume in enumerate(resumes)
+    )
+    while True:
+        chunk = list(islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def rank(job: Union[str, JobProfile], resumes: Iterable[Resume], k: int = 10,
+         workers: int = 1, chunk_size: int = 32, weights: Optional[Dict[str, float]] = None,
+         stats: Optional[Counter] = None) -> List[RankedCandidate]:
+    """Return the k best resumes for a job, best first.
+
+    ``resumes`` is any iterable of texts or ``(resume_id, text)`` pairs and is consumed
+    lazily, so memory stays O(k) plus the chunks in flight. With ``workers > 1`` chunks
+    are scored in worker processes, each returning only its local top-k along with the
+    global floor it was given. Per-stage scored/pruned counts are added to ``stats``.
+    """
+    weights = dict(weights or MATCH_WEIGHTS)
+    stats = stats if stats is not None else Counter()
+    top = TopK(k)
+
+    if workers <= 1:
+        scorer = CandidateScorer(job, weights)
+        for chunk in _chunks(resumes, chunk_size):
+            scorer.rank_chunk(chunk, top)
+        stats.update(scorer.stats)
+        return top.results()
+
+    job = job if isinstance(job, JobProfile) else JobProfile.from_text(job)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(job, weights)) as pool:
+        pending = set()
+        for chunk in _chunks(resumes, chunk_size):
+            # Keep a bounded window of chunks in flight so huge pools are never materialized
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entries, chunk_stats = future.result()
+                    top.merge(entries)
+                    stats.update(chunk_stats)
+            pending.add(pool.submit(_rank_chunk, chunk, k, top.floor))
+        for future in pending:
+            entries, chunk_stats = future.result()
+            top.merge(entries)
+            stats.update(chunk_stats)
+    return top.results()
@@ -0,0 +1,163 @@
+import os
+import pickle
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ai.job_profile import JobProfile
+from ai.taxonomy import registry
+
+FORMAT_VERSION = 2
+
+# Set bits per byte value, for numpy builds without np.bitwise_count
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+Skills = Iterable[Union[str, Dict]]
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits)
+    return _POPCOUNT[bits]
+
+
+class SkillIndex:
+    """Every stored resume as a packed bitset over the taxonomy's skill ids.
+
+    One row of ``ceil(n_skills / 8)`` bytes per resume plus an inverted index from skill
+    column to rows, each posting list a compact ``array('I')``: 4 bytes a row, where a
+    list of ints costs 8 for the pointer plus the int object. Reads copy a list out into
+    numpy, so the index can keep growing while earlier results are held. ``coverage``
+    scores a job against the whole pool at once, either by counting postings (when the
+    job's skills are rare) or by a popcount over only the byte columns the job touches. Overlap is on skill ids only, so it is a cheap lower bound of
+    what SkillMatcher finds; use it to decide who is worth scoring, not as the score.
+    """
+
+    def __init__(self, skill_file: str = "data/skills.json", capacity: int = 1024):
+        self.skill_file = skill_file
+        self.skill_ids = sorted({skill["id"] for skill in registry.records(skill_file)})
+        self.columns = {skill_id: i for i, skill_id in enumerate(self.skill_ids)}
+        self.row_bytes = (len(self.skill_ids) + 7) // 8
+        self.resume_ids: List[Any] = []
+        self._bits = np.zeros((max(capacity, 1), self.row_bytes), dtype=np.uint8)
+        self._postings: List[array] = [array("I") for _ in self.skill_ids]
+
+    def __len__(self) -> int:
+        return len(self.resume_ids)
+
+    @property
+    def bits(self) -> np.ndarray:
+        return self._bits[:len(self.resume_ids)]
+
+    def _columns(self, skills: Skills) -> np.ndarray:
+        # Accepts extractor output (dicts with an "id") or bare skill ids; unknown ids are ignored
+        found = set()
+        for skill in skills:
+            skill_id = skill.get("id") if isinstance(skill, dict) else skill
+            column = self.columns.get(skill_id)
+            if column is not None:
+                found.add(column)
+        return np.fromiter(sorted(found), dtype=np.int64, count=len(found))
+
+    def bitset(self, skills: Skills) -> np.ndarray:
+        row = np.zeros(len(self.skill_ids), dtype=bool)
+        row[self._columns(skills)] = True
+        return np.packbits(row, bitorder="little")
+
+    def add(self, resume_id: Any, skills: Skills) -> int:
+        row = len(self.resume_ids)
+        if row == len(self._bits):
+            self._bits = np.concatenate([self._bits, np.zeros_like(self._bits)])
+        columns = self._columns(skills)
+        unpacked = np.zeros(len(self.skill_ids), dtype=bool)
+        unpacked[columns] = True
+        self._bits[row] = np.packbits(unpacked, bitorder="little")
+        for column in columns.tolist():
+            self._postings[column].append(row)
+        self.resume_ids.append(resume_id)
+        return row
+
+    def add_many(self, resumes: Iterable[Tuple[Any, Skills]]) -> None:
+        for resume_id, skills in resumes:
+            self.add(resume_id, skills)
+
+    def _rows(self, column: int) -> np.ndarray:
+        # A copy: a live view would pin the array's buffer and make the next add() raise BufferError
+        return np.frombuffer(self._postings[column], dtype=np.uintc).copy()
+
+    def postings(self, skill_id: str) -> np.ndarray:
+        column = self.columns.get(skill_id)
+        if column is None:
+            return np.zeros(0, dtype=np.int64)
+        return self._rows(column).astype(np.int64)
+
+    def overlap(self, skills: Skills) -> Tuple[np.ndarray, int]:
+        """Return (number of the given skills each stored resume has, number of known skills)."""
+        columns = self._columns(skills)
+        n = len(self.resume_ids)
+        if not len(columns) or not n:
+            return np.zeros(n, dtype=np.int64), len(columns)
+
+        # Rare skills: counting postings touches only the resumes that have them
+        postings = [self._rows(c) for c in columns.tolist()]
+        if sum(len(p) for p in postings) * 8 < n:
+            return np.bincount(np.concatenate(postings), minlength=n), len(columns)
+
+        # Otherwise popcount the AND of each row with the job mask, only over touched bytes
+        mask = self.bitset(self.skill_ids[c] for c in columns.tolist())
+        touched = np.flatnonzero(mask)
+        counts = _popcount(self.bits[:, touched] & mask[touched]).sum(axis=1, dtype=np.int64)
+        return counts, len(columns)
+
+    def coverage(self, skills: Skills) -> np.ndarray:
+        counts, total = self.overlap(skills)
+        if not total:
+            return np.ones(len(self.resume_ids), dtype=np.float64)
+        return counts / total
+
+    def screen(self, job: Union[JobProfile, Skills], min_coverage: float = 0.5,
+               limit: Optional[int] = None) -> List[Tuple[Any, float]]:
+        """Return (resume_id, coverage) for stored resumes at or above ``min_coverage``, best first."""
+        skills = job.skills if isinstance(job, JobProfile) else job
+        coverage = self.coverage(skills)
+        rows = np.flatnonzero(coverage >= min_coverage)
+        # Stable sort keeps insertion order among equal coverage
+        rows = rows[np.argsort(-coverage[rows], kind="stable")]
+        if limit is not None:
+            rows = rows[:limit]
+        return [(self.resume_ids[r], float(coverage[r])) for r in rows.tolist()]
+
+    def save(self, path: str) -> None:
+        # Postings are stored CSR-style: every list back to back, plus where each one starts
+        lengths = np.fromiter((len(p) for p in self._postings), dtype=np.int64, count=len(self._postings))
+        rows = [self._rows(column) for column in range(len(self._postings))]
+        state = {
+            "format": FORMAT_VERSION,
+            "skill_file": self.skill_file,
+            "skill_ids": self.skill_ids,
+            "resume_ids": self.resume_ids,
+            "bits": self.bits.copy(),
+            "posting_offsets": np.concatenate(([0], np.cumsum(lengths))),
+            "posting_rows": np.concatenate(rows).astype(np.uint32) if rows else np.zeros(0, dtype=np.uint32),
+        }
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, skill_file: str = "data/skills.json") -> "SkillIndex":
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{path} was written by an incompatible SkillIndex version")
+        index = cls(skill_file, capacity=len(state["resume_ids"]))
+        if index.skill_ids != state["skill_ids"]:
+            # Columns would no longer line up with the taxonomy; the pool must be re-indexed
+            raise ValueError(f"{path} was built from a different skill taxonomy")
+        index.resume_ids = list(state["resume_ids"])
+        index._bits[:len(index.resume_ids)] = state["bits"]
+        offsets, rows = state["posting_offsets"], state["posting_rows"].astype(np.uintc)
+        index._postings = [array("I", rows[start:end].tobytes()) for start, end in zip(offsets[:-1], offsets[1:])]
+        return index
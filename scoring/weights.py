@@ -0,0 +1,15 @@
+# Share of a candidate's overall score contributed by each matcher; the weights sum to 1
+MATCH_WEIGHTS = {
+    "skills": 0.5,
+    "experience": 0.3,
+    "education": 0.2,
+}
+
+# Share of the visual score contributed by each analyzer; renormalized over the analyzers run
+VISUAL_WEIGHTS = {
+    "layout": 0.25,
+    "font": 0.25,
+    "spacing": 0.2,
+    "color": 0.15,
+    "text_overlay": 0.15,
+}
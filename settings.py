@@ -0,0 +1,21 @@
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "data"
+
+# Derived artifacts (compiled taxonomies, caches) live here and can be rebuilt at any time
+CACHE_DIR = Path(os.environ.get("RESUME_ANALYZER_CACHE_DIR", BASE_DIR / ".cache"))
+
+SPACY_MODEL = os.environ.get("RESUME_ANALYZER_SPACY_MODEL", "en_core_web_sm")
+
+# Extraction cache: entries kept in memory per process, and the size cap of the SQLite tier
+EXTRACTION_CACHE_ENTRIES = int(os.environ.get("RESUME_ANALYZER_CACHE_ENTRIES", 1024))
+EXTRACTION_CACHE_MAX_BYTES = int(os.environ.get("RESUME_ANALYZER_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Rendered-page cache: size cap of the .npy files kept under CACHE_DIR/pages
+PAGE_CACHE_MAX_BYTES = int(os.environ.get("RESUME_ANALYZER_PAGE_CACHE_MAX_BYTES", 1024 * 1024 * 1024))
+
+# Uploads: hard size cap, and how much of one upload is buffered in memory before spilling to disk
+UPLOAD_MAX_BYTES = int(os.environ.get("RESUME_ANALYZER_UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+UPLOAD_SPOOL_BYTES = int(os.environ.get("RESUME_ANALYZER_UPLOAD_SPOOL_BYTES", 1024 * 1024))
@@ -0,0 +1,96 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Caches (extractions, rendered pages) go to a throwaway directory, never the working tree
+os.environ.setdefault("RESUME_ANALYZER_CACHE_DIR", tempfile.mkdtemp(prefix="resume-analyzer-tests-"))
+
+RESUMES = sorted((ROOT / "inputs" / "resumes").glob("*.txt"))
+JOBS = sorted((ROOT / "inputs" / "jobs").glob("*.txt"))
+
+
+@pytest.fixture(autouse=True)
+def repo_cwd(monkeypatch):
+    # Extractors find their taxonomies as data/*.json relative to the working directory
+    monkeypatch.chdir(ROOT)
+
+
+@pytest.fixture(scope="session")
+def nlp():
+    """The spaCy pipeline; tests that parse text are skipped where the model isn't installed."""
+    from ai.nlp import get_nlp
+
+    try:
+        nlp = get_nlp()
+        nlp("warm up")
+        return nlp
+    except OSError as e:
+        pytest.skip(f"spaCy model unavailable: {e}")
+
+
+@pytest.fixture(scope="session")
+def pymupdf():
+    return pytest.importorskip("pymupdf")
+
+
+def two_column_pdf(pymupdf, path, pages=1):
+    """Letter pages with four blocks in each of two columns: a bold heading over five body lines."""
+    document = pymupdf.open()
+    for _ in range(pages):
+        page = document.new_page(width=612, height=792)
+        for x in (54, 330):
+            y = 72
+            for _ in range(4):
+                page.insert_text((x, y), "Section heading", fontsize=13, fontname="hebo")
+                y += 20
+                for i in range(5):
+                    page.insert_text((x, y), f"Column text line {i} of this block", fontsize=10)
+                    y += 14
+                y += 24
+    document.save(path)
+    return path
+
+
+def banded_pdf(pymupdf, path):
+    """A one-column resume under a full-bleed dark header band with white text on it."""
+    band = (0.1, 0.2, 0.45)
+    document = pymupdf.open()
+    page = document.new_page(width=612, height=792)
+    page.draw_rect(pymupdf.Rect(0, 0, 612, 110), color=band, fill=band)
+    page.insert_text((54, 60), "JANE DOE", fontsize=26, color=(1, 1, 1), fontname="hebo")
+    page.insert_text((54, 88), "Software Engineer  jane@example.com", fontsize=11, color=(1, 1, 1))
+    y = 150
+    for section in ("Experience", "Education", "Skills"):
+        page.insert_text((54, y), section, fontsize=14, fontname="hebo")
+        y += 22
+        for i in range(6):
+            page.insert_text((54, y), f"Built and maintained service number {i} for the data platform team.",
+                             fontsize=10.5)
+            y += 15
+        y += 18
+    document.save(path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def banded(pymupdf, tmp_path_factory):
+    """VisualScorer.score of banded_pdf, with every analyzer."""
+    from evaluation.scorer.visual_score import VisualScorer
+
+    path = banded_pdf(pymupdf, tmp_path_factory.mktemp("visual") / "banded.pdf")
+    return VisualScorer(cache=False, workers=1).score(path)
+
+
+@pytest.fixture(scope="session")
+def columns(pymupdf, tmp_path_factory):
+    """VisualScorer.score of a one-page two_column_pdf, with every analyzer."""
+    from evaluation.scorer.visual_score import VisualScorer
+
+    path = two_column_pdf(pymupdf, tmp_path_factory.mktemp("visual") / "columns.pdf")
+    return VisualScorer(cache=False, workers=1).score(path)
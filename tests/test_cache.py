@@ -0,0 +1,181 @@
+import pickle
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+import ai.cache
+from ai.cache import CachedExtractor, ExtractionCache
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ai.cache, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "extractions.sqlite"
+
+
+def _rows(path):
+    with sqlite3.connect(str(path)) as conn:
+        return dict(conn.execute("SELECT key, accessed FROM extractions"))
+
+
+class CountingExtractor:
+    def __init__(self, threshold=80):
+        self.threshold = threshold
+        self.calls = []
+
+    def extract(self, text):
+        self.calls.append(text)
+        return {"skills": sorted(set(text.split()))}
+
+
+def test_memory_hit_returns_a_copy(path):
+    cache = ExtractionCache(path)
+    cache.put("k", {"skills": ["python"]})
+    first = cache.get("k")
+    first["skills"].append("mutated")
+    assert cache.get("k") == {"skills": ["python"]}
+    assert cache.metrics["memory_hits"] == 2
+
+
+def test_miss_returns_the_default(path):
+    cache = ExtractionCache(path)
+    marker = object()
+    assert cache.get("absent") is None
+    assert cache.get("absent", marker) is marker
+    assert cache.metrics["misses"] == 2
+
+
+def test_memory_tier_is_lru_and_falls_back_to_disk(path):
+    cache = ExtractionCache(path, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # b is now the least recently used
+    cache.put("c", 3)
+    assert cache.metrics["memory_evictions"] == 1
+    assert cache.get("b") == 2
+    assert cache.metrics["disk_hits"] == 1
+    # The disk hit was promoted back into memory
+    assert cache.get("b") == 2
+    assert cache.metrics["disk_hits"] == 1
+
+
+def test_disk_tier_is_shared_between_instances(path):
+    ExtractionCache(path).put("k", [1, 2, 3])
+    other = ExtractionCache(path)
+    value = other.get("k")
+    assert value == [1, 2, 3]
+    value.append(4)
+    assert other.get("k") == [1, 2, 3]
+
+
+def test_disk_tier_evicts_least_recently_used(path, clock, monkeypatch):
+    monkeypatch.setattr(ai.cache, "RECENCY_RESOLUTION", 0.0)
+    blob = "x" * 1000
+    size = len(pickle.dumps(blob, protocol=pickle.HIGHEST_PROTOCOL))
+    cache = ExtractionCache(path, max_entries=0, max_bytes=int(3.5 * size))
+    for key in "abc":
+        clock.now += 1
+        cache.put(key, blob)
+    clock.now += 1
+    assert cache.get("a") == blob  # a read refreshes a, so b is now the oldest
+    clock.now += 1
+    cache.put("d", blob)
+    assert set(_rows(path)) == {"a", "c", "d"}
+    assert cache.metrics["disk_evictions"] == 1
+
+
+def test_recency_writes_are_batched(path, clock, monkeypatch):
+    monkeypatch.setattr(ai.cache, "RECENCY_RESOLUTION", 10.0)
+    cache = ExtractionCache(path, max_entries=0)
+    cache.put("k", "value")
+    stored = _rows(path)["k"]
+
+    clock.now += 5
+    cache.get("k")
+    cache.flush()
+    assert _rows(path)["k"] == stored  # within the resolution, nothing to write
+
+    clock.now += 10
+    for _ in range(3):
+        assert cache.get("k") == "value"
+    assert _rows(path)["k"] == stored  # pending until a flush
+    cache.flush()
+    assert _rows(path)["k"] == clock.now
+
+
+def test_recency_writes_flush_at_the_batch_size(path, clock, monkeypatch):
+    monkeypatch.setattr(ai.cache, "RECENCY_RESOLUTION", 0.0)
+    monkeypatch.setattr(ai.cache, "TOUCH_BATCH", 3)
+    cache = ExtractionCache(path, max_entries=0)
+    for key in "abc":
+        cache.put(key, key)
+    clock.now += 1
+    cache.get("a")
+    cache.get("b")
+    assert set(_rows(path).values()) == {clock.now - 1}
+    cache.get("c")
+    assert set(_rows(path).values()) == {clock.now}
+
+
+def test_corrupt_rows_are_misses(path):
+    cache = ExtractionCache(path, max_entries=0)
+    cache.put("k", "value")
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("UPDATE extractions SET value = ? WHERE key = 'k'", (b"not a pickle",))
+    assert cache.get("k", "default") == "default"
+    assert cache.metrics["misses"] == 1
+
+
+def test_unwritable_directory_keeps_the_memory_tier(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = ExtractionCache(blocker / "extractions.sqlite")
+    cache.put("k", "value")
+    assert cache.get("k") == "value"
+    assert cache.path is None
+
+
+def test_clear_empties_both_tiers(path):
+    cache = ExtractionCache(path)
+    cache.put("k", "value")
+    cache.clear()
+    assert cache.get("k") is None
+    assert _rows(path) == {}
+
+
+def test_cached_extractor_runs_once_per_text_and_setting(path):
+    cache = ExtractionCache(path)
+    extractor = CountingExtractor()
+    cached = CachedExtractor(extractor, cache)
+    assert cached.extract("python sql") == {"skills": ["python", "sql"]}
+    assert cached.extract("python sql") == {"skills": ["python", "sql"]}
+    assert extractor.calls == ["python sql"]
+
+    # A changed threshold is part of the key, so it misses rather than reusing the result
+    extractor.threshold = 90
+    cached.extract("python sql")
+    assert extractor.calls == ["python sql", "python sql"]
+
+
+def test_cached_extractor_batches_only_the_misses(path):
+    extractor = CountingExtractor()
+    cached = CachedExtractor(extractor, ExtractionCache(path))
+    cached.extract("b a")
+    results = list(cached.extract_many(["b a", "c", "d c", "c"], batch_size=3))
+    assert results == [{"skills": ["a", "b"]}, {"skills": ["c"]}, {"skills": ["c", "d"]}, {"skills": ["c"]}]
+    assert extractor.calls == ["b a", "c", "d c"]
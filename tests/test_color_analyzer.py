@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from evaluation.analysis.color_analyzer import ColorAnalyzer, contrast_ratio, relative_luminance
+from evaluation.preprocessing.page_raster import PageRaster
+
+
+def _page(*bands, size=(400, 300)):
+    """A white page with a full-width band of each (rows, rgb) given."""
+    image = np.full((*size, 3), 255, dtype=np.uint8)
+    for (top, bottom), color in bands:
+        image[top:bottom, 20:280] = color
+    return PageRaster(image, dpi=100)
+
+
+def test_luminance_and_contrast_follow_wcag():
+    assert relative_luminance(np.array([255, 255, 255])) == pytest.approx(1.0)
+    assert relative_luminance(np.array([0, 0, 0])) == pytest.approx(0.0)
+    assert contrast_ratio(np.array([0.0]), 1.0)[0] == pytest.approx(21.0)
+    assert contrast_ratio(np.array([1.0]), 1.0)[0] == pytest.approx(1.0)
+
+
+def test_palette_background_ink_and_accent():
+    result = ColorAnalyzer().analyze(_page(((50, 80), (0, 0, 0)), ((100, 140), (200, 30, 30))))
+    assert result["background"] == "#ffffff"
+    assert result["ink_color"] == "#000000" and result["ink_contrast"] == pytest.approx(21.0)
+    assert [entry["color"] for entry in result["palette"]] == ["#ffffff", "#c81e1e", "#000000"]
+    assert [entry["accent"] for entry in result["palette"]] == [False, True, False]
+    assert result["accent_share"] == pytest.approx(40 * 260 / (400 * 300))
+    assert result["hue_families"] == 1
+
+
+def test_a_blank_page_has_no_ink_and_scores_zero():
+    analyzer = ColorAnalyzer()
+    result = analyzer.analyze(_page())
+    assert result["ink_color"] is None and result["color_count"] == 1
+    assert analyzer.score([result]) == 0.0
+    assert analyzer.score([]) == 0.0
+
+
+def test_faint_ink_and_many_hues_score_lower():
+    analyzer = ColorAnalyzer()
+    crisp = analyzer.score([analyzer.analyze(_page(((50, 80), (0, 0, 0))))])
+    faint = analyzer.score([analyzer.analyze(_page(((50, 80), (190, 190, 190))))])
+    rainbow = analyzer.score([analyzer.analyze(_page(
+        ((50, 80), (0, 0, 0)), ((100, 130), (220, 20, 20)), ((150, 180), (20, 160, 20)),
+        ((200, 230), (20, 20, 220)), ((250, 280), (230, 200, 0)), ((300, 330), (200, 0, 200)),
+    ))])
+    assert crisp == 1.0
+    assert faint < crisp and rainbow < crisp
+
+
+def test_rendered_resumes(banded, columns):
+    page = banded["pages"]["color"][0]
+    assert page["background"] == "#ffffff"
+    assert page["ink_contrast"] > 15
+    assert page["accent_share"] > 0.05
+    assert columns["pages"]["color"][0]["accent_share"] == 0.0
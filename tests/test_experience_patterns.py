@@ -0,0 +1,73 @@
+import re
+
+import pytest
+
+from ai.experience_patterns import (
+    _TITLE_CHARS, _TITLE_SUFFIX, REQUIREMENT_KEYWORDS, YEARS_PATTERN, RequirementScan, find_requirement_title,
+)
+
+# The per-pattern searches the combined scanners replace, in priority order
+TITLE_PATTERNS = [
+    re.compile(r"(?:experience|expertise|proficiency)\s+(?:in|with|as)\s+(" + _TITLE_CHARS + ")", re.IGNORECASE),
+    re.compile(r"(?:role|position|job)\s+(?:of|as)\s+(" + _TITLE_CHARS + ")", re.IGNORECASE),
+    re.compile("(" + _TITLE_CHARS + _TITLE_SUFFIX + ")", re.IGNORECASE),
+]
+
+SENTENCES = [
+    "Minimum 5+ years of experience with Python; 3 yrs in AWS is a plus. Required.",
+    "At least 10 years as a Senior Data Engineer",
+    "Experience in distributed systems is essential",
+    "Nice to have: 2 years experience as Machine Learning Engineer",
+    "The role of Platform Architect requires proficiency with Kubernetes",
+    "Senior Backend Developer wanted, 4 year minimum",
+    "We are hiring. Bonus points for open source work.",
+    "",
+]
+
+
+def _first_title(text):
+    for pattern in TITLE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(1)
+    return None
+
+
+def test_scan_collects_years_and_keywords_with_offsets():
+    text = SENTENCES[0]
+    scan = RequirementScan(text)
+    assert [years for years, _, _ in scan.years] == [5, 3]
+    assert [text[start:end] for _, start, end in scan.years] == ["5+ years", "3 yrs"]
+    assert scan.min_years == 5
+    assert [text[start:end] for start, end in scan.keywords["required"]] == ["Minimum", "Required"]
+    assert [text[start:end] for start, end in scan.keywords["preferred"]] == ["plus"]
+    assert scan.has("experience") and scan.has("years")
+
+
+def test_scan_without_a_count():
+    scan = RequirementScan("Experience in distributed systems is essential")
+    assert scan.years == [] and scan.min_years is None
+    assert scan.has("required") and not scan.has("years")
+
+
+@pytest.mark.parametrize("text", SENTENCES)
+def test_scan_agrees_with_separate_searches(text):
+    scan = RequirementScan(text)
+    first = YEARS_PATTERN.search(text)
+    assert scan.min_years == (int(first.group(1)) if first else None)
+    lowered = text.lower()
+    for kind, words in REQUIREMENT_KEYWORDS.items():
+        assert scan.has(kind) == any(word in lowered for word in words), kind
+
+
+@pytest.mark.parametrize("text", SENTENCES)
+def test_title_matches_searching_the_patterns_in_order(text):
+    assert find_requirement_title(text) == _first_title(text)
+
+
+def test_title_priority():
+    # "experience in" beats a suffixed title that appears earlier in the sentence
+    assert find_requirement_title("Software Engineer with experience in machine learning") == "machine learning"
+    assert find_requirement_title("the role of Data Engineer") == "Data Engineer"
+    assert find_requirement_title("Senior Backend Developer wanted") == "Senior Backend Developer"
+    assert find_requirement_title("nothing to see here") is None
@@ -0,0 +1,73 @@
+import pytest
+
+from evaluation.analysis.font_analyzer import FontAnalyzer, font_family
+
+
+@pytest.mark.parametrize("name, family", [
+    ("ABCDEF+Calibri-Bold", "Calibri"),
+    ("TimesNewRomanPS-BoldItalicMT", "TimesNewRoman"),
+    ("Arial,Bold", "Arial"),
+    ("Helvetica", "Helvetica"),
+    ("Bold", "Bold"),
+])
+def test_font_family_strips_subset_and_style(name, family):
+    assert font_family(name) == family
+
+
+def _pdf(pymupdf, path, runs):
+    """One page with a line per (text, size, font name) run."""
+    document = pymupdf.open()
+    page = document.new_page(width=612, height=792)
+    y = 72
+    for text, size, font in runs:
+        page.insert_text((54, y), text, fontsize=size, fontname=font)
+        y += size * 1.6
+    document.save(path)
+    return path
+
+
+def test_counts_characters_by_family_size_and_emphasis(pymupdf, tmp_path):
+    path = _pdf(pymupdf, tmp_path / "fonts.pdf", [
+        ("Heading", 16, "hebo"),
+        ("Body text set in ten point", 10, "helv"),
+        ("Quoted aside", 10, "tiit"),
+    ])
+    [page] = FontAnalyzer().analyze_document(path)
+    assert page["chars"] == len("Heading") + len("Body text set in ten point") + len("Quoted aside")
+    assert page["sizes"] == {16.0: 7, 10.0: 38}
+    assert page["families"] == {"Helvetica": 33, "Times": 12}
+    assert page["bold_chars"] == 7 and page["italic_chars"] == 12
+
+
+def test_summary_and_score_over_pages(pymupdf, tmp_path):
+    body = [("Body text line for the resume", 10.5, "helv")] * 20
+    clean = _pdf(pymupdf, tmp_path / "clean.pdf", [("Jane Doe", 20, "hebo"), ("Experience", 14, "hebo")] + body)
+    noisy = _pdf(pymupdf, tmp_path / "noisy.pdf", [
+        (f"Line in size {size}", size, font)
+        for size, font in zip([7, 8, 9, 10, 11, 12, 13, 14] * 3, ["helv", "tiro", "cour", "tibo"] * 6)
+    ])
+    analyzer = FontAnalyzer()
+    clean_pages = analyzer.analyze_document(clean)
+    summary = FontAnalyzer.summarize(clean_pages)
+    assert summary["body_size"] == 10.5
+    assert summary["size_levels"] == [20.0, 14.0, 10.5]
+    assert summary["families"] == ["Helvetica"] and summary["body_consistency"] == 1.0
+    assert analyzer.score(clean_pages) > analyzer.score(analyzer.analyze_document(noisy))
+
+
+def test_empty_document_scores_zero(pymupdf, tmp_path):
+    document = pymupdf.open()
+    document.new_page()
+    document.save(tmp_path / "blank.pdf")
+    analyzer = FontAnalyzer()
+    pages = analyzer.analyze_document(tmp_path / "blank.pdf")
+    assert FontAnalyzer.summarize(pages) == {"chars": 0}
+    assert analyzer.score(pages) == 0.0
+
+
+def test_rendered_resume(banded):
+    summary = FontAnalyzer.summarize(banded["pages"]["font"])
+    assert summary["families"] == ["Helvetica"]
+    assert summary["body_size"] == 10.5
+    assert summary["size_levels"][0] == 14.0
+    assert summary["bold_share"] > 0
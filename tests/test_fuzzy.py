@@ -0,0 +1,58 @@
+import pytest
+from rapidfuzz import fuzz, process
+
+from ai.fuzzy import FuzzyResolver
+
+CHOICES = ["python", "javascript", "machine learning", "postgresql", "amazon web services", "react native"]
+STRATEGIES = [(fuzz.ratio, 90), (fuzz.token_sort_ratio, 80), (fuzz.partial_ratio, 75)]
+
+
+def _extract_one_in_turn(query, choices, strategies):
+    # What the resolver replaces: extractOne with each scorer until one clears its cutoff
+    if query in choices:
+        return query, 100.0
+    for scorer, cutoff in strategies:
+        found = process.extractOne(query, choices, scorer=scorer, score_cutoff=cutoff)
+        if found:
+            return found[0], found[1]
+    return None
+
+
+def test_exact_choices_resolve_without_scoring():
+    resolver = FuzzyResolver(CHOICES, [])
+    best, scores = resolver.resolve(["postgresql", "postgres"])
+    assert best.tolist() == [CHOICES.index("postgresql"), -1]
+    assert scores.tolist() == [100.0, 0.0]
+
+
+def test_queries_fall_through_to_later_strategies():
+    resolver = FuzzyResolver(CHOICES, STRATEGIES)
+    # Close spelling clears the first cutoff; reordered words only the second; a fragment only the third
+    matches = resolver.matches(["pythn", "learning machine", "amazon web", "cobol"])
+    assert [found and found[0] for found in matches] == ["python", "machine learning", "amazon web services", None]
+    assert matches[0][1] == pytest.approx(fuzz.ratio("pythn", "python"))
+    assert matches[1][1] == 100.0
+
+
+@pytest.mark.parametrize("query", [
+    "pythn", "javscript", "learning machine", "postgres sql", "aws", "react", "native react app", "ruby", "",
+])
+def test_matches_extract_one_in_turn(query):
+    resolver = FuzzyResolver(CHOICES, STRATEGIES)
+    found = resolver.matches([query])[0]
+    expected = _extract_one_in_turn(query, CHOICES, STRATEGIES)
+    if expected is None:
+        assert found is None
+    else:
+        assert found[0] == expected[0] and found[1] == pytest.approx(expected[1])
+
+
+def test_duplicate_choices_resolve_to_the_first():
+    resolver = FuzzyResolver(["go", "rust", "go"], [(fuzz.ratio, 50)])
+    assert resolver.resolve(["go"])[0].tolist() == [0]
+
+
+def test_no_choices_resolves_nothing():
+    resolver = FuzzyResolver([], STRATEGIES)
+    assert resolver.resolve_one("python") == (None, 0.0)
+    assert resolver.matches(["python", "java"]) == [None, None]
@@ -0,0 +1,97 @@
+import io
+import zipfile
+from xml.sax.saxutils import escape
+
+import pytest
+
+from ai.ingestion import DocumentError, detect_kind, iter_pages, read_text
+from tests.conftest import RESUMES
+
+_DOCUMENT = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>{}</w:body></w:document>'
+)
+
+
+def _lines(text):
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def make_docx(text):
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in text.splitlines()
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", _DOCUMENT.format(paragraphs))
+    return buffer.getvalue()
+
+
+def pdf_safe(text):
+    # Text inserted in the built-in PDF fonts is Latin-1; dashes and box-drawn rules become "-"
+    return "".join(c if ord(c) < 256 else "-" for c in text)
+
+
+def make_pdf(pymupdf, text, lines_per_page=50):
+    document = pymupdf.open()
+    lines = text.splitlines()
+    for start in range(0, len(lines), lines_per_page):
+        # Wide enough that no line of the sample resumes wraps or runs off the page
+        page = document.new_page(width=2400, height=792)
+        for i, line in enumerate(lines[start:start + lines_per_page]):
+            if line.strip():
+                page.insert_text((54, 54 + 13 * i), line, fontsize=9)
+    return document.tobytes()
+
+
+@pytest.mark.parametrize("resume", RESUMES, ids=lambda path: path.name)
+def test_docx_text_matches_txt(resume):
+    text = resume.read_text(encoding="utf-8")
+    assert _lines(read_text(make_docx(text), "docx", cache=None)) == _lines(text)
+
+
+@pytest.mark.parametrize("resume", RESUMES, ids=lambda path: path.name)
+def test_pdf_text_matches_txt(pymupdf, resume):
+    text = pdf_safe(resume.read_text(encoding="utf-8"))
+    assert _lines(read_text(make_pdf(pymupdf, text), "pdf", cache=None)) == _lines(text)
+
+
+def test_pdf_pages_come_one_at_a_time(pymupdf):
+    text = pdf_safe(RESUMES[0].read_text(encoding="utf-8"))
+    pages = list(iter_pages(make_pdf(pymupdf, text, lines_per_page=20), "pdf", cache=None))
+    assert len(pages) == -(-len(text.splitlines()) // 20)
+    assert _lines("\n".join(pages)) == _lines(text)
+
+
+def test_cached_read_replays_pages(tmp_path):
+    from ai.cache import ExtractionCache
+
+    cache = ExtractionCache(tmp_path / "cache.sqlite")
+    data = make_docx(RESUMES[0].read_text(encoding="utf-8"))
+    first = read_text(data, "docx", cache=cache)
+    assert read_text(data, "docx", cache=cache) == first
+    assert cache.metrics["memory_hits"] == 1
+
+
+def test_detect_kind_from_content(pymupdf):
+    assert detect_kind(make_docx("Skills\nPython")) == "docx"
+    assert detect_kind(make_pdf(pymupdf, "Skills\nPython")) == "pdf"
+    assert detect_kind(b"Skills\nPython") == "txt"
+    assert detect_kind(b"", filename="resume.PDF") == "pdf"
+
+
+def test_corrupt_documents_raise_document_error(pymupdf):
+    with pytest.raises(DocumentError):
+        read_text(b"PK\x03\x04 not really a zip", "docx", cache=None)
+    with pytest.raises(DocumentError):
+        read_text(b"%PDF-1.7 truncated", "pdf", cache=None)
+
+
+@pytest.mark.parametrize("resume", RESUMES, ids=lambda path: path.name)
+def test_docx_extracts_like_txt(nlp, resume):
+    from ai.extractors.resume.skill_extractor import ResumeSkillExtractor
+
+    text = resume.read_text(encoding="utf-8")
+    extractor = ResumeSkillExtractor()
+    assert extractor.extract(read_text(make_docx(text), "docx", cache=None)) == extractor.extract(text)
@@ -0,0 +1,42 @@
+from ai.extractors.job.education_extractor import JobEducationExtractor
+
+# Longer than the extractor's context window, so flags on either side of it don't leak across
+FILLER = " The team ships weekly and works closely with product, design and support staff. "
+
+
+def _extract(text):
+    return JobEducationExtractor().extract(text)
+
+
+def test_entry_shape_and_order_of_first_mention():
+    entries = _extract("Master's degree in Statistics." + FILLER + "Or a Bachelor's degree.")
+    assert [entry["degree"] for entry in entries] == ["Master's Degree", "Bachelor's Degree"]
+    assert set(entries[0]) == {"degree", "major", "required", "preferred", "degree_level"}
+    assert [entry["degree_level"] for entry in entries] == ["master", "bachelor"]
+
+
+def test_flags_come_from_every_occurrence():
+    text = "Bachelor's degree preferred." + FILLER + "A bachelor's degree is required."
+    [entry] = _extract(text)
+    assert entry["required"] and entry["preferred"]
+
+
+def test_flags_outside_the_window_do_not_count():
+    [entry] = _extract("Bachelor's degree." + FILLER + "Security clearance required.")
+    assert not entry["required"] and not entry["preferred"]
+
+
+def test_major_comes_from_the_first_occurrence_that_names_one():
+    [entry] = _extract("Bachelor's degree." + FILLER + "A bachelor's degree in Computer Science")
+    assert entry["major"] == "Computer Science"
+    [entry] = _extract("Bachelor's degree in Physics." + FILLER + "A bachelor's degree in Computer Science")
+    assert entry["major"] == "Physics"
+
+
+def test_aliases_are_case_insensitive_whole_words():
+    entries = _extract("MBA or PHD welcome. Experience with embassy staff.")
+    assert [entry["degree_level"] for entry in entries] == ["master", "phd"]
+
+
+def test_no_degree_mentioned():
+    assert _extract("Five years of Python experience required.") == []
@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+
+from evaluation.analysis.layout_detector import PageLayout, integral_image, or_pool
+from evaluation.analysis.spacing_analyzer import SpacingAnalyzer
+from evaluation.analysis.text_overlay import TextOverlayAnalyzer
+from evaluation.preprocessing.page_raster import PageRaster, block_tone
+
+
+def _lines(image, x0, x1, y, count, value=0, height=8, pitch=14):
+    """Draw ``count`` text-like lines of ``value`` starting at row ``y``; returns the row after them.
+
+    Each line is a run of one-pixel strokes, so, as with real glyphs, most of a block stays
+    background.
+    """
+    for i in range(count):
+        image[y + i * pitch:y + i * pitch + height, x0:x1:3] = value
+    return y + count * pitch
+
+
+def _page(height=1100, width=850):
+    return np.full((height, width, 3), 255, dtype=np.uint8)
+
+
+def _mask(image):
+    return PageRaster(image, dpi=100).mask
+
+
+def test_or_pool_sets_a_cell_when_any_pixel_is_set():
+    rng = np.random.default_rng(1)
+    mask = rng.random((37, 50)) > 0.97
+    pooled = or_pool(mask, 4)
+    expected = mask[:36, :48].reshape(9, 4, 12, 4).any(axis=(1, 3))
+    assert np.array_equal(pooled, expected)
+    assert or_pool(mask, 1) is mask
+
+
+def test_integral_image_sums_any_region():
+    rng = np.random.default_rng(2)
+    grid = rng.integers(0, 2, size=(20, 30))
+    table = integral_image(grid)
+    for y0, y1, x0, x1 in [(0, 20, 0, 30), (3, 11, 5, 6), (7, 8, 0, 30)]:
+        total = table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+        assert total == grid[y0:y1, x0:x1].sum()
+
+
+def test_blocks_of_one_column_in_reading_order():
+    image = _page()
+    y = _lines(image, 75, 700, 100, 4)
+    _lines(image, 75, 500, y + 60, 3)
+    layout = PageLayout(_mask(image), dpi=100)
+    assert layout.columns == 1
+    assert [(block.column, block.y0 < 200) for block in layout.blocks] == [(0, True), (0, False)]
+    assert layout.blocks[0].x0 <= 75 < layout.blocks[0].x1
+
+
+def test_two_columns_are_read_column_by_column():
+    image = _page()
+    for x0, x1 in ((75, 375), (475, 775)):
+        y = 100
+        for _ in range(3):
+            y = _lines(image, x0, x1, y, 4) + 40
+    layout = PageLayout(_mask(image), dpi=100)
+    assert layout.columns == 2
+    assert [block.column for block in layout.blocks] == [0, 0, 0, 1, 1, 1]
+    assert [len(blocks) for blocks in layout.column_blocks().values()] == [3, 3]
+
+
+def test_a_title_with_dates_flush_right_is_not_a_column_split():
+    image = _page()
+    _lines(image, 75, 300, 100, 1)
+    _lines(image, 650, 775, 100, 1)
+    _lines(image, 75, 775, 160, 20)
+    assert PageLayout(_mask(image), dpi=100).columns == 1
+
+
+def test_blank_page_has_no_blocks():
+    layout = PageLayout(np.zeros((300, 200), dtype=bool), dpi=100)
+    assert layout.blocks == [] and layout.columns == 1
+
+
+def test_block_tone_reads_text_on_paper_and_reversed_text():
+    paper = np.full((60, 200), 250, dtype=np.uint8)
+    paper[20:30, 10:150] = 20
+    tone = block_tone(paper, 250)
+    assert (tone.background, tone.text, tone.fill, tone.reversed) == (250, pytest.approx(20), False, False)
+
+    band = np.full((60, 200), 40, dtype=np.uint8)
+    band[20:30, 10:150] = 255
+    tone = block_tone(band, 250)
+    assert tone.fill and tone.reversed and tone.text == pytest.approx(255)
+
+    # A bare fill or rule: nothing on it to read
+    assert block_tone(np.full((10, 50), 90, dtype=np.uint8), 250).text is None
+
+
+def test_block_tone_flags_a_busy_background():
+    rng = np.random.default_rng(3)
+    photo = rng.integers(60, 200, size=(80, 200), dtype=np.uint8)
+    photo[30:40, 10:150] = 0
+    assert block_tone(photo, 250).spread > 20
+
+
+def test_spacing_on_a_blank_page():
+    analyzer = SpacingAnalyzer()
+    result = analyzer.analyze(PageRaster(_page(), dpi=100))
+    assert result == {"empty": True}
+    assert analyzer.score([result]) == 0.0
+
+
+def test_spacing_measures_margins_and_leading():
+    image = _page()
+    _lines(image, 100, 750, 100, 30)
+    result = SpacingAnalyzer().analyze(PageRaster(image, dpi=100))
+    assert result["margins"]["left"] == pytest.approx(1.0, abs=0.05)
+    assert result["margins"]["right"] == pytest.approx(1.0, abs=0.05)
+    assert result["margins"]["top"] == pytest.approx(1.0, abs=0.05)
+    assert result["lines"] == 30
+    assert result["line_gap"] == pytest.approx(6 / 8)
+
+
+def test_rendered_layouts(banded, columns):
+    assert banded["pages"]["layout"][0]["columns"] == 1
+    assert columns["pages"]["layout"][0]["columns"] == 2
+    assert len(columns["pages"]["layout"][0]["blocks"]) == 8
+
+
+def test_spacing_ignores_a_full_bleed_band(banded, columns):
+    margins = banded["pages"]["spacing"][0]["margins"]
+    # The band bleeds off three edges; the margins are those of the text below it
+    assert margins["left"] == pytest.approx(0.75, abs=0.05)
+    assert margins["top"] > 110 / 72
+    assert all(value > 0 for value in columns["pages"]["spacing"][0]["margins"].values())
+    assert columns["pages"]["spacing"][0]["lines"] == 48
+
+
+def test_text_overlay_reads_reversed_text(banded, columns):
+    page = banded["pages"]["text_overlay"][0]
+    band = max(page["blocks"], key=lambda block: block["area"])
+    assert band["overlay"] and band["reversed"] and not band["busy"]
+    assert band["contrast"] > 4.5
+    assert [block for block in page["blocks"] if block["overlay"]] == [band]
+    assert columns["pages"]["text_overlay"][0]["overlay_share"] == 0.0
+
+
+def test_low_contrast_overlay_scores_lower():
+    analyzer = TextOverlayAnalyzer()
+    scores = []
+    for text in (255, 120):
+        image = _page()
+        image[:198] = 40  # ends on a layout cell boundary, so the block is all band
+        _lines(image, 75, 600, 60, 3, value=text)
+        _lines(image, 75, 750, 300, 20)
+        result = analyzer.analyze(PageRaster(image, dpi=100))
+        assert [block["reversed"] for block in result["blocks"]] == [True, False]
+        scores.append(analyzer.score([result]))
+    assert scores[0] > scores[1]
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+import main
+from ai.resume_profile import ResumeProfile
+from scoring.scorer import CandidateScorer
+from tests.conftest import JOBS, RESUMES
+
+
+class CountingExtractor:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def extract(self, document):
+        self.calls += 1
+        return [self.value]
+
+
+# Module level, so worker processes can unpickle them
+def _echo_chunk(paths, *extra):
+    return [{"path": path, "extra": list(extra)} for path in paths]
+
+
+def _no_warm_up(profiles=None, ready=None):
+    pass
+
+
+def test_resume_profile_extracts_each_part_once_on_first_use():
+    skills, education, experience = CountingExtractor("s"), CountingExtractor("e"), CountingExtractor("x")
+    profile = ResumeProfile("Skills\nPython", skills, education, experience)
+    assert (skills.calls, education.calls, experience.calls) == (0, 0, 0)
+    assert profile.skills == profile.skills == ["s"]
+    assert profile.experiences == ["x"]
+    assert (skills.calls, education.calls, experience.calls) == (1, 0, 1)
+
+
+def test_expand_inputs_resolves_directories_globs_and_files_once(tmp_path):
+    for name in ("b.txt", "a.pdf", "c.docx", "notes.md"):
+        (tmp_path / name).write_text("x")
+    found = main.expand_inputs([str(tmp_path), str(tmp_path / "*.txt"), str(tmp_path / "missing.txt")])
+    assert [path.rsplit("/", 1)[1] for path in found] == ["a.pdf", "b.txt", "c.docx"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_chunks_keeps_input_order_and_passes_extra_args_per_chunk(workers, monkeypatch):
+    monkeypatch.setattr(main, "init_worker", _no_warm_up)
+    submitted = []
+
+    def extra():
+        submitted.append(len(submitted))
+        return (len(submitted),)
+
+    paths = [f"r{i}" for i in range(11)]
+    records = list(main.run_chunks(_echo_chunk, paths, workers, chunk_size=3, extra_args=extra))
+    assert [record["path"] for record in records] == paths
+    assert [record["extra"] for record in records] == [[1]] * 3 + [[2]] * 3 + [[3]] * 3 + [[4]] * 2
+
+
+def _match(tmp_path, *args):
+    out = tmp_path / "out.jsonl"
+    assert main.main(["match", *map(str, RESUMES), "-j", *map(str, JOBS), "-o", str(out), *args]) == 0
+    return [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_top_matches_the_best_of_exhaustive_scoring(nlp, tmp_path, workers):
+    exhaustive = _match(tmp_path, "-w", workers, "--chunk-size", "1")
+    top = _match(tmp_path, "-w", workers, "--chunk-size", "1", "--top", "2")
+    for job in map(str, JOBS):
+        ranked = sorted((r for r in exhaustive if r["job"] == job), key=lambda r: -r["score"])[:2]
+        assert [(r["resume"], r["score"]) for r in top if r["job"] == job] == [(r["resume"], r["score"]) for r in ranked]
+
+
+def test_one_resume_profile_serves_every_job(nlp):
+    from ai.job_profile import JobProfile
+
+    scorers = [CandidateScorer(JobProfile.from_text(job.read_text(encoding="utf-8"))) for job in JOBS]
+    text = RESUMES[0].read_text(encoding="utf-8")
+    profile = scorers[0].profile(text)
+    assert isinstance(profile, ResumeProfile)
+    for scorer in scorers:
+        assert scorer.score(profile) == scorer.score(text)
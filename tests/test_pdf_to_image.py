@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pytest
+
+from evaluation.preprocessing.pdf_to_image import PageCache, dpi_for, page_count, rasterize
+from tests.conftest import two_column_pdf
+
+
+@pytest.fixture
+def pdf(pymupdf, tmp_path):
+    return two_column_pdf(pymupdf, tmp_path / "columns.pdf", pages=3)
+
+
+def test_dpi_for_takes_the_most_demanding_analyzer():
+    assert dpi_for(["color", "text_overlay"]) == 150
+    assert dpi_for(["font"]) == 0
+    assert dpi_for([]) == 100
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pages_come_in_order_at_the_requested_dpi(pdf, workers):
+    pages = list(rasterize(pdf, dpi=36, pages=[2, 0], workers=workers, cache=False))
+    assert [page.index for page in pages] == [2, 0]
+    assert all(page.dpi == 36 and page.image.shape == (396, 306, 3) for page in pages)
+    assert all(page.image.dtype == np.uint8 and not page.image.flags.writeable for page in pages)
+    assert page_count(pdf) == 3
+
+
+def test_nothing_is_rendered_without_pixels_to_analyze(pdf):
+    assert list(rasterize(pdf, analyzers=["font"], cache=False)) == []
+    assert list(rasterize(pdf, dpi=0, cache=False)) == []
+    assert [page.dpi for page in rasterize(pdf, analyzers=["font", "layout"], pages=[0], cache=False)] == [100]
+
+
+def test_stopping_early_leaves_nothing_running(pdf):
+    pages = rasterize(pdf, dpi=36, workers=2, window=1, cache=False)
+    assert next(pages).index == 0
+    pages.close()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_rendered_pages_are_cached(pdf, tmp_path, workers):
+    cache = PageCache(tmp_path / "pages")
+    first = [(page.index, np.array(page.image)) for page in rasterize(pdf, dpi=36, workers=workers, cache=cache)]
+    assert len(list((tmp_path / "pages").rglob("*.npy"))) == 3
+    again = list(rasterize(pdf, dpi=36, workers=workers, cache=cache))
+    assert [index for index, _ in first] == [page.index for page in again] == [0, 1, 2]
+    assert all(np.array_equal(image, page.image) for (_, image), page in zip(first, again))
+    assert all(not page.image.flags.writeable for page in again)
+
+
+def test_page_cache_is_capped(tmp_path):
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    cache = PageCache(tmp_path / "pages", max_bytes=3 * image.nbytes)
+    for index in range(6):
+        cache.store("doc", index, 36, image)
+    files = list((tmp_path / "pages").rglob("*.npy"))
+    assert sum(file.stat().st_size for file in files) <= cache.max_bytes
+    assert 0 < len(files) < 6
+
+
+def test_page_cache_evicts_least_recently_used(tmp_path):
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    cache = PageCache(tmp_path / "pages", max_bytes=int(3.5 * image.nbytes))
+    for index in range(3):
+        path = cache.store("doc", index, 36, image)
+        os.utime(path, (1000 + index, 1000 + index))
+    # Page 0 was read long after the others were written; page 1 is now the oldest
+    os.utime(cache.path("doc", 0, 36), (2000, 2000))
+    cache.store("doc", 3, 36, image)
+    assert cache.load("doc", 1, 36) is None
+    assert all(cache.load("doc", index, 36) is not None for index in (0, 2, 3))
+
+
+def test_unreadable_cache_entries_are_misses(tmp_path):
+    cache = PageCache(tmp_path / "pages")
+    path = cache.path("doc", 0, 36)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not an array")
+    assert cache.load("doc", 0, 36) is None
+    assert cache.load("other", 0, 36) is None
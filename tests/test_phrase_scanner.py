@@ -0,0 +1,60 @@
+from ai.phrase_scanner import PhraseHit, PhraseScanner
+from ai.taxonomy import registry
+
+
+def _found(scanner, text):
+    return [(text[hit.start:hit.end], hit.phrase) for hit in scanner.scan(text)]
+
+
+def test_hits_carry_offsets_into_the_original_text():
+    scanner = PhraseScanner(["python"])
+    assert scanner.scan("I write Python daily") == [PhraseHit(8, 14, "python")]
+
+
+def test_matching_ignores_case_and_whitespace_runs():
+    scanner = PhraseScanner(["Machine Learning"])
+    assert _found(scanner, "MACHINE \n\t learning models") == [("MACHINE \n\t learning", "Machine Learning")]
+
+
+def test_hits_sit_on_word_boundaries():
+    scanner = PhraseScanner(["java", "c"])
+    assert _found(scanner, "javascript, abc, c_lang, java") == [("java", "java")]
+    assert _found(scanner, "(java)/c.") == [("java", "java"), ("c", "c")]
+
+
+def test_leftmost_longest_without_overlaps():
+    scanner = PhraseScanner(["machine", "machine learning", "learning", "deep learning"])
+    assert _found(scanner, "deep learning and machine learning") == [
+        ("deep learning", "deep learning"),
+        ("machine learning", "machine learning"),
+    ]
+    # An earlier start wins over a longer phrase that would overlap it
+    scanner = PhraseScanner(["data science", "science fiction"])
+    assert _found(scanner, "data science fiction") == [("data science", "data science")]
+
+
+def test_a_shorter_phrase_still_matches_where_the_longer_one_fails_its_boundary():
+    scanner = PhraseScanner(["react", "react native"])
+    assert _found(scanner, "react nativescript") == [("react", "react")]
+
+
+def test_phrases_that_normalize_alike_give_one_hit_and_blank_ones_are_dropped():
+    scanner = PhraseScanner(["SQL", "sql", "  "])
+    assert [hit.phrase for hit in scanner.scan("SQL")] == ["SQL"]
+    assert scanner.max_words == 1
+
+
+def test_text_whose_lowercase_changes_length_keeps_offsets():
+    # "İ".lower() is two characters; offsets must still index the original string
+    scanner = PhraseScanner(["go"])
+    text = "İstanbul team uses Go"
+    assert _found(scanner, text) == [("Go", "go")]
+
+
+def test_skill_scanner_finds_every_taxonomy_phrase_in_a_resume_line():
+    scanner = registry.skill_scanner("data/skills.json")
+    lookup = registry.skill_lookup("data/skills.json")
+    hits = scanner.scan("Skills: Python, Docker and Kubernetes")
+    assert {lookup[hit.phrase]["normalized_name"] for hit in hits} >= {
+        lookup["python"]["normalized_name"], lookup["docker"]["normalized_name"], lookup["kubernetes"]["normalized_name"],
+    }
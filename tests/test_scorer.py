@@ -0,0 +1,119 @@
+import random
+from collections import Counter
+
+import pytest
+
+from ai.job_profile import JobProfile
+from scoring.scorer import CandidateScorer, RankedCandidate, TopK, rank
+from tests.conftest import JOBS, RESUMES
+
+
+def _candidate(name, score):
+    return RankedCandidate(name, score, {})
+
+
+def _empty_job():
+    return JobProfile(text="", skills=[], education=[], titles=[], experience_requirements=[])
+
+
+@pytest.fixture
+def synthetic_stages(monkeypatch):
+    """Stage scores read off the resume text ("skills=0.5 experience=1.7"), no parsing involved."""
+    def stage(name):
+        def score(self, resume):
+            fields = dict(part.split("=") for part in resume.document.text.split())
+            return float(fields.get(name, 0))
+        return score
+
+    for name in ("skills", "education", "experience"):
+        monkeypatch.setattr(CandidateScorer, f"_{name}_score", stage(name))
+
+
+def test_topk_keeps_the_best_and_breaks_ties_by_arrival():
+    top = TopK(3)
+    for seq, score in enumerate([0.5, 0.9, 0.5, 0.7, 0.1, 0.9]):
+        top.push(seq, _candidate(seq, score))
+    assert [c.resume_id for c in top.results()] == [1, 5, 3]
+    assert top.floor == 0.7
+
+
+def test_topk_floor_starts_at_the_given_floor():
+    top = TopK(2, floor=0.4)
+    assert top.floor == 0.4
+    top.push(0, _candidate(0, 0.3))
+    top.push(1, _candidate(1, 0.8))
+    assert top.floor == 0.4
+
+
+def test_topk_merge_matches_a_single_heap():
+    scores = [random.Random(seed).random() for seed in range(200)]
+    whole = TopK(10)
+    parts = [TopK(10) for _ in range(4)]
+    for seq, score in enumerate(scores):
+        whole.push(seq, _candidate(seq, score))
+        parts[seq % 4].push(seq, _candidate(seq, score))
+    merged = TopK(10)
+    for part in parts:
+        merged.merge(part.entries())
+    assert [c.resume_id for c in merged.results()] == [c.resume_id for c in whole.results()]
+
+
+@pytest.fixture(scope="module")
+def pool(nlp):
+    # The sample resumes plus a few variants, so there is something to prune
+    texts = [path.read_text(encoding="utf-8") for path in RESUMES]
+    lines = [text.splitlines() for text in texts]
+    for i, text_lines in enumerate(lines):
+        texts.append("\n".join(text_lines[: len(text_lines) // 2]))
+        texts.append("\n".join(line for j, line in enumerate(text_lines) if j % 3 != i % 3))
+    return [(f"resume-{i}", text) for i, text in enumerate(texts)]
+
+
+@pytest.fixture(scope="module")
+def jobs(nlp):
+    return [JobProfile.from_text(path.read_text(encoding="utf-8")) for path in JOBS]
+
+
+def _exhaustive(job, pool, k):
+    scorer = CandidateScorer(job)
+    scored = [(scorer.score(text)[0], -seq, name) for seq, (name, text) in enumerate(pool)]
+    return [(name, score) for score, _, name in sorted(scored, reverse=True)[:k]]
+
+
+@pytest.mark.parametrize("k", [1, 3])
+def test_pruned_ranking_matches_exhaustive_scoring(pool, jobs, k):
+    for job in jobs:
+        stats = Counter()
+        ranked = rank(job, pool, k=k, chunk_size=2, stats=stats)
+        assert [(c.resume_id, c.score) for c in ranked] == _exhaustive(job, pool, k)
+        assert stats["scored"] + stats.get("pruned", 0) == len(pool)
+
+
+def test_pruning_skips_candidates_that_cannot_win(pool, jobs):
+    stats = Counter()
+    rank(jobs[0], pool, k=1, chunk_size=1, stats=stats)
+    assert stats.get("pruned", 0) > 0
+
+
+def test_parallel_ranking_matches_serial(pool, jobs):
+    serial = rank(jobs[0], pool, k=3, chunk_size=2)
+    parallel = rank(jobs[0], pool, k=3, chunk_size=2, workers=2)
+    assert [(c.resume_id, c.score) for c in parallel] == [(c.resume_id, c.score) for c in serial]
+
+
+def test_stage_scores_are_clamped_to_the_unit_interval(synthetic_stages):
+    scorer = CandidateScorer(_empty_job(), {"skills": 0.5, "education": 0.2, "experience": 0.3})
+    score, components = scorer.score("skills=-0.5 education=0.5 experience=1.7")
+    assert components == {"skills": 0.0, "education": 0.5, "experience": 1.0}
+    assert score == pytest.approx(0.2 * 0.5 + 0.3)
+
+
+def test_pruning_holds_when_a_stage_overshoots(synthetic_stages):
+    # Unclamped, the last resume would total 1.3 and beat a floor it was already pruned against
+    weights = {"skills": 0.5, "education": 0.2, "experience": 0.3}
+    pool = ["skills=1 education=1 experience=0.9", "skills=0.5 education=1 experience=1", "skills=0.5 experience=4"]
+    scorer = CandidateScorer(_empty_job(), weights)
+    exhaustive = sorted(((scorer.score(text)[0], -i) for i, text in enumerate(pool)), reverse=True)
+    for k in (1, 2):
+        ranked = rank(_empty_job(), pool, k=k, chunk_size=1, weights=weights)
+        assert [(c.resume_id, c.score) for c in ranked] == [(-i, s) for s, i in exhaustive[:k]]
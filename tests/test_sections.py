@@ -0,0 +1,81 @@
+import pytest
+
+from ai.document import ParsedDocument
+from ai.sections import SectionIndex
+
+RESUME = """Jane Doe
+jane@example.com
+
+SUMMARY
+Backend engineer.
+
+## Work Experience:
+Software Engineer, Acme, 2019 - 2023
+Built the billing service.
+
+Education
+B.Sc. Computer Science
+
+CERTIFICATIONS (optional)
+AWS Solutions Architect
+
+Projects [selected]
+Skills matcher
+
+Skills -
+Python, SQL"""
+
+
+@pytest.fixture
+def document():
+    # Lines and sections need no spaCy model; nothing here touches the parse
+    return ParsedDocument(RESUME)
+
+
+def test_headers_in_order(document):
+    assert [section.name for section in document.sections] == [
+        "summary", "experience", "education", "certifications", "projects", "skills",
+    ]
+
+
+def test_sections_slice_the_text_between_headers(document):
+    sections = document.sections
+    experience = sections.get("experience")
+    assert RESUME[experience.start:experience.end].strip() == (
+        "Software Engineer, Acme, 2019 - 2023\nBuilt the billing service."
+    )
+    assert [line.text for line in document.section("certifications")] == ["AWS Solutions Architect", ""]
+    # The last section runs to the end of the text
+    assert sections.get("skills").end == len(RESUME)
+    assert [line.text for line in document.section("skills")] == ["Python, SQL"]
+
+
+def test_line_indices_match_character_offsets(document):
+    for section in document.sections:
+        lines = document.lines[section.first_line:section.last_line]
+        assert lines[0].start == section.start + 1
+        assert lines[-1].end <= section.end
+
+
+def test_a_line_that_mentions_a_header_is_not_one():
+    text = "Experience with Python\nSkills and experience\nSkills\nGo"
+    index = ParsedDocument(text).sections
+    assert [section.name for section in index] == ["skills"]
+    assert "experience" not in index and "skills" in index
+
+
+def test_long_lines_are_never_headers():
+    assert list(ParsedDocument("Skills" + " " * 40 + "\nGo").sections) == []
+
+
+def test_repeated_section_keeps_the_first_for_lookup():
+    text = "Skills\nGo\nEducation\nBSc\nSkills\nRust"
+    index = ParsedDocument(text).sections
+    assert [section.name for section in index] == ["skills", "education", "skills"]
+    first = index.get("skills")
+    assert text[first.start:first.end].strip() == "Go"
+
+
+def test_empty_text():
+    index = SectionIndex([])
+    assert list(index) == [] and index.get("skills") is None
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from ai.cache import ExtractionCache
+from api.routes import analyze_resume
+from api.service import SERVICE, AnalysisService, MicroBatcher, Overloaded
+
+
+class SlowAnalyzer:
+    """Stands in for the worker pool: records every batch and takes ``delay`` seconds per call."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self._lock:
+            self.batches.append(list(texts))
+        time.sleep(self.delay)
+        return [{"chars": len(text)} for text in texts]
+
+    @property
+    def texts(self):
+        return [text for batch in self.batches for text in batch]
+
+
+def make_app(analyzer, cache, workers=1, max_queue=256, routes=(analyze_resume.routes,)):
+    service = AnalysisService(workers=workers, max_queue=max_queue)
+    service.cache = cache
+
+    async def lifecycle(app):
+        # The real pool loads spaCy in every worker; threads running ``analyzer`` are enough here
+        service.executor = ThreadPoolExecutor(max_workers=workers)
+        service.analyzer = service._batcher(analyzer)
+        service.analyzer.start()
+        yield
+        await service.analyzer.stop()
+        service.executor.shutdown(wait=True)
+
+    app = web.Application()
+    app[SERVICE] = service
+    app.cleanup_ctx.append(lifecycle)
+    for table in routes:
+        app.add_routes(table)
+    return app
+
+
+def run(app, scenario):
+    async def main():
+        async with TestClient(TestServer(app)) as client:
+            return await scenario(client)
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(tmp_path / "cache.sqlite")
+
+
+def test_full_queue_answers_429(cache):
+    analyzer = SlowAnalyzer(delay=0.3)
+
+    async def scenario(client):
+        responses = await asyncio.gather(*(
+            client.post("/analyze", json={"resume": f"Skills\nPython {i}"}) for i in range(12)
+        ))
+        return [(response.status, response.headers.get("Retry-After")) for response in responses]
+
+    results = run(make_app(analyzer, cache, max_queue=2), scenario)
+    statuses = [status for status, _ in results]
+    assert statuses.count(429) > 0 and statuses.count(200) > 0
+    assert all(retry == "1" for status, retry in results if status == 429)
+    assert len(analyzer.texts) == statuses.count(200)
+
+
+def test_micro_batcher_groups_requests():
+    analyzer = SlowAnalyzer(delay=0)
+
+    async def main():
+        batcher = MicroBatcher(analyzer, ThreadPoolExecutor(max_workers=1), max_batch=8, max_delay=0.05)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(str(i)) for i in range(5)))
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(main()) == [{"chars": 1}] * 5
+    assert analyzer.batches == [["0", "1", "2", "3", "4"]]
+
+
+def test_micro_batcher_rejects_past_its_queue():
+    async def main():
+        batcher = MicroBatcher(SlowAnalyzer(), ThreadPoolExecutor(max_workers=1), max_queue=1)
+        batcher.queue.put_nowait(("queued", asyncio.get_running_loop().create_future()))
+        with pytest.raises(Overloaded):
+            await batcher.submit("one too many")
+
+    asyncio.run(main())
+
+
+def test_started_pool_answers_analyze_requests(nlp):
+    async def main():
+        service = AnalysisService(workers=2)
+        await service.start()
+        try:
+            return await asyncio.gather(*(service.analyze(f"Skills\nPython\n\nExperience\nEngineer {i}")
+                                          for i in range(4)))
+        finally:
+            await service.stop()
+
+    results = asyncio.run(main())
+    assert len(results) == 4 and all(set(result) >= {"skills", "education", "experience"} for result in results)
@@ -0,0 +1,105 @@
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from ai.job_profile import JobProfile
+from scoring.skill_index import SkillIndex
+
+
+@pytest.fixture(scope="module")
+def skill_ids():
+    return SkillIndex(capacity=1).skill_ids
+
+
+def _pool(skill_ids, n, per_resume, seed=0):
+    rng = random.Random(seed)
+    return [(f"resume-{i}", rng.sample(skill_ids, rng.randint(0, per_resume))) for i in range(n)]
+
+
+def _naive_overlap(pool, skills):
+    wanted = set(skills)
+    return [len(wanted & set(resume_skills)) for _, resume_skills in pool]
+
+
+@pytest.mark.parametrize("job_size", [1, 3, 40])
+def test_overlap_counts_shared_skills(skill_ids, job_size):
+    # A single rare skill is counted from its postings; a broad job by popcount over the bitsets
+    pool = _pool(skill_ids, 300, 30)
+    index = SkillIndex(capacity=16)
+    index.add_many(pool)
+    job = random.Random(job_size).sample(skill_ids, job_size)
+    counts, total = index.overlap(job)
+    assert total == job_size
+    assert counts.tolist() == _naive_overlap(pool, job)
+
+
+def test_extractor_dicts_and_unknown_ids(skill_ids):
+    index = SkillIndex()
+    index.add("a", [{"id": skill_ids[0]}, {"id": "not-a-skill"}, skill_ids[1]])
+    counts, total = index.overlap([skill_ids[0], skill_ids[1], "not-a-skill"])
+    assert counts.tolist() == [2] and total == 2
+    assert index.coverage(["not-a-skill"]).tolist() == [1.0]
+
+
+def test_postings_are_copies_so_the_index_can_grow(skill_ids):
+    index = SkillIndex(capacity=1)
+    index.add("a", [skill_ids[0]])
+    held = index.postings(skill_ids[0])
+    rows = index._rows(index.columns[skill_ids[0]])
+    index.add("b", [skill_ids[0]])  # a live view over the posting array would make this raise BufferError
+    assert held.tolist() == rows.tolist() == [0]
+    assert index.postings(skill_ids[0]).tolist() == [0, 1]
+    assert index.postings("not-a-skill").tolist() == []
+
+
+def test_screen_orders_by_coverage_then_insertion(skill_ids):
+    a, b, c = skill_ids[:3]
+    index = SkillIndex()
+    index.add_many([("x", [a]), ("y", [a, b, c]), ("z", [a, b]), ("w", [b, c])])
+    skills = [{"id": skill_id, "normalized_name": skill_id} for skill_id in (a, b)]
+    job = JobProfile(text="", skills=skills, education=[], titles=[], experience_requirements=[])
+    assert index.screen(job) == [("y", 1.0), ("z", 1.0), ("x", 0.5), ("w", 0.5)]
+    assert index.screen([a, b], min_coverage=0.75, limit=1) == [("y", 1.0)]
+
+
+def test_save_and_load_round_trip(skill_ids, tmp_path):
+    pool = _pool(skill_ids, 200, 20, seed=1)
+    index = SkillIndex(capacity=8)
+    index.add_many(pool)
+    path = tmp_path / "index.pkl"
+    index.save(str(path))
+
+    loaded = SkillIndex.load(str(path))
+    assert loaded.resume_ids == index.resume_ids
+    assert np.array_equal(loaded.bits, index.bits)
+    for skill_id in skill_ids[:25]:
+        assert loaded.postings(skill_id).tolist() == index.postings(skill_id).tolist()
+    job = skill_ids[:10]
+    assert loaded.overlap(job)[0].tolist() == _naive_overlap(pool, job)
+    # A loaded index keeps accepting resumes
+    loaded.add("new", job)
+    assert loaded.overlap(job)[0][-1] == 10
+
+
+def test_load_rejects_other_formats_and_taxonomies(skill_ids, tmp_path):
+    index = SkillIndex()
+    index.add("a", skill_ids[:2])
+    path = tmp_path / "index.pkl"
+    index.save(str(path))
+    state = pickle.loads(path.read_bytes())
+
+    path.write_bytes(pickle.dumps({**state, "format": 1}))
+    with pytest.raises(ValueError, match="incompatible"):
+        SkillIndex.load(str(path))
+    path.write_bytes(pickle.dumps({**state, "skill_ids": state["skill_ids"][1:]}))
+    with pytest.raises(ValueError, match="taxonomy"):
+        SkillIndex.load(str(path))
+
+
+def test_empty_index(skill_ids):
+    index = SkillIndex()
+    counts, total = index.overlap(skill_ids[:2])
+    assert counts.tolist() == [] and total == 2
+    assert index.screen(skill_ids[:2]) == []
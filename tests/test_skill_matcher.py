@@ -0,0 +1,91 @@
+import random
+
+import pytest
+from rapidfuzz import fuzz
+
+from ai.job_profile import JobProfile
+from ai.matchers.skill_matcher import SkillMatcher
+from ai.taxonomy import registry
+
+
+def _skill(name, skill_id=None, category="tool"):
+    return {"id": skill_id, "normalized_name": name.lower(), "original_name": name, "category": category}
+
+
+def _taxonomy_skill(record):
+    # The shape both skill extractors produce for a taxonomy hit
+    return _skill(record["name"], record["id"], record["category"])
+
+
+def _nested_loop(resume_skills, job_skills, threshold=85):
+    # The matcher before the id join: every job skill fuzzy-scored against every resume skill
+    resume_set = {s["normalized_name"]: s for s in resume_skills}
+    results, matched = [], 0
+    for name, job_skill in {s["normalized_name"]: s for s in job_skills}.items():
+        best, best_score = None, 0
+        for resume_name, resume_skill in resume_set.items():
+            score = fuzz.token_sort_ratio(name, resume_name)
+            if score > best_score:
+                best, best_score = resume_skill, score
+        if best_score >= threshold:
+            matched += 1
+            results.append((job_skill["original_name"], best["original_name"], best_score))
+        else:
+            results.append((job_skill["original_name"], None, 0))
+    return round(matched / len(job_skills) * 100, 2) if job_skills else 0, results
+
+
+def _summary(result):
+    return result["match_percentage"], [
+        (m["job_skill"], m["resume_skill"], m["score"]) for m in result["matched_skills"]
+    ]
+
+
+def test_skills_join_on_taxonomy_id():
+    resume = [_skill("Postgres", "skill_9"), _skill("Docker", "skill_3")]
+    job = [_skill("PostgreSQL", "skill_9", category="database")]
+    result = SkillMatcher().match(resume, job)
+    assert result["match_percentage"] == 100.0
+    assert result["matched_skills"] == [{
+        "job_skill": "PostgreSQL", "resume_skill": "Postgres", "category": "database",
+        "score": 100.0, "reason": "exact match",
+    }]
+
+
+def test_skills_without_a_shared_id_fall_back_to_fuzzy_names():
+    resume = [_skill("Machine Learning"), _skill("postgre sql", "custom")]
+    job = [_skill("Learning Machine"), _skill("PostgreSQL"), _skill("Kubernetes")]
+    matched = SkillMatcher().match(resume, job)["matched_skills"]
+    assert [(m["resume_skill"], m["reason"]) for m in matched] == [
+        ("Machine Learning", "exact match"),
+        ("postgre sql", "fuzzy match"),
+        (None, "missing"),
+    ]
+    assert matched[1]["score"] == pytest.approx(fuzz.token_sort_ratio("postgresql", "postgre sql"))
+
+
+def test_a_job_profile_matches_like_its_skill_list():
+    resume = [_skill("Python", "skill_1"), _skill("Go", "skill_2")]
+    job_skills = [_skill("Python", "skill_1"), _skill("Rust", "skill_5")]
+    profile = JobProfile(text="", skills=job_skills, education=[], titles=[], experience_requirements=[])
+    matcher = SkillMatcher()
+    assert matcher.match(resume, profile) == matcher.match(resume, job_skills)
+    assert matcher.match(resume, profile)["match_percentage"] == 50.0
+
+
+def test_empty_sides():
+    matcher = SkillMatcher()
+    assert matcher.match([_skill("Python", "skill_1")], []) == {"match_percentage": 0, "matched_skills": []}
+    result = matcher.match([], [_skill("Python", "skill_1")])
+    assert result["match_percentage"] == 0 and result["matched_skills"][0]["reason"] == "missing"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_the_nested_loop_on_taxonomy_skills(seed):
+    records = registry.records("data/skills.json")
+    rng = random.Random(seed)
+    resume = [_taxonomy_skill(record) for record in rng.sample(records, 25)]
+    job = [_taxonomy_skill(record) for record in rng.sample(records, 12)]
+    # Some job skills the resume only has under a slightly different spelling
+    resume += [_skill(s["original_name"] + "s") for s in job[:3]]
+    assert _summary(SkillMatcher().match(resume, job)) == _nested_loop(resume, job)
@@ -0,0 +1,153 @@
+import asyncio
+import io
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import FormData
+
+from ai.cache import ExtractionCache
+from ai.ingestion import iter_pages, read_text
+from api.routes import analyze_resume, upload
+from api.service import AnalysisService
+from tests.test_service import SlowAnalyzer, make_app, run
+
+ROUTES = (analyze_resume.routes, upload.routes)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(tmp_path / "cache.sqlite")
+
+
+def _form(data, filename, content_type):
+    form = FormData()
+    form.add_field("file", data, filename=filename, content_type=content_type)
+    return form
+
+
+async def _upload(client, data, filename="resume.txt", content_type="text/plain"):
+    response = await client.post("/upload", data=_form(data, filename, content_type))
+    body = await response.json() if response.status == 200 else await response.text()
+    return response.status, body
+
+
+def test_identical_uploads_are_analyzed_once(cache):
+    analyzer = SlowAnalyzer()
+    data = b"Skills\nPython, SQL\n"
+
+    async def scenario(client):
+        concurrent = await asyncio.gather(*(_upload(client, data) for _ in range(3)))
+        later = await _upload(client, data, filename="copy.txt")
+        return concurrent, later
+
+    concurrent, (status, body) = run(make_app(analyzer, cache, routes=ROUTES), scenario)
+    assert [status for status, _ in concurrent] == [200, 200, 200]
+    assert sorted(body["cached"] for _, body in concurrent) == [False, True, True]
+    assert status == 200 and body["cached"] is True and body["chars"] == len(data.decode())
+    assert len({body["sha256"] for _, body in concurrent}) == 1
+    assert analyzer.texts == [data.decode()]
+
+
+
+def test_different_uploads_are_analyzed_separately(cache):
+    analyzer = SlowAnalyzer(delay=0)
+
+    async def scenario(client):
+        return await asyncio.gather(_upload(client, b"Skills\nPython\n"), _upload(client, b"Skills\nJava\n"))
+
+    results = run(make_app(analyzer, cache, routes=ROUTES), scenario)
+    assert [body["cached"] for _, body in results] == [False, False]
+    assert sorted(analyzer.texts) == ["Skills\nJava\n", "Skills\nPython\n"]
+
+
+
+def test_upload_limits(cache, monkeypatch):
+    monkeypatch.setattr(upload, "UPLOAD_MAX_BYTES", 16)
+
+    async def scenario(client):
+        return (
+            await _upload(client, b"x" * 17),
+            await _upload(client, b""),
+            await _upload(client, b"MZ", filename="resume.exe", content_type="application/octet-stream"),
+        )
+
+    too_large, empty, unsupported = run(make_app(SlowAnalyzer(delay=0), cache, routes=ROUTES), scenario)
+    assert too_large[0] == 413
+    assert empty[0] == 400
+    assert unsupported[0] == 415
+
+
+
+def test_disconnected_uploader_does_not_fail_the_others(cache):
+    analyzer = SlowAnalyzer(delay=0.3)
+
+    async def main():
+        service = AnalysisService(workers=1)
+        service.cache = cache
+        service.executor = ThreadPoolExecutor(max_workers=1)
+        service.analyzer = service._batcher(analyzer)
+        service.analyzer.start()
+        try:
+            first = asyncio.create_task(service.analyze_upload("digest", lambda: "Skills\nPython"))
+            await asyncio.sleep(0.1)  # the shared analysis is now running
+            others = [asyncio.create_task(service.analyze_upload("digest", lambda: "unused")) for _ in range(2)]
+            await asyncio.sleep(0)
+            first.cancel()
+            results = await asyncio.gather(*others)
+            return first, results
+        finally:
+            await service.stop()
+
+    first, results = asyncio.run(main())
+    assert first.cancelled()
+    assert results == [({"chars": len("Skills\nPython")}, True)] * 2
+    assert analyzer.texts == ["Skills\nPython"]
+
+
+def _pdf(pymupdf, lines):
+    document = pymupdf.open()
+    page = document.new_page()
+    for i, line in enumerate(lines):
+        page.insert_text((72, 72 + 14 * i), line, fontsize=11)
+    return document.tobytes()
+
+
+def test_large_uploads_are_read_from_the_spooled_file(pymupdf, cache, monkeypatch):
+    monkeypatch.setattr(upload, "UPLOAD_SPOOL_BYTES", 64)
+    sources = []
+
+    def spy(source, *args, **kwargs):
+        sources.append(source)
+        return read_text(source, *args, **kwargs)
+
+    monkeypatch.setattr(upload, "read_text", spy)
+    analyzer = SlowAnalyzer(delay=0)
+    small, large = b"Skills\nGo\n", _pdf(pymupdf, ["Skills", "Python, SQL"])
+
+    async def scenario(client):
+        return (await _upload(client, small),
+                await _upload(client, large, filename="resume.pdf", content_type="application/pdf"))
+
+    (small_status, _), (large_status, body) = run(make_app(analyzer, cache, routes=ROUTES), scenario)
+    assert small_status == large_status == 200
+    assert body["size"] == len(large)
+    assert isinstance(sources[0], bytes)
+    assert not isinstance(sources[1], (bytes, bytearray))  # the rolled-over file itself
+    assert analyzer.texts == ["Skills\nGo\n", "Skills\nPython, SQL"]
+
+
+def test_ingestion_reads_spooled_files_in_place(pymupdf):
+    data = _pdf(pymupdf, ["Experience", "Software Engineer"])
+    for max_size in (16, len(data) * 2):  # rolled over to disk, and still in memory
+        with tempfile.SpooledTemporaryFile(max_size=max_size) as spool:
+            spool.write(data)
+            # Abandoning the pages part way releases the mapping, so the file can be read again
+            pages = iter_pages(spool, "pdf", cache=None)
+            next(pages)
+            pages.close()
+            assert read_text(spool, "pdf", cache=None) == read_text(data, "pdf", cache=None)
+            assert read_text(spool, "pdf", cache=None) == "Experience\nSoftware Engineer"
+    assert read_text(io.BytesIO(b"a\r\nb"), "txt", cache=None) == "a\nb"
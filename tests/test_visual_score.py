@@ -0,0 +1,81 @@
+import threading
+
+import numpy as np
+import pytest
+
+from evaluation.preprocessing.page_raster import PageRaster, grayscale, otsu_threshold
+from evaluation.scorer.visual_score import ANALYZERS, VisualScorer
+from tests.conftest import two_column_pdf
+
+
+def test_grayscale_weights_without_wrapping():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(64, 64, 3), dtype=np.uint8)
+    image[0, 0] = 255
+    gray = grayscale(image)
+    luma = image.astype(np.float64) @ np.array([0.299, 0.587, 0.114])
+    assert gray.dtype == np.uint8
+    assert np.abs(gray.astype(np.float64) - luma).max() <= 1.5
+    assert gray[0, 0] == 255
+    assert grayscale(np.zeros((1, 1, 3), dtype=np.uint8))[0, 0] == 0
+
+
+def test_otsu_splits_ink_from_paper():
+    gray = np.full((40, 40), 240, dtype=np.uint8)
+    gray[10:20, 10:30] = 30
+    threshold = otsu_threshold(gray)
+    assert 30 < threshold <= 240
+    assert otsu_threshold(np.full((8, 8), 255, dtype=np.uint8)) == 0
+
+
+def test_page_raster_shares_the_image_read_only():
+    image = np.full((300, 200, 3), 255, dtype=np.uint8)
+    image[100:120, 20:180] = 0
+    page = PageRaster(image, index=3, dpi=100)
+    assert np.shares_memory(page.image, image) and np.shares_memory(page.thumbnail, image)
+    for array in (page.image, page.gray, page.mask):
+        assert not array.flags.writeable
+    assert page.mask.sum() == 20 * 160
+    assert page.paper == 255 and page.inches(150) == 1.5
+
+
+def test_layout_is_built_once_for_concurrent_readers():
+    image = np.full((300, 200, 3), 255, dtype=np.uint8)
+    image[100:120, 20:180] = 0
+    page = PageRaster(image, dpi=100)
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append((page.layout, page.tones))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(layout) for layout, _ in seen}) == 1 and len({id(tones) for _, tones in seen}) == 1
+
+
+def test_every_analyzer_scores_in_range(banded, columns):
+    for result in (banded, columns):
+        assert set(result["components"]) == set(ANALYZERS)
+        assert all(0.0 <= value <= 1.0 for value in result["components"].values())
+        assert 0.0 < result["score"] <= 1.0
+        assert all(len(pages) == 1 for pages in result["pages"].values())
+
+
+def test_text_only_analyzers_render_nothing(pymupdf, tmp_path):
+    path = two_column_pdf(pymupdf, tmp_path / "columns.pdf")
+    scorer = VisualScorer(["font"], cache=False)
+    result = scorer.score(path)
+    assert result["components"]["font"] > 0
+    assert scorer.stats["pages_rendered"] == 0
+
+
+def test_each_page_is_rendered_once_for_all_analyzers(pymupdf, tmp_path):
+    path = two_column_pdf(pymupdf, tmp_path / "columns.pdf", pages=3)
+    scorer = VisualScorer(cache=False, workers=1)
+    results = scorer.analyze(path, pages=[0, 2])
+    assert scorer.stats["pages_rendered"] == 2
+    assert all(len(pages) == 2 for pages in results.values())
+
+
+def test_unknown_analyzers_are_rejected():
+    with pytest.raises(ValueError, match="sparkle"):
+        VisualScorer(["color", "sparkle"])